@@ -0,0 +1,62 @@
+'''Parsing long numeric lists and writing them out as JSON.
+
+Lists of only ints or only floats are scanned into typed arrays; the
+nodes mode turns that off, so every number is lexed and made a node.
+Run with: python -m benchmarks.arrays [length ...]
+'''
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+from mel.emitting import emit
+from mel.parsing import Language, grammar
+
+
+LENGTHS = [1_000, 10_000, 100_000]
+
+
+def numeric_list(length: int, kind: str) -> str:
+    generator = random.Random(length)
+    if kind == 'int':
+        numbers = (str(generator.randint(-10**6, 10**6))
+                   for _ in range(length))
+    else:
+        numbers = (f'{generator.uniform(-1e3, 1e3):.3f}'
+                   for _ in range(length))
+    return f'values = [{" ".join(numbers)}]'
+
+
+def measure(text: str) -> tuple[float, int]:
+    '''Seconds to parse text and emit it as JSON, and the peak bytes'''
+    tracemalloc.start()
+    start = time.perf_counter()
+    with open(os.devnull, 'w') as file:
+        emit(Language().parse(text), file, 'json')
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main(lengths: list[int] = LENGTHS):
+    scan_numbers = grammar.scan_numbers
+    print(f'{"kind":>6} {"length":>8} {"mode":>7} {"seconds":>9}'
+          f' {"peak KiB":>9}')
+    for kind in ('int', 'float'):
+        for length in lengths:
+            text = numeric_list(length, kind)
+            for mode in ('arrays', 'nodes'):
+                if mode == 'nodes':
+                    grammar.scan_numbers = lambda text, start: None
+                try:
+                    elapsed, peak = measure(text)
+                finally:
+                    grammar.scan_numbers = scan_numbers
+                print(f'{kind:>6} {length:>8} {mode:>7} {elapsed:>9.3f}'
+                      f' {peak / 1024:>9.0f}')
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or LENGTHS)
@@ -0,0 +1,152 @@
+'''Seeded generator of synthetic MEL documents.
+
+Documents are modeled on examples/page and examples/person and come in
+a few shapes, each stressing a different part of the scanner:
+
+    deep     objects nested inside objects
+    wide     long lists of short values
+    strings  properties holding long strings
+    numbers  number heavy data, ints, floats and ranges
+    mixed    all of the above, like a real document
+
+Run with: python -m benchmarks.corpus [shape] [size] [seed]
+'''
+import random
+import string
+import sys
+
+
+SHAPES = ('deep', 'wide', 'strings', 'numbers', 'mixed')
+
+_WORDS = (
+    'page', 'person', 'title', 'content', 'date', 'day', 'month', 'year',
+    'name', 'surname', 'age', 'tags', 'items', 'draft', 'category',
+)
+_CONCEPTS = ('Category', 'Format', 'Page', 'Web', 'File')
+
+
+class CorpusGenerator:
+    '''Build MEL source of about `size` chars for a shape.
+
+    The same (shape, size, seed) always gives the same text.
+    '''
+
+    def __init__(self, seed: int = 0):
+        self._random = random.Random(seed)
+
+    def generate(self, shape: str = 'mixed', size: int = 10_000) -> str:
+        if shape not in SHAPES:
+            raise ValueError(f'Unknown corpus shape {shape!r}')
+        build = getattr(self, f'_{shape}')
+        parts, length = [], 0
+        while length < size:
+            part = build()
+            parts.append(part)
+            length += len(part) + 1
+        return '\n'.join(parts)
+
+    ####################################################################
+    # SHAPES
+    ####################################################################
+    def _deep(self) -> str:
+        depth = self._random.randint(8, 64)
+        lines = []
+        for level in range(depth):
+            indent = '  ' * level
+            lines.append(f'{indent}({self._name()} {self._relation()}')
+        return '\n'.join(lines) + ')' * depth
+
+    def _wide(self) -> str:
+        width = self._random.randint(32, 256)
+        value = self._random.choice((self._int, self._name, self._string))
+        items = ' '.join(value() for _ in range(width))
+        return f'{self._name()} = [{items}]'
+
+    def _strings(self) -> str:
+        length = self._random.randint(64, 2048)
+        return f'{self._name()} = {self._string(length)}'
+
+    def _numbers(self) -> str:
+        values = [self._number() for _ in range(self._random.randint(4, 32))]
+        key = self._name()
+        return f'({key} ' + ' '.join(
+            f'{self._name()} = {value}' for value in values
+        ) + ')'
+
+    def _mixed(self) -> str:
+        return self._random.choice((
+            self._page, self._person, self._deep, self._wide,
+            self._strings, self._numbers,
+        ))()
+
+    ####################################################################
+    # EXAMPLE-LIKE OBJECTS
+    ####################################################################
+    def _page(self) -> str:
+        return (
+            '-- A blog page\n'
+            f'({self._name()}\n'
+            f'    #{self._name()}  -- a tag\n'
+            f'    title = {self._string()}\n'
+            f'    category = {self._concept()}/{self._name()}\n'
+            f'    content = {self._string(80)}\n'
+            f'    (date day = {self._random.randint(1, 28)}'
+            f' month = {self._random.randint(1, 12)}'
+            f' year = {self._random.randint(1900, 2100)})\n'
+            ')'
+        )
+
+    def _person(self) -> str:
+        return (
+            '(person  -- a person object\n'
+            f'    name = {self._string()}\n'
+            f'    surname = {self._string()}\n'
+            f'    age = {self._random.randint(0, 120)}\n'
+            f"    ({self._concept()} name ' ' surname)\n"
+            ')'
+        )
+
+    ####################################################################
+    # VALUES
+    ####################################################################
+    def _relation(self) -> str:
+        value = self._random.choice((self._number, self._string, self._name))
+        return f'{self._name()} = {value()}'
+
+    def _name(self) -> str:
+        name = self._random.choice(_WORDS)
+        if self._random.random() < 0.3:
+            name += f'_{self._random.randint(0, 99)}'
+        return name
+
+    def _concept(self) -> str:
+        return self._random.choice(_CONCEPTS)
+
+    def _int(self) -> str:
+        return str(self._random.randint(-10_000, 1_000_000))
+
+    def _number(self) -> str:
+        kind = self._random.random()
+        if kind < 0.5:
+            return self._int()
+        if kind < 0.9:
+            return f'{self._random.uniform(-1e4, 1e6):.4f}'
+        low = self._random.randint(-100, 100)
+        return f'{low}..{low + self._random.randint(0, 100)}'
+
+    def _string(self, length: int = 0) -> str:
+        length = length or self._random.randint(1, 24)
+        alphabet = string.ascii_letters + string.digits + ' .,!?-'
+        text = ''.join(self._random.choices(alphabet, k=length))
+        quote = self._random.choice('"\'')
+        return f'{quote}{text}{quote}'
+
+
+def generate(shape: str = 'mixed', size: int = 10_000, seed: int = 0) -> str:
+    return CorpusGenerator(seed).generate(shape, size)
+
+
+if __name__ == '__main__':
+    defaults = ['mixed', '2000', '0']
+    shape, size, seed = (sys.argv[1:] + defaults[len(sys.argv) - 1:])[:3]
+    print(generate(shape, int(size), int(seed)))
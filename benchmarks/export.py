@@ -0,0 +1,58 @@
+'''Converting one document to many formats: separate conversions, each
+parsing the source again, against a single pass fanning the events of
+one parse out to every emitter.
+
+Run with: python -m benchmarks.export [--size N] [--format json,html]
+'''
+import argparse
+import os
+import sys
+import time
+
+from mel.emitting import EMITTERS, emit, export
+from mel.parsing import Language
+
+from .corpus import SHAPES, generate
+
+
+def separate(text: str, formats: list[str]) -> None:
+    with open(os.devnull, 'w') as file:
+        for format in formats:
+            emit(Language().parse(text), file, format)
+
+
+def single_pass(text: str, formats: list[str]) -> None:
+    with open(os.devnull, 'w') as file:
+        export(Language().parse(text), {format: file for format in formats})
+
+
+def measure(run, text: str, formats: list[str], repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run(text, formats)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(args: list[str] = None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.export')
+    parser.add_argument('--size', type=int, default=200_000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--format', default=','.join(EMITTERS))
+    parser.add_argument('--shape', action='append', choices=SHAPES)
+    options = parser.parse_args(sys.argv[1:] if args is None else args)
+    formats = options.format.split(',')
+    print(f'formats {", ".join(formats)} size {options.size}')
+    print(f'{"shape":>8} {"separate":>10} {"single":>10} {"speedup":>8}')
+    for shape in options.shape or SHAPES:
+        text = generate(shape, options.size, options.seed)
+        apart = measure(separate, text, formats, options.repeat)
+        together = measure(single_pass, text, formats, options.repeat)
+        print(f'{shape:>8} {apart:>10.3f} {together:>10.3f}'
+              f' {apart / together:>7.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+'''Tokens per second of the interpreted, optimized and compiled lexers.
+
+Run with: python -m benchmarks.lexer [copies]
+'''
+import sys
+import time
+from pathlib import Path
+
+from mel.lexing.lexer import Lexer, CompiledLexer, OptimizedLexer
+from mel.scanning.stream import CharStream
+
+
+EXAMPLES = Path(__file__).parent.parent / 'examples'
+
+
+def source(copies: int) -> str:
+    text = '\n'.join(path.read_text() for path in sorted(EXAMPLES.iterdir()))
+    return '\n'.join([text] * copies)
+
+
+def measure(lexer, text: str) -> tuple[int, float]:
+    stream = CharStream(text)
+    start = time.perf_counter()
+    count = sum(1 for _ in lexer.tokens(stream))
+    return count, time.perf_counter() - start
+
+
+def main(copies: int = 50):
+    text = source(copies)
+    print(f'{len(text)} chars')
+    for name, lexer in [
+        ('interpreted', Lexer()),
+        ('optimized', OptimizedLexer()),
+        ('compiled', CompiledLexer()),
+    ]:
+        count, elapsed = measure(lexer, text)
+        rate = count / elapsed
+        print(f'{name:>12}: {count} tokens {elapsed:.3f}s {rate:,.0f} tok/s')
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
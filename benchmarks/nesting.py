@@ -0,0 +1,48 @@
+'''Parsing of deeply nested objects and lists.
+
+The parser keeps its own stack, so depth is only bounded by memory.
+Run with: python -m benchmarks.nesting [depth ...]
+'''
+import sys
+import time
+
+from mel.parsing import Language
+
+
+DEPTHS = [1_000, 10_000, 100_000]
+
+
+def nested_objects(depth: int) -> str:
+    return ''.join(f'(a{level} x = {level} ' for level in range(depth)) \
+        + ')' * depth
+
+
+def nested_lists(depth: int) -> str:
+    return '[1 ' * depth + ']' * depth
+
+
+def measure(text: str, lazy: bool) -> tuple[float, int]:
+    '''Seconds to parse text and walk every node, and the node count'''
+    language = Language()
+    start = time.perf_counter()
+    root = language.parse(text, lazy=lazy)
+    count = sum(1 for _ in root.walk())
+    return time.perf_counter() - start, count
+
+
+def main(depths: list[int] = DEPTHS):
+    print(f'{"shape":>8} {"depth":>8} {"mode":>6} {"nodes":>9}'
+          f' {"seconds":>9} {"us/level":>9}')
+    for name, build in [('objects', nested_objects), ('lists', nested_lists)]:
+        for depth in depths:
+            text = build(depth)
+            for lazy in (False, True):
+                elapsed, count = measure(text, lazy)
+                mode = 'lazy' if lazy else 'eager'
+                per_level = elapsed / depth * 1e6
+                print(f'{name:>8} {depth:>8} {mode:>6} {count:>9}'
+                      f' {elapsed:>9.3f} {per_level:>9.1f}')
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or DEPTHS)
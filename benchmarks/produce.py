@@ -0,0 +1,41 @@
+'''Scaling of repetition parsers over long runs of a single token.
+
+Run with: python -m benchmarks.produce
+'''
+import sys
+import time
+
+from mel.scanning.stream import CharStream
+from mel.scanning.parser.single import ZeroManyParser
+from mel.scanning.parser.char import LowerParser
+
+
+SIZES = [2_000, 4_000, 8_000, 16_000, 32_000, 64_000]
+
+
+def measure(size: int, repeat: int = 3) -> float:
+    parser = ZeroManyParser(LowerParser())
+    stream = CharStream('a' * size)
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        produce = parser.parse(stream)
+        best = min(best, time.perf_counter() - start)
+    assert len(produce) == size
+    return best
+
+
+def main(sizes: list[int] = SIZES):
+    previous = None
+    print(f'{"chars":>10} {"seconds":>10} {"us/char":>10} {"ratio":>8}')
+    for size in sizes:
+        elapsed = measure(size)
+        ratio = elapsed / previous if previous else 0
+        per_char = elapsed / size * 1e6
+        print(f'{size:>10} {elapsed:>10.4f} {per_char:>10.3f} {ratio:>8.2f}')
+        previous = elapsed
+
+
+if __name__ == '__main__':
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    main(sizes)
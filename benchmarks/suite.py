@@ -0,0 +1,217 @@
+'''Benchmark suite over synthetic corpora, with JSON output.
+
+Measures chars/sec, tokens/sec, traced allocations and peak RSS of each
+target on each corpus shape. Every case runs in a fresh process, so
+peak RSS is the one of that case alone.
+
+Run with: python -m benchmarks.suite [-o results.json]
+Compare:  python -m benchmarks.suite --compare old.json new.json
+'''
+import argparse
+import json
+import multiprocessing
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+from mel.lexing.lexer import Lexer, CompiledLexer
+from mel.lexing.stream import TokenStream
+from mel.parsing.grammar import TreeParser
+from mel.scanning.stream import CharStream
+
+from .corpus import SHAPES, generate
+
+
+SCHEMA = 1
+
+
+########################################################################
+# TARGETS
+########################################################################
+def _charstream(text: str) -> int:
+    '''Build a stream and read every char with its position'''
+    stream = CharStream(text)
+    for index in range(len(text)):
+        stream.get(index)
+    return 0
+
+
+def _combinators(text: str) -> int:
+    '''Lex with the token parsers run as plain combinators'''
+    return sum(1 for _ in Lexer().spans(CharStream(text)))
+
+
+def _tokenstream(text: str) -> int:
+    return len(TokenStream(text, lexer=CompiledLexer()))
+
+
+def _parse(text: str) -> int:
+    TreeParser().parse(text)
+    return 0
+
+
+def _parse_lazy(text: str) -> int:
+    '''Lazy parse, reading the key of each top level object only'''
+    for node in TreeParser(lazy=True).parse(text).expressions:
+        getattr(node, 'key', None)
+    return 0
+
+
+TARGETS = {
+    'charstream': _charstream,
+    'combinators': _combinators,
+    'tokenstream': _tokenstream,
+    'parse': _parse,
+    'parse_lazy': _parse_lazy,
+}
+
+
+########################################################################
+# MEASURING
+########################################################################
+def measure(target: str, shape: str, size: int, seed: int,
+            repeat: int = 3) -> dict:
+    '''Best of `repeat` timed runs, then one traced run for allocations'''
+    run = TARGETS[target]
+    text = generate(shape, size, seed)
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        tokens = run(text)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    run(text)
+    allocated, peak = tracemalloc.get_traced_memory()
+    blocks = len(tracemalloc.take_snapshot().traces)
+    tracemalloc.stop()
+    return {
+        'target': target,
+        'shape': shape,
+        'chars': len(text),
+        'tokens': tokens,
+        'seconds': best,
+        'chars_per_sec': len(text) / best,
+        'tokens_per_sec': tokens / best,
+        'alloc_peak_bytes': peak,
+        'alloc_live_blocks': blocks,
+        'peak_rss_kb': _peak_rss_kb(),
+    }
+
+
+def _peak_rss_kb() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, kilobytes everywhere else
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def run_suite(targets, shapes, size: int, seed: int,
+              repeat: int = 3) -> dict:
+    context = multiprocessing.get_context('spawn')
+    results = []
+    for target in targets:
+        for shape in shapes:
+            with ProcessPoolExecutor(1, mp_context=context) as executor:
+                future = executor.submit(
+                    measure, target, shape, size, seed, repeat
+                )
+                results.append(future.result())
+    return {
+        'schema': SCHEMA,
+        'commit': _commit(),
+        'python': platform.python_version(),
+        'size': size,
+        'seed': seed,
+        'results': results,
+    }
+
+
+def _commit() -> str:
+    try:
+        output = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+    return output.stdout.strip()
+
+
+########################################################################
+# REPORTING
+########################################################################
+def report(suite: dict) -> str:
+    lines = [f'commit {suite["commit"] or "?"} size {suite["size"]}'
+             f' seed {suite["seed"]}']
+    lines.append(f'{"target":>12} {"shape":>8} {"chars/s":>12}'
+                 f' {"tokens/s":>12} {"alloc KB":>10} {"RSS KB":>8}')
+    for result in suite['results']:
+        lines.append(
+            f'{result["target"]:>12} {result["shape"]:>8}'
+            f' {result["chars_per_sec"]:>12,.0f}'
+            f' {result["tokens_per_sec"]:>12,.0f}'
+            f' {result["alloc_peak_bytes"] // 1024:>10}'
+            f' {result["peak_rss_kb"]:>8}'
+        )
+    return '\n'.join(lines)
+
+
+def compare(old: dict, new: dict) -> str:
+    '''New/old ratios of chars/sec and allocation peak, per case'''
+    before = {(r['target'], r['shape']): r for r in old['results']}
+    lines = [f'{old["commit"] or "old"} -> {new["commit"] or "new"}']
+    lines.append(f'{"target":>12} {"shape":>8} {"speed":>8} {"alloc":>8}')
+    for result in new['results']:
+        previous = before.get((result['target'], result['shape']))
+        if previous is None:
+            continue
+        speed = result['chars_per_sec'] / previous['chars_per_sec']
+        alloc = result['alloc_peak_bytes'] / max(
+            previous['alloc_peak_bytes'], 1
+        )
+        lines.append(f'{result["target"]:>12} {result["shape"]:>8}'
+                     f' {speed:>7.2f}x {alloc:>7.2f}x')
+    return '\n'.join(lines)
+
+
+def _load(path: str) -> dict:
+    with open(path) as file:
+        return json.load(file)
+
+
+def _arguments(args: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.suite')
+    parser.add_argument('--size', type=int, default=100_000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--target', action='append', choices=TARGETS)
+    parser.add_argument('--shape', action='append', choices=SHAPES)
+    parser.add_argument('-o', '--output', help='write results as JSON')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'))
+    return parser.parse_args(args)
+
+
+def main(args: list[str] = None):
+    options = _arguments(sys.argv[1:] if args is None else args)
+    if options.compare:
+        old, new = [_load(path) for path in options.compare]
+        print(compare(old, new))
+        return
+    suite = run_suite(
+        options.target or list(TARGETS),
+        options.shape or list(SHAPES),
+        options.size,
+        options.seed,
+        options.repeat,
+    )
+    print(report(suite))
+    if options.output:
+        with open(options.output, 'w') as file:
+            json.dump(suite, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,13 +1,15 @@
-# from mel.parsing import Parser
+from .lexing.lexer import CompiledLexer
+from .lexing.source import lex_file
+from .lexing.stream import TokenStream
+from .lexing.token import Token
+from .scanning.profile import enable_from_env
 
-# from mel.utils import Context
-# from mel.exceptions import BaseError, ParsingError
-# from mel.exceptions.formatting import ErrorFormatter
 
+__all__ = ['lex', 'lex_file']
 
-# def parse(text, Parser=Parser):
-#     try:
-#         return Parser().parse()
-#     except ParsingError as error:
-#         message = ErrorFormatter(error).format()
-#         raise BaseError(message)
+
+def lex(text: str) -> TokenStream:
+    return TokenStream(text, lexer=CompiledLexer())
+
+
+enable_from_env({cls.PARSER: cls.__name__ for cls in Token.classes()})
@@ -0,0 +1,158 @@
+'''Process many source files across worker processes.
+
+The grammar is built once in each worker, not once per file, and every
+file gets its own FileResult, holding either its output or its error.
+'''
+import glob
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Iterator
+
+from .emitting import emit_file, export_file, output_name
+from .exceptions import BaseError
+from .lexing.cache import TokenCache
+from .lexing.lexer import CompiledLexer
+from .lexing.source import lex_file
+from .parsing import Language
+
+
+# built by each worker at startup, see _init_worker
+_LEXER: CompiledLexer = None
+_CACHE: TokenCache = None
+# built by each worker on its first conversion
+_LANGUAGE: Language = None
+
+
+class FileResult:
+    def __init__(self, path: str, output: str = '', error: str = ''):
+        self.path = path
+        self.output = output
+        self.error = error
+
+    def __bool__(self):
+        return not self.error
+
+    def __repr__(self):
+        classname = self.__class__.__name__
+        status = 'error' if self.error else 'ok'
+        return f'{classname}({self.path}, {status})'
+
+
+########################################################################
+# JOBS
+########################################################################
+def lex_job(path: str) -> str:
+    '''Token reprs of a file, one per line'''
+    tokens = lex_file(path, _lexer(), _CACHE)
+    return '\n'.join(repr(token) for token in tokens)
+
+
+def emit_job(path: str, format: str) -> str:
+    '''A file converted to format'''
+    file = io.StringIO()
+    emit_file(path, file, format, _language())
+    return file.getvalue()
+
+
+def export_job(path: str, formats: list[str], directory: str,
+               root: str) -> str:
+    '''Write a file to directory once per format, named by its path
+    from root, see output_name. Returns the paths written.'''
+    name = output_name(path, root)
+    outputs = export_file(path, formats, directory, _language(), name)
+    return '\n'.join(outputs)
+
+
+def _language() -> Language:
+    global _LANGUAGE
+    if _LANGUAGE is None:
+        _LANGUAGE = Language()
+    return _LANGUAGE
+
+
+def _lexer() -> CompiledLexer:
+    global _LEXER
+    if _LEXER is None:
+        _LEXER = CompiledLexer()
+    return _LEXER
+
+
+def _init_worker(cache: TokenCache = None):
+    global _CACHE
+    _CACHE = cache
+    _lexer()
+
+
+def _run(job: Callable[[str], str], path: str) -> FileResult:
+    try:
+        return FileResult(path, output=job(path))
+    except FileNotFoundError:
+        return FileResult(path, error=f"The file {path!r} doesn't exist.")
+    except (BaseError, OSError, UnicodeError) as error:
+        return FileResult(path, error=f'File {path!r}: \n\n{error}')
+    # anything else is a bug, still only this file fails
+    except Exception as error:
+        name = type(error).__name__
+        return FileResult(path, error=f'File {path!r}: \n\n{name}: {error}')
+
+
+########################################################################
+# PATHS
+########################################################################
+def expand_paths(patterns: list[str]) -> list[str]:
+    '''Files named by paths, directories and glob patterns, in order.
+
+    Directories give all their files, recursively, sorted by path.
+    A pattern that matches nothing is kept, to be reported as missing.
+    '''
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            paths.extend(_walk(pattern))
+        elif glob.has_magic(pattern):
+            for path in sorted(glob.glob(pattern, recursive=True)):
+                paths.extend(_walk(path) if os.path.isdir(path) else [path])
+        else:
+            paths.append(pattern)
+    return list(dict.fromkeys(paths))
+
+
+def _walk(directory: str) -> list[str]:
+    return sorted(
+        os.path.join(root, name)
+        for root, _, names in os.walk(directory)
+        for name in names
+    )
+
+
+########################################################################
+# PROCESSING
+########################################################################
+def process_files(
+    paths: list[str],
+    job: Callable[[str], str] = lex_job,
+    workers: int = None,
+    ordered: bool = True,
+    cache: TokenCache = None
+) -> Iterator[FileResult]:
+    '''Run job over each path, yielding a FileResult per path.
+
+    Results come in input order when ordered, or as soon as they are
+    done otherwise. A single worker runs in this process. The job must
+    be a module level function, or a partial of one, so workers can
+    import it. Jobs read
+    and fill the cache, when given one.
+    '''
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(paths) < 2:
+        _init_worker(cache)
+        for path in paths:
+            yield _run(job, path)
+        return
+    with ProcessPoolExecutor(
+        workers, initializer=_init_worker, initargs=(cache,)
+    ) as executor:
+        futures = [executor.submit(_run, job, path) for path in paths]
+        for future in (futures if ordered else as_completed(futures)):
+            yield future.result()
@@ -0,0 +1,90 @@
+import os
+from typing import Iterator, TextIO
+
+from ..parsing import Language
+from ..parsing.nodes import RootNode
+from ..scanning.stream import CharStream
+from . import ir
+from .base import CHUNK_SIZE, ChunkWriter, Emitter, fan_out
+from .formats import HTMLEmitter, JSONEmitter, XMLEmitter
+
+
+__all__ = [
+    'EMITTERS', 'ChunkWriter', 'Emitter', 'emit', 'emit_file', 'export',
+    'export_file', 'HTMLEmitter', 'JSONEmitter', 'output_name',
+    'output_root', 'XMLEmitter',
+]
+
+
+EMITTERS: dict[str, type[Emitter]] = {
+    cls.FORMAT: cls for cls in (JSONEmitter, XMLEmitter, HTMLEmitter)
+}
+
+
+def emit(root: RootNode, file: TextIO, format: str = 'json',
+         chunk_size: int = CHUNK_SIZE) -> None:
+    '''Write a document tree to file in format, as it is walked'''
+    export(root, {format: file}, chunk_size)
+
+
+def export(root: RootNode, files: dict[str, TextIO],
+           chunk_size: int = CHUNK_SIZE) -> None:
+    '''Write a document tree in many formats, {format: file}, in a
+    single walk of the tree'''
+    _export_events(ir.lower(root), files, chunk_size)
+
+
+def emit_file(path: str, file: TextIO, format: str = 'json',
+              language: Language = None) -> None:
+    '''Write a source file to file in format, parsing it one top level
+    expression at a time, so its tree is never held whole'''
+    _export_events(_file_events(path, language), {format: file})
+
+
+def export_file(path: str, formats: list[str], directory: str,
+                language: Language = None, name: str = None) -> list[str]:
+    '''Parse a source file once and write it to directory in each
+    format, as <name>.<format>, name being the file name by default.
+    Returns the paths written.'''
+    events = _file_events(path, language)
+    name = name or os.path.basename(path)
+    outputs = [os.path.join(directory, f'{name}.{format}')
+               for format in formats]
+    os.makedirs(os.path.dirname(outputs[0]), exist_ok=True)
+    files = [open(output, 'w', encoding='utf-8') for output in outputs]
+    try:
+        _export_events(events, dict(zip(formats, files)))
+    finally:
+        for file in files:
+            file.close()
+    return outputs
+
+
+def output_root(paths: list[str]) -> str:
+    '''Deepest directory holding all the source files'''
+    if not paths:
+        return ''
+    return os.path.commonpath([
+        os.path.dirname(os.path.abspath(path)) for path in paths
+    ])
+
+
+def output_name(path: str, root: str) -> str:
+    '''Name to export a source file as, its path relative to the output
+    root of all the sources, so no two sources get the same name'''
+    return os.path.relpath(os.path.abspath(path), root)
+
+
+def _export_events(events: Iterator[ir.Event], files: dict[str, TextIO],
+                   chunk_size: int = CHUNK_SIZE) -> None:
+    emitters = [
+        EMITTERS[format](file, chunk_size) for format, file in files.items()
+    ]
+    fan_out(events, emitters)
+
+
+def _file_events(path: str, language: Language = None) -> Iterator[ir.Event]:
+    with open(path, encoding='utf-8') as source:
+        stream = CharStream(source.read())
+    parser = (language or Language()).parser(lazy=True)
+    return ir.lower_expressions(lambda: parser.expressions(stream))
@@ -0,0 +1,126 @@
+'''Emitters write the events of a document to a file-like object.
+
+A document is lowered to format neutral events once, see ir.py, and
+each event is handed to every emitter in turn, so converting to many
+formats is still a single walk of the tree. Emitters only keep a stack
+of what they have open, so memory follows nesting depth, not document
+size. Writes are joined into chunks before reaching the file, so there
+is no string of the whole output.
+'''
+from array import array
+from itertools import islice
+from typing import Iterable, Iterator, TextIO
+
+from ..parsing.nodes import RootNode
+from . import ir
+
+
+CHUNK_SIZE = 1 << 16
+# items joined per write, so a long list is not one long string
+JOIN_SIZE = 4096
+
+
+class ChunkWriter:
+    '''Joins small writes into chunks of about chunk_size chars'''
+
+    def __init__(self, file: TextIO, chunk_size: int = CHUNK_SIZE):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.chunks = 0
+        self._parts: list[str] = []
+        self._size = 0
+
+    def write(self, text: str) -> None:
+        self._parts.append(text)
+        self._size += len(text)
+        if self._size >= self.chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._parts:
+            self.file.write(''.join(self._parts))
+            self.chunks += 1
+            self._parts.clear()
+            self._size = 0
+
+
+class Emitter:
+    '''Handles each event with the on_ method of its opcode'''
+    FORMAT = ''
+
+    def __init__(self, file: TextIO, chunk_size: int = CHUNK_SIZE):
+        self.writer = ChunkWriter(file, chunk_size)
+        self.write = self.writer.write
+        self._handlers = {
+            ir.DOCUMENT: self.on_document,
+            ir.OBJECT: self.on_object,
+            ir.ATTRIBUTE: self.on_attribute,
+            ir.VALUES: self.on_values,
+            ir.RELATION: self.on_relation,
+            ir.LIST: self.on_list,
+            ir.LITERAL: self.on_literal,
+            ir.REFERENCE: self.on_reference,
+            ir.END: self.on_end,
+            ir.NUMBERS: self.on_numbers,
+        }
+
+    def emit(self, root: RootNode) -> None:
+        for event in ir.lower(root):
+            self.event(event)
+        self.close()
+
+    def event(self, event: ir.Event) -> None:
+        self._handlers[event[0]](*event[1:])
+
+    def close(self) -> None:
+        self.writer.flush()
+
+    def write_joined(self, items: Iterable[str], separator: str) -> None:
+        '''Write items with separator between them, a batch at a time'''
+        items = iter(items)
+        batch = list(islice(items, JOIN_SIZE))
+        while batch:
+            self.write(separator.join(batch))
+            batch = list(islice(items, JOIN_SIZE))
+            if batch:
+                self.write(separator)
+
+    def on_document(self, tags: list[str]) -> None:
+        raise NotImplementedError
+
+    def on_object(self, key: str, name: str, tags: list[str]) -> None:
+        raise NotImplementedError
+
+    def on_attribute(self, path: str, name: str) -> None:
+        raise NotImplementedError
+
+    def on_values(self) -> None:
+        raise NotImplementedError
+
+    def on_relation(self, path: str, sign: str) -> None:
+        raise NotImplementedError
+
+    def on_list(self) -> None:
+        raise NotImplementedError
+
+    def on_literal(self, kind: str, value, text: str) -> None:
+        raise NotImplementedError
+
+    def on_reference(self, kind: str, text: str, ends: tuple) -> None:
+        raise NotImplementedError
+
+    def on_end(self) -> None:
+        raise NotImplementedError
+
+    def on_numbers(self, kind: str, values: array, body: str) -> None:
+        raise NotImplementedError
+
+
+def fan_out(events: Iterator[ir.Event], emitters: list[Emitter]) -> None:
+    '''Feed the events of one walk of a document to every emitter'''
+    handlers = [emitter.event for emitter in emitters]
+    for event in events:
+        for handle in handlers:
+            handle(event)
+    for emitter in emitters:
+        emitter.close()
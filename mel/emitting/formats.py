@@ -0,0 +1,314 @@
+import json
+from html import escape
+
+from ..lexing.numbers import number_texts
+from .base import CHUNK_SIZE, Emitter
+
+
+########################################################################
+# JSON
+########################################################################
+class JSONEmitter(Emitter):
+    '''Objects, and the document itself, become
+
+        {"key": ..., "tags": [...], "attributes": {...}, "values": [...]}
+
+    References, queries and ranges are objects of a single field naming
+    what they are, so they are told apart from strings.
+    '''
+    FORMAT = 'json'
+
+    def __init__(self, file, chunk_size: int = CHUNK_SIZE):
+        super().__init__(file, chunk_size)
+        # [items written, closing text] of each open object or list
+        self._open: list[list] = []
+
+    def on_document(self, tags):
+        self._object(None, tags, ']}\n')
+
+    def on_object(self, key, name, tags):
+        self._separate()
+        self._object(key, tags, ']}')
+
+    def on_attribute(self, path, name):
+        self._separate()
+        self.write(f'{json.dumps(path)}: ')
+        self._open.append([None, ''])
+
+    def on_values(self):
+        self.write('}, "values": [')
+        self._open[-1][0] = 0
+
+    def on_relation(self, path, sign):
+        self._separate()
+        path, sign = json.dumps(path), json.dumps(sign)
+        self.write(f'{{"path": {path}, "sign": {sign}, "value": ')
+        self._open.append([None, '}'])
+
+    def on_list(self):
+        self._separate()
+        self.write('[')
+        self._open.append([0, ']'])
+
+    def on_literal(self, kind, value, text):
+        self._separate()
+        self.write(json.dumps(value))
+
+    def on_reference(self, kind, text, ends):
+        self._separate()
+        if kind == 'range':
+            first, last = [json.dumps(end) for end in ends]
+            self.write(f'{{"range": [{first}, {last}]}}')
+        else:
+            self.write(f'{{"{kind}": {json.dumps(text)}}}')
+
+    def on_end(self):
+        self.write(self._open.pop()[1])
+
+    def on_numbers(self, kind, values, body):
+        # repr is what json.dumps writes for ints and finite floats
+        self._separate()
+        self.write('[')
+        self.write_joined(map(repr, values), ', ')
+        self.write(']')
+
+    def _object(self, key, tags, closing):
+        key, tags = json.dumps(key), json.dumps(tags)
+        self.write(f'{{"key": {key}, "tags": {tags}, "attributes": {{')
+        self._open.append([0, closing])
+
+    def _separate(self):
+        '''Comma before all but the first item of an object or list,
+        the single value of a relation or attribute goes alone'''
+        if self._open and self._open[-1][0] is not None:
+            if self._open[-1][0]:
+                self.write(', ')
+            self._open[-1][0] += 1
+
+
+########################################################################
+# XML
+########################################################################
+class XMLEmitter(Emitter):
+    '''One element per node, named by its kind'''
+    FORMAT = 'xml'
+
+    def __init__(self, file, chunk_size: int = CHUNK_SIZE):
+        super().__init__(file, chunk_size)
+        self._closing: list[str] = []
+
+    def on_document(self, tags):
+        self.write('<?xml version="1.0" encoding="utf-8"?>\n<mel>')
+        self._tags(tags)
+        self._closing.append('</mel>\n')
+
+    def on_object(self, key, name, tags):
+        self.write(f'<object key="{escape(key)}">')
+        self._tags(tags)
+        self._closing.append('</object>')
+
+    def on_attribute(self, path, name):
+        self.on_relation(path, '=')
+
+    def on_values(self):
+        pass
+
+    def on_relation(self, path, sign):
+        path, sign = escape(path), escape(sign)
+        self.write(f'<relation path="{path}" sign="{sign}">')
+        self._closing.append('</relation>')
+
+    def on_list(self):
+        self.write('<list>')
+        self._closing.append('</list>')
+
+    def on_literal(self, kind, value, text):
+        self.write(f'<{kind}>{escape(text)}</{kind}>')
+
+    def on_reference(self, kind, text, ends):
+        self.write(f'<{kind}>{escape(text)}</{kind}>')
+
+    def on_end(self):
+        self.write(self._closing.pop())
+
+    def on_numbers(self, kind, values, body):
+        self.write('<list>')
+        texts = number_texts(body)
+        self.write_joined((f'<{kind}>{text}</{kind}>' for text in texts), '')
+        self.write('</list>')
+
+    def _tags(self, tags):
+        for tag in tags:
+            self.write(f'<tag name="{escape(tag)}"/>')
+
+
+########################################################################
+# HTML
+########################################################################
+VOID_ELEMENTS = frozenset([
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link',
+    'meta', 'source', 'track', 'wbr',
+])
+
+
+class _Frame:
+    '''Something the HTML emitter has open'''
+
+    def __init__(self, kind: str, name: str = '', owner=None):
+        self.kind = kind
+        self.name = name
+        self.void = name.lower() in VOID_ELEMENTS
+        self.was_text = False
+        self.has_value = False
+        # texts of an attribute value, None when it has no text form
+        self.owner: _Frame = owner or self
+        self.texts: list[str] = []
+
+
+class HTMLEmitter(Emitter):
+    '''Objects keyed by a name become elements, see docs/objects.md:
+
+        (input type="text" 42)  ->  <input type="text" value="42" />
+
+    `=` relations become attributes and tags boolean attributes. Other
+    values are the content of the element, but a void element takes its
+    first literal as its value attribute. Objects with prefixed keys,
+    like (?help ...), are metadata and are left out, objects keyed *
+    or : render their content only. Other relations are left out too.
+    '''
+    FORMAT = 'html'
+
+    def __init__(self, file, chunk_size: int = CHUNK_SIZE):
+        super().__init__(file, chunk_size)
+        self._frames: list[_Frame] = []
+        # depth inside a subtree that is left out
+        self._skipping = 0
+
+    def on_document(self, tags):
+        self._frames.append(_Frame('document'))
+
+    def on_object(self, key, name, tags):
+        if self._skip_subtree() or not self._opens():
+            return
+        if name:
+            self.write(f'<{name}')
+            for tag in tags:
+                self.write(f' {escape(tag)}')
+            self._frames.append(_Frame('element', name))
+        elif key in ('*', ':'):
+            self._frames.append(_Frame('content'))
+        else:
+            self._skipping = 1
+
+    def on_attribute(self, path, name):
+        if self._skip_subtree():
+            return
+        if self._frames[-1].kind != 'element' or not name:
+            self._skipping = 1
+            return
+        self._frames.append(_Frame('attribute', name))
+
+    def on_values(self):
+        frame = self._frames[-1]
+        if not self._skipping and frame.kind == 'element' \
+                and not frame.void:
+            self.write('>')
+
+    def on_relation(self, path, sign):
+        if self._skip_subtree():
+            return
+        self._invalidate()
+        self._skipping = 1
+
+    def on_list(self):
+        if self._skip_subtree():
+            return
+        frame = self._frames[-1]
+        if frame.kind == 'attribute':
+            self._frames.append(_Frame('attribute', owner=frame.owner))
+        elif self._opens():
+            self._frames.append(_Frame('content'))
+
+    def on_literal(self, kind, value, text):
+        if self._skipping:
+            return
+        frame = self._frames[-1]
+        if frame.kind == 'element' and frame.void:
+            if not frame.has_value:
+                self.write(f' value="{escape(text)}"')
+                frame.has_value = True
+            return
+        self._text(text)
+
+    def on_reference(self, kind, text, ends):
+        if not self._skipping and self._frames[-1].kind != 'document':
+            self._text(text)
+
+    def on_end(self):
+        if self._skipping:
+            self._skipping -= 1
+            return
+        frame = self._frames.pop()
+        if frame.kind == 'element':
+            self.write(' />' if frame.void else f'</{frame.name}>')
+        elif frame.kind == 'attribute':
+            texts = frame.owner.texts
+            if frame.owner is frame and texts is not None:
+                value = escape(' '.join(texts))
+                self.write(f' {escape(frame.name)}="{value}"')
+            return
+        if self._frames and self._frames[-1].kind == 'document':
+            self.write('\n')
+
+    def on_numbers(self, kind, values, body):
+        '''Like a list of literals, but without an END of its own'''
+        if self._skipping:
+            return
+        frame = self._frames[-1]
+        texts = number_texts(body)
+        if frame.kind == 'attribute':
+            if frame.owner.texts is not None:
+                frame.owner.texts.extend(texts)
+        elif frame.kind == 'document':
+            self.write_joined(texts, ' ')
+            self.write('\n')
+        elif not frame.void:
+            frame.was_text = False
+            self.write_joined(texts, ' ')
+
+    def _skip_subtree(self) -> bool:
+        '''Count an opening event inside a left out subtree'''
+        if self._skipping:
+            self._skipping += 1
+            return True
+        return False
+
+    def _opens(self) -> bool:
+        '''Whether the open frame takes a nested object or list.
+        When it does not, the subtree is left out.'''
+        frame = self._frames[-1]
+        if frame.kind == 'attribute' or frame.void:
+            self._invalidate()
+            self._skipping = 1
+            return False
+        frame.was_text = False
+        return True
+
+    def _invalidate(self) -> None:
+        frame = self._frames[-1]
+        if frame.kind == 'attribute':
+            frame.owner.texts = None
+
+    def _text(self, text: str) -> None:
+        '''Text of a value, a space apart from the text before it'''
+        frame = self._frames[-1]
+        if frame.kind == 'attribute':
+            if frame.owner.texts is not None:
+                frame.owner.texts.append(text)
+        elif frame.kind == 'document':
+            self.write(f'{escape(text)}\n')
+        elif not frame.void:
+            if frame.was_text:
+                self.write(' ')
+            frame.was_text = True
+            self.write(escape(text))
@@ -0,0 +1,206 @@
+'''Format neutral events a document tree is lowered to.
+
+Events are small tuples, an opcode then its arguments. Every emitter
+reads the same events, so one walk of the tree feeds any number of
+output formats. Objects and the document give their tags first, then
+their `=` relations as attributes, then their other items as values:
+
+    OBJECT key name tags   name is the key when a plain name, else ''
+      ATTRIBUTE path name  name is the path without prefix, else ''
+        <value> END
+      VALUES
+        <value> ...
+    END
+
+A value is a LITERAL or REFERENCE event, or a LIST, RELATION or OBJECT
+closed by its END. A list of only ints or only floats is a single
+NUMBERS event instead, of its typed array and source text, so none of
+its nodes are made. Events are produced as the tree is walked and never
+stored, so lowering itself only keeps a stack as deep as the nesting.
+
+lower_expressions does the same for a document that is never held as a
+tree: its top level expressions are parsed one at a time, twice. The
+first pass keeps only the tags and attributes, which come first. The
+second lowers each value and drops it, so memory follows the largest
+top level expression, not the document size.
+'''
+from typing import Callable, Iterator
+
+from ..lexing.numbers import INT_TYPE
+from ..parsing.nodes import (
+    BooleanNode,
+    KeywordNode,
+    ListNode,
+    LiteralNode,
+    ObjectNode,
+    PathNode,
+    QueryNode,
+    RangeNode,
+    RelationNode,
+    RootNode,
+    StringNode,
+    TreeNode,
+)
+
+
+Event = tuple
+
+DOCUMENT = 0
+OBJECT = 1
+ATTRIBUTE = 2
+VALUES = 3
+RELATION = 4
+LIST = 5
+LITERAL = 6
+REFERENCE = 7
+END = 8
+NUMBERS = 9
+
+
+def lower(root: RootNode) -> Iterator[Event]:
+    '''Events of a document, walking it once without recursion'''
+    tags, attributes, values = split_items(root.expressions)
+    return _drive(_object((DOCUMENT, tags), attributes, values))
+
+
+def lower_expressions(
+    expressions: Callable[[], Iterator[TreeNode]]
+) -> Iterator[Event]:
+    '''Events of a document given by a function returning an iterator
+    over its top level expressions, called twice, see the module docs'''
+    tags, attributes = [], []
+    for item in expressions():
+        kind = item_kind(item)
+        if kind == 'tag':
+            tags.append(item.text[1:])
+        elif kind == 'attribute':
+            attributes.append(item)
+    values = (item for item in expressions() if item_kind(item) == 'value')
+    return _drive(_object((DOCUMENT, tags), attributes, values))
+
+
+def _drive(rule: Iterator) -> Iterator[Event]:
+    '''Events of a rule and of the rules it yields, from a list'''
+    stack = [rule]
+    while stack:
+        try:
+            item = next(stack[-1])
+        except StopIteration:
+            stack.pop()
+            continue
+        if isinstance(item, tuple):
+            yield item
+            continue
+        lowered = _lower(item)
+        if isinstance(lowered, tuple):
+            yield lowered
+        else:
+            stack.append(lowered)
+
+
+def _lower(node: TreeNode) -> Event | Iterator:
+    '''The event of a leaf, or the rule of a node with children'''
+    if isinstance(node, LiteralNode):
+        return (LITERAL, node.ID, node.value, literal_text(node))
+    if isinstance(node, ObjectNode):
+        tags, attributes, values = split_items(node.expressions)
+        event = (OBJECT, node.key.text, object_name(node), tags)
+        return _object(event, attributes, values)
+    if isinstance(node, ListNode):
+        numbers = node.numbers
+        if numbers is None:
+            return _list(node)
+        kind = 'int' if numbers.typecode == INT_TYPE else 'float'
+        body = node.stream.slice(node.start + 1, node.end - 1)
+        return (NUMBERS, kind, numbers, body)
+    if isinstance(node, RelationNode):
+        return _relation(node)
+    if isinstance(node, RangeNode):
+        ends = tuple(end.value if end else None
+                     for end in (node.first, node.last))
+        return (REFERENCE, 'range', node.text, ends)
+    kind = 'query' if _is_query(node) else 'reference'
+    return (REFERENCE, kind, node.text, None)
+
+
+def _object(event: Event, attributes: list, values: Iterator) -> Iterator:
+    yield event
+    for relation in attributes:
+        yield (ATTRIBUTE, relation.path.text, _path_name(relation.path))
+        yield relation.value
+        yield (END,)
+    yield (VALUES,)
+    yield from values
+    yield (END,)
+
+
+def _list(node: ListNode) -> Iterator:
+    yield (LIST,)
+    yield from node.values
+    yield (END,)
+
+
+def _relation(node: RelationNode) -> Iterator:
+    yield (RELATION, node.path.text, node.sign)
+    yield node.value
+    yield (END,)
+
+
+########################################################################
+# HELPERS
+########################################################################
+def split_items(items: list[TreeNode]) -> tuple[list, list, list]:
+    '''Tag names, `=` relations and other items of an object'''
+    tags, attributes, values = [], [], []
+    for item in items:
+        kind = item_kind(item)
+        if kind == 'tag':
+            tags.append(item.text[1:])
+        elif kind == 'attribute':
+            attributes.append(item)
+        else:
+            values.append(item)
+    return tags, attributes, values
+
+
+def item_kind(item: TreeNode) -> str:
+    '''"tag", "attribute" for `=` relations, or "value"'''
+    if isinstance(item, PathNode) and item.is_tag:
+        return 'tag'
+    if isinstance(item, RelationNode) and item.sign == '=':
+        return 'attribute'
+    return 'value'
+
+
+def object_name(node: ObjectNode) -> str:
+    '''Key of an object when it is a plain name or concept, else ""'''
+    head = _path_head(node.key)
+    return head.text if head and not head.prefix else ''
+
+
+def literal_text(node: LiteralNode) -> str:
+    '''Literal as plain text, strings without their quotes'''
+    if isinstance(node, BooleanNode):
+        return node.text.lower()
+    if isinstance(node, StringNode):
+        return node.value
+    return node.text
+
+
+def _path_name(path: PathNode) -> str:
+    head = _path_head(path)
+    return head.name if head else ''
+
+
+def _path_head(path: TreeNode) -> KeywordNode:
+    '''The keyword of a path of a single keyword, else None'''
+    if isinstance(path, PathNode) and len(path.segments) == 1:
+        head = path.segments[0][1]
+        if isinstance(head, KeywordNode):
+            return head
+    return None
+
+
+def _is_query(node: TreeNode) -> bool:
+    return isinstance(node, PathNode) \
+        and isinstance(node.segments[0][1], QueryNode)
@@ -1,11 +1,30 @@
-# class BaseError(Exception):
-#     pass
+class BaseError(Exception):
+    pass
 
 
-# class LexingError(Exception):
-#     pass
+class LexingError(BaseError):
+    def __init__(self, msg='Lexing error!', line=-1, column=-1):
+        super().__init__(msg)
+        self.line = line
+        self.column = column
 
 
-# class ParsingError(BaseError):
-#     def __init__(self, msg='Parsing error!'):
-#         super().__init__(msg)
+class ParsingError(BaseError):
+    def __init__(self, msg='Parsing error!', line=-1, column=-1):
+        super().__init__(msg)
+        self.line = line
+        self.column = column
+
+
+class QueryError(BaseError):
+    def __init__(self, msg='Query error!', line=-1, column=-1):
+        super().__init__(msg)
+        self.line = line
+        self.column = column
+
+
+class ResolutionError(BaseError):
+    def __init__(self, msg='Resolution error!', line=-1, column=-1):
+        super().__init__(msg)
+        self.line = line
+        self.column = column
@@ -0,0 +1,60 @@
+'''Bracket matching over raw text, without lexing it.
+
+Strings and comments are matched whole, so the brackets inside them
+are skipped.
+'''
+import re
+
+
+OPENING = '([{'
+CLOSING = ')]}'
+
+_PAREN_PATTERN = re.compile(r'''"[^"]*"|'[^']*'|--[^\n]*|[()]''')
+_BRACKET_PATTERN = re.compile(r'''"[^"]*"|'[^']*'|--[^\n]*|[()\[\]{}]''')
+
+
+def top_level_ends(text: str) -> list[int]:
+    '''Offsets right after the closing paren of each top level object'''
+    ends, depth = [], 0
+    for match in _PAREN_PATTERN.finditer(text):
+        paren = match.group()
+        if paren == '(':
+            depth += 1
+        elif paren == ')':
+            depth -= 1
+            # a stray closing paren also ends the current item
+            if depth <= 0:
+                depth = 0
+                ends.append(match.end())
+    return ends
+
+
+def match_bracket(text: str, index: int) -> int:
+    '''Offset right after the bracket closing the one at index, or -1.
+
+    Only nesting depth is tracked: brackets of different kinds closing
+    each other are left for the parser to report.
+    '''
+    depth = 0
+    for match in _BRACKET_PATTERN.finditer(text, index):
+        bracket = match.group()
+        if bracket in OPENING:
+            depth += 1
+        elif bracket in CLOSING:
+            depth -= 1
+            if depth == 0:
+                return match.end()
+    return -1
+
+
+def bracket_pairs(text: str, start: int, end: int) -> dict[int, int]:
+    '''{opening offset: offset right after its closing bracket} of
+    every bracket pair in text[start:end], in one pass'''
+    pairs, opened = {}, []
+    for match in _BRACKET_PATTERN.finditer(text, start, end):
+        bracket = match.group()
+        if bracket in OPENING:
+            opened.append(match.start())
+        elif bracket in CLOSING and opened:
+            pairs[opened.pop()] = match.end()
+    return pairs
@@ -0,0 +1,76 @@
+from array import array
+
+from ..scanning.produce import Produce
+from .lexer import Lexer
+from .token import Token, EOFToken
+
+
+class TokenBuffer:
+    '''Columnar token storage: type id, start and end per token.
+
+    Tokens are only built, as thin proxies reading from the source
+    stream, when asked for with get().
+    '''
+
+    def __init__(self, stream, token_classes: list[type[Token]] = None):
+        self._stream = stream
+        self._classes = token_classes or Token.classes()
+        self._ids = {cls: index for index, cls in enumerate(self._classes)}
+        self.types = array('I')
+        self.starts = array('I')
+        self.ends = array('I')
+
+    @classmethod
+    def build(cls, stream, lexer: Lexer = None) -> 'TokenBuffer':
+        lexer = lexer or Lexer()
+        buffer = cls(stream, lexer.token_classes)
+        for TokenClass, start, end in lexer.spans(stream):
+            buffer.append(TokenClass, start, end)
+        return buffer
+
+    @property
+    def stream(self):
+        return self._stream
+
+    @property
+    def token_classes(self) -> list[type[Token]]:
+        return list(self._classes)
+
+    def append(self, TokenClass: type[Token], start: int, end: int) -> None:
+        self.types.append(self._ids[TokenClass])
+        self.starts.append(start)
+        self.ends.append(end)
+
+    def token_class(self, index: int) -> type[Token]:
+        return self._classes[self.types[index]]
+
+    def get(self, index: int = 0) -> Token:
+        if index >= len(self):
+            return EOFToken()
+        produce = Produce.span(
+            self._stream, self.starts[index], self.ends[index]
+        )
+        return self.token_class(index).from_produce(produce)
+
+    def text(self, index: int) -> str:
+        return self._stream.slice(self.starts[index], self.ends[index])
+
+    def view(self, index: int):
+        '''Token source without copying: a memoryview over byte
+        sources, a str slice for str sources'''
+        start, end = self.starts[index], self.ends[index]
+        source = self._stream.text
+        if isinstance(source, str):
+            return source[start:end]
+        return memoryview(source)[start:end]
+
+    def __getitem__(self, index: int) -> Token:
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self.get(index)
+
+    def __iter__(self):
+        return (self.get(index) for index in range(len(self)))
+
+    def __len__(self):
+        return len(self.types)
@@ -0,0 +1,209 @@
+'''On-disk cache of lexed token buffers.
+
+Entries are keyed by a hash of the source bytes and of the grammar, so
+an edited file or a changed token parser never reads a stale entry.
+Each entry holds the token columns only, the source is the file itself:
+
+    header   magic, format version, token count
+    payload  zlib of the type ids, the gap before each token and the
+             length of each token
+
+Least recently used entries are removed when the directory grows past
+its size bound.
+'''
+import hashlib
+import os
+import struct
+import tempfile
+import zlib
+from array import array
+
+from ..scanning.optimizer import parser_key
+from .buffer import TokenBuffer
+from .token import Token
+
+
+FORMAT_VERSION = 1
+MAX_BYTES = 64 << 20
+_MAGIC = b'MELT'
+_HEADER = struct.Struct('<4sHI')
+_SUFFIX = '.melt'
+
+
+def default_directory() -> str:
+    if directory := os.environ.get('MEL_CACHE_DIR'):
+        return directory
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(
+        os.path.expanduser('~'), '.cache'
+    )
+    return os.path.join(base, 'mel')
+
+
+def grammar_version(token_classes: list[type[Token]] = None) -> str:
+    '''Hash of the token grammar, changes with any token parser'''
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(FORMAT_VERSION).encode())
+    for TokenClass in token_classes or Token.classes():
+        key = (TokenClass.ID, parser_key(TokenClass.PARSER))
+        digest.update(repr(key).encode())
+    return digest.hexdigest()
+
+
+class TokenCache:
+    def __init__(self, directory: str = None, max_bytes: int = MAX_BYTES):
+        self.directory = directory or default_directory()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        # entries that could not be written
+        self.errors = 0
+        self._size = None
+        self._versions = {}
+
+    def key(self, data, token_classes: list[type[Token]] = None) -> str:
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(self._version(token_classes).encode())
+        digest.update(data)
+        return digest.hexdigest()
+
+    def get(self, data, stream, token_classes=None) -> TokenBuffer:
+        '''The cached buffer for source data over stream, or None'''
+        path = self._path(self.key(data, token_classes))
+        try:
+            with open(path, 'rb') as file:
+                entry = file.read()
+            buffer = self._decode(entry, stream, token_classes)
+            os.utime(path)
+        except (OSError, ValueError, zlib.error, struct.error):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return buffer
+
+    def set(self, data, buffer: TokenBuffer) -> None:
+        '''Store the buffer for source data. A failed write, to a read
+        only directory or a full disk, is counted in errors, not raised.'''
+        entry = self._encode(buffer)
+        path = self._path(self.key(data, buffer.token_classes))
+        temporary = None
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # written aside and renamed, so readers never see half an entry
+            fd, temporary = tempfile.mkstemp(dir=self.directory)
+            with os.fdopen(fd, 'wb') as file:
+                file.write(entry)
+            os.replace(temporary, path)
+        except OSError:
+            self.errors += 1
+            if temporary is not None:
+                _remove(temporary)
+            return
+        if self._size is not None:
+            self._size += len(entry)
+        self._evict()
+
+    def clear(self) -> None:
+        for path, _, _ in self._entries():
+            os.remove(path)
+        self._size = 0
+
+    ####################################################################
+    # EVICTION
+    ####################################################################
+    def _evict(self) -> None:
+        if self._size is not None and self._size <= self.max_bytes:
+            return
+        entries = sorted(self._entries(), key=lambda entry: entry[1])
+        size = sum(entry_size for _, _, entry_size in entries)
+        for path, _, entry_size in entries:
+            if size <= self.max_bytes:
+                break
+            _remove(path)
+            size -= entry_size
+        self._size = size
+
+    def _entries(self) -> list[tuple[str, float, int]]:
+        '''(path, last use, size) of every entry'''
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return []
+        entries = []
+        for name in names:
+            if not name.endswith(_SUFFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((path, stat.st_mtime, stat.st_size))
+        return entries
+
+    ####################################################################
+    # FORMAT
+    ####################################################################
+    @staticmethod
+    def _encode(buffer: TokenBuffer) -> bytes:
+        count = len(buffer)
+        gaps, lengths = array('I'), array('I')
+        end = 0
+        for index in range(count):
+            start = buffer.starts[index]
+            gaps.append(start - end)
+            end = buffer.ends[index]
+            lengths.append(end - start)
+        typecode = 'B' if len(buffer.token_classes) < 256 else 'I'
+        types = array(typecode, buffer.types.tolist())
+        payload = types.typecode.encode() + types.tobytes() \
+            + gaps.tobytes() + lengths.tobytes()
+        header = _HEADER.pack(_MAGIC, FORMAT_VERSION, count)
+        return header + zlib.compress(payload, 1)
+
+    @staticmethod
+    def _decode(entry: bytes, stream, token_classes) -> TokenBuffer:
+        magic, version, count = _HEADER.unpack_from(entry)
+        if magic != _MAGIC or version != FORMAT_VERSION:
+            raise ValueError('Not a token cache entry')
+        payload = zlib.decompress(entry[_HEADER.size:])
+        typecode = chr(payload[0])
+        if typecode not in 'BI':
+            raise ValueError('Unknown token type width')
+        types = array(typecode)
+        offset = 1 + count * types.itemsize
+        types.frombytes(payload[1:offset])
+        gaps, lengths = array('I'), array('I')
+        gaps.frombytes(payload[offset:offset + 4 * count])
+        lengths.frombytes(payload[offset + 4 * count:])
+        if len(types) != count or len(lengths) != count:
+            raise ValueError('Truncated token cache entry')
+        buffer = TokenBuffer(stream, token_classes)
+        if count and max(types) >= len(buffer.token_classes):
+            raise ValueError('Unknown token type in cache entry')
+        buffer.types.fromlist(types.tolist())
+        end = 0
+        for gap, length in zip(gaps, lengths):
+            start = end + gap
+            end = start + length
+            buffer.starts.append(start)
+            buffer.ends.append(end)
+        # offsets only grow, the last end is the largest
+        if end > len(stream):
+            raise ValueError('Token cache entry past the end of source')
+        return buffer
+
+    def _version(self, token_classes) -> str:
+        key = tuple(token_classes or Token.classes())
+        if key not in self._versions:
+            self._versions[key] = grammar_version(list(key))
+        return self._versions[key]
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + _SUFFIX)
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
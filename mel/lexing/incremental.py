@@ -0,0 +1,86 @@
+from array import array
+from bisect import bisect_right
+
+from .buffer import TokenBuffer
+from .lexer import Lexer
+
+
+# how far past the end of a winning match the token parsers may read,
+# like the '.' and first digit a float needs after an int's digits
+LOOKAHEAD = 2
+
+
+class TokenChange:
+    '''Tokens [first, old_end) of the old buffer were replaced by tokens
+    [first, new_end) of the new one, the rest were only shifted'''
+
+    def __init__(self, first: int, old_end: int, new_end: int):
+        self.first = first
+        self.old_end = old_end
+        self.new_end = new_end
+
+    def __repr__(self):
+        classname = self.__class__.__name__
+        return f'{classname}({self.first}, {self.old_end}, {self.new_end})'
+
+
+def relex(
+    buffer: TokenBuffer,
+    start: int,
+    end: int,
+    text: str,
+    lexer: Lexer = None
+) -> tuple[TokenBuffer, TokenChange]:
+    '''Re-lex a token buffer after replacing source[start:end] by text.
+
+    Scanning restarts at the last token boundary that the edit can't
+    affect and stops as soon as a new token starts where a shifted old
+    token did, after the edit. Tokens from there on are reused.
+    '''
+    lexer = lexer or Lexer(buffer.token_classes)
+    stream = buffer.stream.replace(start, end, text)
+    delta = len(text) - (end - start)
+    edit_end = start + len(text)
+    first = _first_affected(buffer, start)
+    index = buffer.starts[first] if first < len(buffer) else start
+    old = _first_after(buffer, end)
+    result = TokenBuffer(stream, buffer.token_classes)
+    _copy(buffer, result, 0, first, 0)
+    while index < len(stream):
+        while old < len(buffer) and buffer.starts[old] + delta < index:
+            old += 1
+        if index >= edit_end and old < len(buffer) \
+                and buffer.starts[old] + delta == index:
+            break
+        TokenClass, produce = lexer.match(stream, index)
+        if TokenClass is None:
+            raise lexer.error(stream, index)
+        result.append(TokenClass, index, produce.end)
+        index = produce.end
+    new_end = len(result)
+    if index < len(stream):
+        _copy(buffer, result, old, len(buffer), delta)
+    else:
+        old = len(buffer)
+    return result, TokenChange(first, old, new_end)
+
+
+def _first_affected(buffer: TokenBuffer, start: int) -> int:
+    '''Index of the token holding the first char the edit can affect'''
+    position = max(0, start - LOOKAHEAD)
+    return max(0, bisect_right(buffer.starts, position) - 1)
+
+
+def _first_after(buffer: TokenBuffer, end: int) -> int:
+    '''Index of the first old token starting at or after end'''
+    return bisect_right(buffer.starts, end - 1) if end else 0
+
+
+def _copy(source: TokenBuffer, target: TokenBuffer, first, last, delta):
+    target.types.extend(source.types[first:last])
+    target.starts.extend(array('I', [
+        offset + delta for offset in source.starts[first:last]
+    ]))
+    target.ends.extend(array('I', [
+        offset + delta for offset in source.ends[first:last]
+    ]))
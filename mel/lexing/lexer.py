@@ -0,0 +1,205 @@
+from ..exceptions import LexingError
+from ..scanning.dfa import CompileError, compile_dfa
+from ..scanning.dispatch import SLOTS, DispatchTable
+from ..scanning.optimizer import optimize, parser_key
+from ..scanning.parser.base import Parser
+from ..scanning.parser.multi import SeqParser
+from ..scanning.stream import CharStream
+from ..scanning.produce import Produce
+from .token import Token
+
+
+########################################################################
+# INTERPRETED LEXER
+########################################################################
+class Lexer:
+    '''Longest match over the token parsers, ties go to the first token.
+
+    Only the tokens that can start with the char at a position are
+    tried there, as told by a dispatch table of their FIRST sets.
+    '''
+
+    def __init__(self, token_classes: list[type[Token]] = None):
+        self._token_classes = token_classes or Token.classes()
+        self._priority = {
+            cls: order for order, cls in enumerate(self._token_classes)
+        }
+        self._dispatch = DispatchTable(
+            [TokenClass.PARSER for TokenClass in self._token_classes]
+        )
+        self._slots = [
+            self._classes(self._dispatch.indexes(code))
+            for code in range(SLOTS)
+        ]
+        self._byte_slots = [
+            self._classes(self._dispatch.byte_indexes(code))
+            for code in range(SLOTS)
+        ]
+        self._other = self._classes(self._dispatch.indexes(SLOTS))
+
+    def match(self, stream: CharStream, index: int = 0):
+        best_class, best = None, Produce(index=index)
+        for TokenClass in self.candidates(stream, index):
+            produce = TokenClass.PARSER.parse(stream, index)
+            if produce and len(produce) > len(best):
+                best_class, best = TokenClass, produce
+        return best_class, best
+
+    @property
+    def token_classes(self) -> list[type[Token]]:
+        return list(self._token_classes)
+
+    @property
+    def conflicts(self) -> dict[str, list[type[Token]]]:
+        '''Chars more than one token can start with, resolved by the
+        longest match and then by token order'''
+        return {
+            chr(code): list(candidates)
+            for code, candidates in enumerate(self._slots)
+            if len(candidates) > 1
+        }
+
+    def candidates(self, stream: CharStream, index: int = 0):
+        '''Token classes that can match at index, in priority order'''
+        text = stream.text
+        if index >= len(text):
+            return ()
+        value = text[index]
+        if isinstance(value, int):
+            return self._byte_slots[value]
+        code = ord(value)
+        return self._slots[code] if code < SLOTS else self._other
+
+    def tokens(self, stream: CharStream):
+        for TokenClass, start, end in self.spans(stream):
+            yield TokenClass.from_produce(Produce.span(stream, start, end))
+
+    def spans(self, stream: CharStream):
+        '''Generate (TokenClass, start, end) for every token'''
+        index = 0
+        while index < len(stream):
+            TokenClass, produce = self.match(stream, index)
+            if TokenClass is None:
+                raise self.error(stream, index)
+            yield TokenClass, index, index + len(produce)
+            index += len(produce)
+
+    def _classes(self, indexes: tuple[int, ...]) -> tuple[type[Token]]:
+        return tuple(self._token_classes[index] for index in indexes)
+
+    def _wins(self, TokenClass, end, best_class, best_end) -> bool:
+        '''Longer matches win, ties go to the earlier token'''
+        if end > best_end:
+            return True
+        if end < best_end or best_class is None:
+            return False
+        return self._priority[TokenClass] < self._priority[best_class]
+
+    def error(self, stream: CharStream, index: int) -> LexingError:
+        char = stream.get(index)
+        msg = f'Unexpected char {char.value!r}'
+        return LexingError(msg, char.line, char.column)
+
+
+########################################################################
+# OPTIMIZED LEXER
+########################################################################
+class _PrefixNode:
+    def __init__(self, parser: Parser = None):
+        self.parser = parser
+        self.children: dict[tuple, _PrefixNode] = {}
+        self.token_classes: list[type[Token]] = []
+
+
+class OptimizedLexer(Lexer):
+    '''Interpreted lexer over optimized token parsers.
+
+    Token sequences are stored in a prefix tree, so a prefix shared by
+    several tokens (like the sign and digits of ints and floats) is
+    parsed once per position.
+    '''
+
+    def __init__(self, token_classes: list[type[Token]] = None):
+        super().__init__(token_classes)
+        self._root = _PrefixNode()
+        for TokenClass in self._token_classes:
+            self._insert(TokenClass)
+
+    def match(self, stream: CharStream, index: int = 0):
+        matches = []
+        self._walk(self._root, stream, index, matches)
+        best_class, end = None, index
+        for TokenClass, match_end in matches:
+            if self._wins(TokenClass, match_end, best_class, end):
+                best_class, end = TokenClass, match_end
+        if best_class is None:
+            return None, Produce(index=index)
+        return best_class, Produce.span(stream, index, end)
+
+    def _insert(self, TokenClass: type[Token]) -> None:
+        parser = optimize(TokenClass.PARSER)
+        steps = parser.children() if type(parser) is SeqParser else [parser]
+        node = self._root
+        for step in steps:
+            key = parser_key(step)
+            if key not in node.children:
+                node.children[key] = _PrefixNode(step)
+            node = node.children[key]
+        node.token_classes.append(TokenClass)
+
+    def _walk(self, node, stream, index, matches) -> None:
+        # same steps as SeqParser: each element must succeed in turn
+        for child in node.children.values():
+            if produce := child.parser.parse(stream, index):
+                end = index + len(produce)
+                for TokenClass in child.token_classes:
+                    matches.append((TokenClass, end))
+                self._walk(child, stream, end, matches)
+
+
+########################################################################
+# COMPILED LEXER
+########################################################################
+class CompiledLexer(Lexer):
+    '''Run every compilable token through a single DFA.
+
+    Tokens whose parser trees can't be compiled are still tried with
+    the interpreted combinators and compete for the longest match.
+    '''
+
+    def __init__(self, token_classes: list[type[Token]] = None):
+        super().__init__(token_classes)
+        self.compiled: list[type[Token]] = []
+        self.interpreted: list[type[Token]] = []
+        parsers = []
+        for TokenClass in self._token_classes:
+            # factored trees have fewer overlapping alternatives
+            parser = optimize(TokenClass.PARSER)
+            try:
+                compile_dfa([parser])
+                self.compiled.append(TokenClass)
+                parsers.append(parser)
+            except CompileError:
+                self.interpreted.append(TokenClass)
+        self._dfa = compile_dfa(parsers)
+
+    @property
+    def matches_bytes(self) -> bool:
+        '''True if UTF-8 bytes can be lexed without decoding them'''
+        return not self.interpreted and self._dfa.ascii_only
+
+    def match(self, stream: CharStream, index: int = 0):
+        text = stream.text
+        if isinstance(text, str):
+            label, end = self._dfa.match(text, index)
+        else:
+            label, end = self._dfa.match_bytes(text, index)
+        best_class = self.compiled[label] if end > index else None
+        for TokenClass in self.interpreted:
+            produce = TokenClass.PARSER.parse(stream, index)
+            if produce and self._wins(TokenClass, produce.end,
+                                      best_class, end):
+                best_class, end = TokenClass, produce.end
+        if best_class is None:
+            return None, Produce(index=index)
+        return best_class, Produce.span(stream, index, end)
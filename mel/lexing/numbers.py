@@ -0,0 +1,76 @@
+'''Numeric runs: list bodies of only ints or only floats, scanned raw.
+
+A body like `1 1 2 3 5 8]` is checked with a couple of C level scans
+and converted straight into a typed array, array('q') for ints and
+array('d') for floats, without lexing it token by token or making a
+node per number. Anything else in the body, a mix of ints and floats, a
+comment, a range or a number too big for 64 bits, fails the check and
+the body is parsed as usual.
+'''
+import math
+import re
+import string
+from array import array
+from operator import itemgetter
+
+from ..scanning.bulk import load_numpy
+
+
+# whitespace tokens, see WhitespaceToken: spaces, newline, ',' and ';'
+_SEPARATORS = ' \t\r\x07\x08\x0b\x0c\n,;'
+_NUMBER = re.compile(r'-?[0-9]+(?:\.[0-9]+)?')
+# chars a run is made of, deleted to find any other
+_RUN_CHARS = str.maketrans('', '', _SEPARATORS + string.digits + '-.')
+# what the lexer reads apart from a list of numbers: `1-2`, a comment,
+# a lone `-` or `.`, `1..3` or `1.2.3`. Flat patterns only, a repeated
+# group would make the regex engine keep a mark per number.
+_NOT_A_RUN = re.compile(
+    r'[0-9]-|-(?![0-9])|(?<![0-9])\.|\.(?![0-9])|\.[0-9]+\.'
+)
+
+INT_TYPE = 'q'
+FLOAT_TYPE = 'd'
+
+
+def scan_numbers(text: str, start: int) -> tuple[array, int] | None:
+    '''(numbers, offset right after the closing bracket) of a numeric
+    run starting at start, right after a "[", else None'''
+    close = text.find(']', start)
+    if close < 0:
+        return None
+    body = text[start:close]
+    if body.translate(_RUN_CHARS) or _NOT_A_RUN.search(body):
+        return None
+    dots = body.count('.')
+    typecode, convert = (FLOAT_TYPE, float) if dots else (INT_TYPE, int)
+    texts = map(itemgetter(0), _NUMBER.finditer(body))
+    try:
+        numbers = array(typecode, map(convert, texts))
+    except OverflowError:
+        return None
+    # an empty list or a mix of ints and floats
+    if not numbers or dots and dots != len(numbers):
+        return None
+    # floats of too many digits become infinite, keep them as nodes
+    if dots and not -math.inf < min(numbers) <= max(numbers) < math.inf:
+        return None
+    return numbers, close + 1
+
+
+def number_spans(text: str, start: int, end: int) -> list[tuple[int, int]]:
+    '''(start, end) of each number of a numeric run in text[start:end]'''
+    return [match.span() for match in _NUMBER.finditer(text, start, end)]
+
+
+def number_texts(body: str) -> list[str]:
+    '''Source text of each number of a numeric run'''
+    return _NUMBER.findall(body)
+
+
+def to_numpy(numbers: array):
+    '''NumPy view of a numeric run, sharing its memory'''
+    np = load_numpy()
+    if np is None:
+        raise ImportError('numpy is needed, install mel[bulk]')
+    dtype = np.int64 if numbers.typecode == INT_TYPE else np.float64
+    return np.frombuffer(numbers, dtype=dtype)
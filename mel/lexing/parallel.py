@@ -0,0 +1,186 @@
+'''Lex one large document across worker processes.
+
+A quick scan finds where top level objects end, skipping the parens in
+strings and comments. The text is cut there into chunks of about the
+same size, each chunk is lexed by a worker and the token columns are
+joined back into a single buffer over the whole text, so line and
+column numbers stay global. Chunks are parsed the same way, their
+expressions moved over to the whole text and joined under one root.
+'''
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from ..parsing.grammar import TreeParser
+from ..parsing.nodes import KeywordNode, ListNode, RootNode, TreeNode
+from ..scanning.stream import CharStream
+from .brackets import top_level_ends
+from .buffer import TokenBuffer
+from .lexer import CompiledLexer
+from .symbols import SymbolTable
+
+
+CHUNK_SIZE = 1 << 20
+
+# built once by each worker, see _init_worker
+_LEXER: CompiledLexer = None
+
+
+def split_chunks(text: str, chunk_size: int = CHUNK_SIZE):
+    '''(start, end) of chunks of whole top level objects, covering text.
+
+    Cutting right after a top level paren is always a token boundary,
+    since no token goes on past a closing paren.
+    '''
+    chunks, start = [], 0
+    for end in top_level_ends(text):
+        if end - start >= chunk_size:
+            chunks.append((start, end))
+            start = end
+    if start < len(text) or not chunks:
+        chunks.append((start, len(text)))
+    return chunks
+
+
+def lex_parallel(
+    text: str,
+    workers: int = None,
+    chunk_size: int = CHUNK_SIZE
+) -> TokenBuffer:
+    '''Lex text in chunks across workers, into one buffer.
+
+    Errors are raised with their line and column in the whole text.
+    '''
+    stream = CharStream(text)
+    buffer = TokenBuffer(stream)
+    chunks = split_chunks(text, chunk_size)
+    jobs = [
+        (text[start:end], start, _origin(stream, start))
+        for start, end in chunks
+    ]
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers == 1:
+        _init_worker()
+        results = [_lex_chunk(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(workers, initializer=_init_worker) \
+                as executor:
+            results = list(executor.map(_lex_chunk, *zip(*jobs)))
+    for types, starts, ends in results:
+        buffer.types.extend(types)
+        buffer.starts.extend(starts)
+        buffer.ends.extend(ends)
+    return buffer
+
+
+def parse_parallel(
+    text: str,
+    workers: int = None,
+    chunk_size: int = CHUNK_SIZE
+) -> RootNode:
+    '''Parse text in chunks across workers, into one tree.
+
+    Nodes are over the whole text and names are interned in one symbol
+    table, with the same ids as a serial parse. Errors are raised with
+    their line and column in the whole text.
+    '''
+    stream = CharStream(text)
+    symbols = SymbolTable()
+    chunks = split_chunks(text, chunk_size)
+    jobs = [
+        (text[start:end], _origin(stream, start))
+        for start, end in chunks
+    ]
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers == 1:
+        _init_worker()
+        results = [_parse_chunk(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(workers, initializer=_init_worker) \
+                as executor:
+            results = list(executor.map(_parse_chunk, *zip(*jobs)))
+    expressions = []
+    for (offset, _), (nodes, refs, table) in zip(chunks, results):
+        ids = [symbols.intern(table.name(id_)) for id_ in range(len(table))]
+        for node in nodes:
+            node.stream = stream
+            node.start += offset
+            node.end += offset
+            if isinstance(node, KeywordNode):
+                node.symbol = ids[node.symbol]
+            _swap_children(node, nodes.__getitem__)
+        expressions.extend(nodes[ref] for ref in refs)
+    root = RootNode(stream, 0, len(text), expressions)
+    root.symbols = symbols
+    return root
+
+
+class _Ref(int):
+    '''Index of a node in a flattened tree'''
+
+
+def _flatten(expressions: list[TreeNode]):
+    '''Nodes of the trees, holding the refs of their children instead of
+    the children, and the refs of the expressions. Pickling a node is
+    then not a recursion as deep as its tree.'''
+    nodes, stack = [], list(reversed(expressions))
+    while stack:
+        node = stack.pop()
+        nodes.append(node)
+        # the nodes of a numeric run are only made when read
+        if not isinstance(node, ListNode) or node.numbers is None:
+            stack.extend(reversed(node.children()))
+    refs = {id(node): _Ref(index) for index, node in enumerate(nodes)}
+    for node in nodes:
+        _swap_children(node, lambda child: refs[id(child)])
+    return nodes, [refs[id(node)] for node in expressions]
+
+
+def _swap_children(node: TreeNode, swap) -> None:
+    '''Swap the children of node for their refs, or back'''
+    fields = vars(node)
+    for name, value in list(fields.items()):
+        fields[name] = _swap(value, swap)
+
+
+def _swap(value, swap):
+    if isinstance(value, (TreeNode, _Ref)):
+        return swap(value)
+    if isinstance(value, list):
+        return [_swap(item, swap) for item in value]
+    if isinstance(value, tuple):
+        return tuple(_swap(item, swap) for item in value)
+    return value
+
+
+def _origin(stream: CharStream, index: int) -> tuple[int, int]:
+    line = stream.line(index)
+    return line, stream.column(index, line)
+
+
+def _init_worker():
+    global _LEXER
+    if _LEXER is None:
+        _LEXER = CompiledLexer()
+
+
+def _lex_chunk(text: str, offset: int, origin: tuple[int, int]):
+    '''Token columns of a chunk, shifted to offsets in the whole text'''
+    stream = CharStream(text, origin=origin)
+    types, starts, ends = array('I'), array('I'), array('I')
+    token_classes = _LEXER.token_classes
+    ids = {cls: index for index, cls in enumerate(token_classes)}
+    for TokenClass, start, end in _LEXER.spans(stream):
+        types.append(ids[TokenClass])
+        starts.append(start + offset)
+        ends.append(end + offset)
+    return types, starts, ends
+
+
+def _parse_chunk(text: str, origin: tuple[int, int]):
+    '''Flattened tree of a chunk over its own text, see _flatten, and
+    the names it interned'''
+    parser = TreeParser(_LEXER)
+    stream = CharStream(text, origin=origin)
+    nodes, refs = _flatten(list(parser.expressions(stream)))
+    return nodes, refs, parser.symbols
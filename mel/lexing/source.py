@@ -0,0 +1,34 @@
+from ..scanning.mapped import MappedStream, map_file
+from ..scanning.stream import CharStream
+from .buffer import TokenBuffer
+from .cache import TokenCache
+from .lexer import CompiledLexer
+
+
+def lex_file(
+    path: str,
+    lexer: CompiledLexer = None,
+    cache: TokenCache = None
+) -> TokenBuffer:
+    '''Lex a file over its memory mapped bytes.
+
+    Only the text of each token gets decoded. Falls back to decoding the
+    whole file when the lexer can't match raw UTF-8 bytes. The mapping
+    lives as long as the returned buffer. With a cache, files lexed
+    before are loaded from it instead of scanned again.
+    '''
+    lexer = lexer or CompiledLexer()
+    with open(path, 'rb') as file:
+        data = map_file(file)
+    if lexer.matches_bytes:
+        stream = MappedStream(data)
+    else:
+        stream = CharStream(bytes(data).decode('utf-8'))
+    if cache is not None:
+        buffer = cache.get(data, stream, lexer.token_classes)
+        if buffer is not None:
+            return buffer
+    buffer = TokenBuffer.build(stream, lexer)
+    if cache is not None:
+        cache.set(data, buffer)
+    return buffer
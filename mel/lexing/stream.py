@@ -1,23 +1,139 @@
-# from ..scanning.char import Char
+import codecs
+from collections import deque
+from typing import IO, Iterator
+
+from ..exceptions import LexingError
+from ..scanning.char import NewlineChar, SpaceChar
 from ..scanning.stream import CharStream
+from .buffer import TokenBuffer
+from .lexer import Lexer
 from .token import Token, EOFToken
 
 
 class TokenStream:
-    def __init__(self, text: str = ''):
+    def __init__(self, text: str = '', lexer: Lexer = None):
+        self._lexer = lexer or Lexer()
         self._tokens = self._build(text)
 
+    @property
+    def buffer(self) -> TokenBuffer:
+        return self._tokens
+
     def get(self, index: int = 0) -> Token:
-        if index < len(self._tokens):
-            return self._tokens[index]
-        return EOFToken()
+        return self._tokens.get(index)
 
-    def _build(self, text: str) -> list[Token]:
-        char_stream = CharStream(text)  # noqa
-        index = 0
-        char = char_stream.get(index)
-        parsers = Token.parsers(char)
-        parsers.parse(char_stream)
+    def _build(self, text: str) -> TokenBuffer:
+        char_stream = CharStream(text)
+        return TokenBuffer.build(char_stream, self._lexer)
 
     def __len__(self):
         return len(self._tokens)
+
+
+class ChunkedTokenStream:
+    '''Lex a file-like object in fixed size chunks.
+
+    Only the text since the last complete token and a bounded window of
+    recent tokens are kept in memory. Chunks are lexed up to their last
+    whitespace char, since only strings, comments and whitespace can
+    hold one and all of them are deferred to the next chunk when cut
+    there. A token still unfinished is lexed again only once the text
+    after it has doubled, so a long token costs time linear in its
+    length. More than max_buffer chars without a complete token in
+    them are an error.
+    '''
+
+    def __init__(
+        self,
+        file: IO,
+        lexer: Lexer = None,
+        chunk_size: int = 1 << 16,
+        lookahead: int = 1024,
+        max_buffer: int = 1 << 24
+    ):
+        self._file = file
+        self._lexer = lexer or Lexer()
+        self._chunk_size = chunk_size
+        self._lookahead = lookahead
+        self._max_buffer = max_buffer
+        self._window: deque[Token] = deque()
+        self._first = 0
+        self._source = self.tokens()
+
+    def get(self, index: int = 0) -> Token:
+        if index < self._first:
+            msg = f'Token {index} is behind the lookahead window'
+            raise IndexError(msg)
+        while index >= self._first + len(self._window):
+            if not self._pull():
+                return EOFToken()
+        return self._window[index - self._first]
+
+    def tokens(self) -> Iterator[Token]:
+        '''Generate all tokens, reading the file as they are consumed.
+        Use either this or get(), both read from the same file.
+        '''
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        buffer, eof = '', False
+        # chunks read since the last lexing, and their size
+        pending, size = [], 0
+        origin = (0, 0)
+        # chars lexed without finishing a token
+        stalled = 0
+        while not eof or buffer or pending:
+            chunk = self._file.read(self._chunk_size) if not eof else ''
+            eof = eof or not chunk
+            if isinstance(chunk, bytes):
+                chunk = decoder.decode(chunk, final=eof)
+            pending.append(chunk)
+            size += len(chunk)
+            if not eof and len(buffer) + size < 2 * stalled:
+                continue
+            buffer += ''.join(pending)
+            pending, size = [], 0
+            cut = len(buffer) if eof else _last_break(buffer) + 1
+            if cut:
+                stream = CharStream(buffer[:cut], origin=origin)
+                index = yield from self._lex(stream, eof)
+                origin = stream.line(index), stream.column(index)
+                buffer = buffer[index:]
+                stalled = cut - index
+            else:
+                stalled = len(buffer)
+            if len(buffer) > self._max_buffer:
+                msg = f'No complete token in {self._max_buffer} chars'
+                raise LexingError(msg, *origin)
+
+    def _lex(self, stream: CharStream, eof: bool):
+        '''Yield the complete tokens of stream, return where it stopped'''
+        index = 0
+        while index < len(stream):
+            TokenClass, produce = self._lexer.match(stream, index)
+            if TokenClass is None:
+                if eof:
+                    raise self._lexer.error(stream, index)
+                break
+            if produce.end == len(stream) and not eof:
+                break
+            yield TokenClass.from_produce(produce)
+            index = produce.end
+        return index
+
+    def _pull(self) -> bool:
+        token = next(self._source, None)
+        if token is None:
+            return False
+        self._window.append(token)
+        if len(self._window) > self._lookahead:
+            self._window.popleft()
+            self._first += 1
+        return True
+
+
+# chars of whitespace tokens, which only strings and comments also hold
+_BREAKS = SpaceChar.CHARS + NewlineChar.CHARS + ',;'
+
+
+def _last_break(text: str) -> int:
+    '''Offset of the last whitespace char of text, or -1'''
+    return max(text.rfind(char) for char in _BREAKS)
@@ -0,0 +1,30 @@
+class SymbolTable:
+    '''Names and concepts of a document, interned to integer ids.
+
+    Ids are given in order of first appearance, so the same text always
+    gets the same id and comparing keywords is comparing ints.
+    '''
+
+    def __init__(self):
+        self._ids: dict[str, int] = {}
+        self._names: list[str] = []
+
+    def intern(self, name: str) -> int:
+        id_ = self._ids.get(name)
+        if id_ is None:
+            id_ = self._ids[name] = len(self._names)
+            self._names.append(name)
+        return id_
+
+    def get(self, name: str) -> int:
+        '''Id of a name, or -1 if it never appeared'''
+        return self._ids.get(name, -1)
+
+    def name(self, id_: int) -> str:
+        return self._names[id_]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._ids
+
+    def __len__(self):
+        return len(self._names)
@@ -1,5 +1,5 @@
-from ..scanning.char import NewlineChar, SpaceChar
 from ..scanning.parser.base import Parser
+from ..scanning.produce import Produce
 from ..scanning.parser.single import (
     OneManyParser,
     ZeroManyParser,
@@ -11,46 +11,94 @@ from ..scanning.parser.multi import (
 )
 from ..scanning.parser.char import (
     CharParser,
+    ExceptCharParser,
     DigitParser,
     LowerParser,
     UpperParser,
     AlphaNumParser,
+    SpaceParser,
+    NewlineParser,
 )
 
 
 _TOKEN_TYPE_MAP = {}
+_TOKEN_CLASSES = []
 
 
 class Token:
     PARSER = Parser
     HINTS = ''
+    SKIP = False
 
     def __init__(self, id, chars):
         self.id = id
-        self.chars = chars
+        self._chars = chars
+        self._produce = None
+
+    @classmethod
+    def from_produce(cls, produce: Produce) -> 'Token':
+        '''A token whose chars are only read from the stream on demand'''
+        token = cls(cls.ID, None)
+        token._produce = produce
+        return token
+
+    @property
+    def chars(self):
+        if self._chars is None and self._produce is not None:
+            self._chars = self._produce.chars
+        return self._chars
 
     @staticmethod
     def parsers(hint_str: str):
         return _TOKEN_TYPE_MAP[hint_str]
 
+    @staticmethod
+    def classes() -> list[type['Token']]:
+        '''Registered token classes, in priority order'''
+        return list(_TOKEN_CLASSES)
+
+    @property
+    def text(self) -> str:
+        if self._produce is not None:
+            return str(self._produce)
+        return ''.join(c.value for c in self.chars)
+
     def __repr__(self):
         classname = self.__class__.__name__
-        text = ''.join(c.value for c in self.chars)
-        return f'{classname}({text})'
+        return f'{classname}({self.text})'
 
     def __bool__(self):
-        return len(self.chars)
+        if self._produce is not None:
+            return len(self._produce) > 0
+        return bool(self.chars)
 
 
 def _register_token(TokenClass: Token) -> Token:
     '''Build a {char_str: parsers} dict for tokens'''
-    for hint_str in TokenClass.HINTS:
+    # the chars a token can start with come from its parser by default
+    TokenClass.HINTS = TokenClass.HINTS or TokenClass.PARSER.hints()
+    for hint_str in dict.fromkeys(TokenClass.HINTS):
         if hint_str not in _TOKEN_TYPE_MAP:
             _TOKEN_TYPE_MAP[hint_str] = []
         _TOKEN_TYPE_MAP[hint_str].append(TokenClass.PARSER)
+    _TOKEN_CLASSES.append(TokenClass)
     return TokenClass
 
 
+def _literal(text: str) -> Parser:
+    if len(text) == 1:
+        return CharParser(text)
+    return SeqParser(*[CharParser(ch) for ch in text])
+
+
+def _quoted(quote: str) -> Parser:
+    return SeqParser(
+        CharParser(quote),
+        ZeroManyParser(ExceptCharParser(quote)),
+        CharParser(quote),
+    )
+
+
 class EOFToken(Token):
     def __init__(self):
         super().__init__('null', None)
@@ -102,9 +150,46 @@ class ConceptToken(Token):
     )
 
 
+@_register_token
+class StringToken(Token):
+    ID = 'string'
+    PARSER = OneOfParser(_quoted('"'), _quoted("'"))
+
+
+@_register_token
+class CommentToken(Token):
+    ID = 'comment'
+    SKIP = True
+    PARSER = SeqParser(
+        CharParser('-'),
+        CharParser('-'),
+        ZeroManyParser(ExceptCharParser('\n'))
+    )
+
+
+@_register_token
+class SymbolToken(Token):
+    ID = 'symbol'
+    # longer symbols right before their own prefixes, so they win
+    # and the optimizer can factor the shared first char
+    SYMBOLS = (
+        '!=', '!', '<=', '<>', '<', '>=', '><', '>',
+        '..', '.', '?:', '?', '%:', '%',
+        '#', '@', '$', '=', '/', '*', ':',
+        '(', ')', '[', ']', '{', '}',
+    )
+    PARSER = OneOfParser(*[_literal(symbol) for symbol in SYMBOLS])
+
+
 @_register_token
 class WhitespaceToken(Token):
     ID = 'whitespace'
-    PARSER = ZeroManyParser(
-        OneOfParser(NewlineChar(), SpaceChar())
+    SKIP = True
+    PARSER = OneManyParser(
+        OneOfParser(
+            NewlineParser(),
+            SpaceParser(),
+            CharParser(','),
+            CharParser(';'),
+        )
     )
@@ -1,9 +1,20 @@
+from ..lexing.lexer import CompiledLexer
+from .grammar import TreeParser
+from .nodes import RootNode
 from .parsers import ParserHintMap
 
 
 class Language:
     def __init__(self):
         self.hint_map = ParserHintMap()
+        self._lexer = CompiledLexer()
 
-    def parse(self, text):
-        pass
+    def parse(self, text: str, lazy: bool = False) -> RootNode:
+        '''Parse text into a tree. When lazy, bracketed bodies are only
+        parsed when their key or items are first read. Names and
+        concepts are interned in the symbol table of the root.'''
+        return self.parser(lazy).parse(text)
+
+    def parser(self, lazy: bool = False) -> TreeParser:
+        '''A tree parser over the lexer of the language'''
+        return TreeParser(self._lexer, lazy)
@@ -0,0 +1,305 @@
+'''Parser of MEL documents into a tree, see docs/grammar.md.
+
+Tokens are lexed on demand, so in lazy mode the text of a bracketed
+body is not even lexed until the body is read: the parser finds where
+the body ends by bracket matching over the raw text and skips it.
+'''
+from typing import Iterator
+
+from ..exceptions import ParsingError
+from ..lexing.brackets import bracket_pairs, match_bracket
+from ..lexing.lexer import CompiledLexer, Lexer
+from ..lexing.numbers import scan_numbers
+from ..lexing.symbols import SymbolTable
+from ..scanning.stream import CharStream
+from .nodes import (
+    BooleanNode,
+    CollectionNode,
+    FloatNode,
+    IntNode,
+    KeywordNode,
+    ListNode,
+    ObjectNode,
+    PathNode,
+    QueryNode,
+    RangeNode,
+    RelationNode,
+    RootNode,
+    StringNode,
+    SymbolNode,
+    TreeNode,
+)
+
+
+_COLLECTIONS = {cls.OPEN: cls for cls in (ObjectNode, QueryNode, ListNode)}
+_LITERALS = {'int': IntNode, 'float': FloatNode, 'string': StringNode}
+_KEYWORDS = ('name', 'concept')
+_OBJECT_KEYS = ('*', ':', '%:', '?:')
+_QUERY_KEYS = (':',)
+_SEPARATORS = ('/', '.')
+
+
+class _Cursor:
+    '''Current significant token of a stream, lexed one at a time'''
+
+    def __init__(self, stream: CharStream, lexer: Lexer,
+                 symbols: SymbolTable, index: int = 0):
+        self.stream = stream
+        self._lexer = lexer
+        self._symbols = symbols
+        # ends of the brackets in the span being parsed, when known
+        self.brackets: dict[int, int] = None
+        self.kind = ''
+        self.value = ''
+        # id of the current name or concept, interned when lexed
+        self.symbol = -1
+        self.start = self.end = index
+        self.jump(index)
+
+    def jump(self, index: int) -> None:
+        '''Move to the first significant token at or after index'''
+        stream, lexer = self.stream, self._lexer
+        while index < len(stream):
+            TokenClass, produce = lexer.match(stream, index)
+            if TokenClass is None:
+                raise lexer.error(stream, index)
+            if not TokenClass.SKIP:
+                self.kind = TokenClass.ID
+                self.start, self.end = index, produce.end
+                self.value = stream.slice(index, produce.end)
+                if self.kind in _KEYWORDS:
+                    self.symbol = self._symbols.intern(self.value)
+                return
+            index = produce.end
+        self.kind, self.value = '', ''
+        self.start = self.end = len(stream)
+
+    def advance(self) -> None:
+        self.jump(self.end)
+
+    def is_symbol(self, *symbols: str) -> bool:
+        return self.kind == 'symbol' and self.value in symbols
+
+    def adjacent(self, index: int) -> bool:
+        return self.start == index
+
+
+class TreeParser:
+    '''Rules that contain other rules are generators: they yield the
+    generator of a sub rule and are sent back its node. _run drives them
+    from a list, so nesting depth is only bounded by memory, not by the
+    Python call stack.
+    '''
+
+    def __init__(self, lexer: Lexer = None, lazy: bool = False,
+                 symbols: SymbolTable = None):
+        self._lexer = lexer or CompiledLexer()
+        self.lazy = lazy
+        # shared by the lazy bodies parsed later
+        self.symbols = SymbolTable() if symbols is None else symbols
+
+    def parse(self, text: str) -> RootNode:
+        stream = CharStream(text)
+        expressions = list(self.expressions(stream))
+        root = RootNode(stream, 0, len(stream), expressions)
+        root.symbols = self.symbols
+        return root
+
+    def expressions(self, stream: CharStream) -> Iterator[TreeNode]:
+        '''Top level expressions of a stream, parsed one at a time as
+        they are read, so none has to be kept once used'''
+        cursor = _Cursor(stream, self._lexer, self.symbols)
+        while cursor.kind:
+            yield self._run(self._expression(cursor))
+
+    def parse_body(self, node: CollectionNode) -> None:
+        '''Fill a lazy node, its own bodies stay lazy'''
+        cursor = _Cursor(node.stream, self._lexer, self.symbols, node.start)
+        # one scan of the body finds the ends of all nested bodies, so
+        # reading down a deep chain of lazy nodes stays linear
+        cursor.brackets = node.brackets or bracket_pairs(
+            node.stream.text, node.start, node.end
+        )
+        cursor.advance()
+        self._run(self._fill(cursor, node))
+
+    @staticmethod
+    def _run(rule: Iterator) -> TreeNode:
+        stack, node = [rule], None
+        while stack:
+            try:
+                stack.append(stack[-1].send(node))
+                node = None
+            except StopIteration as stop:
+                stack.pop()
+                node = stop.value
+        return node
+
+    ####################################################################
+    # EXPRESSIONS
+    ####################################################################
+    def _expression(self, cursor: _Cursor) -> Iterator:
+        if not self._starts_path(cursor):
+            return (yield self._value(cursor))
+        path = yield self._path(cursor)
+        if cursor.is_symbol(*RelationNode.SIGNS):
+            sign = cursor.value
+            cursor.advance()
+            value = self._leaf(cursor) or (yield self._value(cursor))
+            return RelationNode(
+                cursor.stream, path.start, value.end, path, sign, value
+            )
+        return path
+
+    def _value(self, cursor: _Cursor) -> Iterator:
+        if node := self._leaf(cursor):
+            return node
+        if cursor.is_symbol('(', '['):
+            return (yield self._collection(cursor))
+        if self._starts_path(cursor):
+            return (yield self._path(cursor))
+        raise self._error(cursor, 'a value')
+
+    def _leaf(self, cursor: _Cursor) -> TreeNode:
+        '''A value without sub rules at the cursor, or None'''
+        if cursor.kind == 'int' or cursor.is_symbol('..'):
+            return self._range_or_int(cursor)
+        if cursor.kind in _LITERALS:
+            return self._token_node(cursor, _LITERALS[cursor.kind])
+        if cursor.kind in _KEYWORDS and cursor.value in BooleanNode.WORDS:
+            return self._token_node(cursor, BooleanNode)
+        return None
+
+    def _range_or_int(self, cursor: _Cursor) -> TreeNode:
+        stream, start = cursor.stream, cursor.start
+        first = None
+        if cursor.kind == 'int':
+            first = self._token_node(cursor, IntNode)
+            if not cursor.is_symbol('..'):
+                return first
+        end = cursor.end
+        cursor.advance()
+        last = None
+        if cursor.kind == 'int' and cursor.adjacent(end):
+            last = self._token_node(cursor, IntNode)
+            end = last.end
+        return RangeNode(stream, start, end, first, last)
+
+    ####################################################################
+    # PATHS
+    ####################################################################
+    def _starts_path(self, cursor: _Cursor) -> bool:
+        if cursor.kind in _KEYWORDS:
+            return cursor.value not in BooleanNode.WORDS
+        return cursor.is_symbol('{', *KeywordNode.PREFIXES)
+
+    def _path(self, cursor: _Cursor) -> Iterator:
+        if cursor.is_symbol('{'):
+            head = yield self._collection(cursor)
+        else:
+            head = self._keyword(cursor)
+        segments = [('', head)]
+        while cursor.is_symbol(*_SEPARATORS) and cursor.adjacent(head.end):
+            separator, end = cursor.value, cursor.end
+            cursor.advance()
+            if not cursor.adjacent(end):
+                raise self._error(cursor, f'a path segment after {separator}')
+            if separator == '/' and cursor.is_symbol(*_COLLECTIONS):
+                head = yield self._collection(cursor)
+            else:
+                head = self._segment(cursor, separator)
+            segments.append((separator, head))
+        start = segments[0][1].start
+        return PathNode(cursor.stream, start, head.end, segments)
+
+    def _segment(self, cursor: _Cursor, separator: str) -> TreeNode:
+        if cursor.is_symbol('*'):
+            return self._token_node(cursor, SymbolNode)
+        if separator == '/' and (
+            cursor.kind == 'int' or cursor.is_symbol('..')
+        ):
+            return self._range_or_int(cursor)
+        return self._keyword(cursor)
+
+    def _keyword(self, cursor: _Cursor) -> KeywordNode:
+        start = cursor.start
+        if cursor.is_symbol(*KeywordNode.PREFIXES):
+            end = cursor.end
+            cursor.advance()
+            if not cursor.adjacent(end):
+                raise self._error(cursor, 'a name after the prefix')
+        if cursor.kind not in _KEYWORDS:
+            raise self._error(cursor, 'a name or concept')
+        node = KeywordNode(cursor.stream, start, cursor.end, cursor.symbol)
+        cursor.advance()
+        return node
+
+    ####################################################################
+    # COLLECTIONS
+    ####################################################################
+    def _collection(self, cursor: _Cursor) -> Iterator:
+        cls = _COLLECTIONS[cursor.value]
+        stream, start = cursor.stream, cursor.start
+        if self.lazy:
+            if cursor.brackets is None:
+                end = match_bracket(stream.text, start)
+            else:
+                end = cursor.brackets.get(start, -1)
+            if end < 0:
+                raise self._error(cursor, f'a closing {cls.CLOSE!r}')
+            cursor.jump(end)
+            node = cls(stream, start, end, self)
+            node.brackets = cursor.brackets
+            return node
+        node = cls(stream, start, start)
+        cursor.advance()
+        yield self._fill(cursor, node)
+        return node
+
+    def _fill(self, cursor: _Cursor, node: CollectionNode) -> Iterator:
+        '''Parse a body from right after its opening bracket'''
+        if isinstance(node, ListNode):
+            run = scan_numbers(cursor.stream.text, node.start + 1)
+            if run is not None:
+                numbers, end = run
+                cursor.jump(end)
+                node.fill_numbers(numbers, end)
+                return
+        key = (yield self._key(cursor, node)) if node.KEYED else None
+        items = []
+        while not cursor.is_symbol(node.CLOSE):
+            if not cursor.kind:
+                raise self._error(cursor, f'a closing {node.CLOSE!r}')
+            if item := self._leaf(cursor):
+                items.append(item)
+            elif node.KEYED:
+                items.append((yield self._expression(cursor)))
+            else:
+                items.append((yield self._value(cursor)))
+        end = cursor.end
+        cursor.advance()
+        node.fill(key, items, end)
+
+    def _key(self, cursor: _Cursor, node: CollectionNode) -> Iterator:
+        keys = _OBJECT_KEYS if isinstance(node, ObjectNode) else _QUERY_KEYS
+        if cursor.is_symbol(*keys):
+            return self._token_node(cursor, SymbolNode)
+        if self._starts_path(cursor):
+            return (yield self._path(cursor))
+        raise self._error(cursor, f'a key for the {node.ID}')
+
+    ####################################################################
+    # HELPERS
+    ####################################################################
+    def _token_node(self, cursor: _Cursor, cls: type) -> TreeNode:
+        node = cls(cursor.stream, cursor.start, cursor.end)
+        cursor.advance()
+        return node
+
+    def _error(self, cursor: _Cursor, expected: str) -> ParsingError:
+        stream, index = cursor.stream, cursor.start
+        found = repr(cursor.value) if cursor.kind else 'the end'
+        line = stream.line(index)
+        column = stream.column(index, line)
+        msg = f'Expected {expected}, found {found}'
+        return ParsingError(msg, line, column)
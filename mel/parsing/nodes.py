@@ -1,3 +1,9 @@
+from array import array
+from typing import Iterator
+
+from ..lexing.numbers import INT_TYPE, number_spans
+from ..lexing.symbols import SymbolTable
+
 
 class Node:
     def __init__(self, id, chars):
@@ -8,4 +14,301 @@ class Node:
         return ''.join(char.value for char in self.chars)
 
     def __bool__(self):
-        return len(self.chars)
+        return len(self.chars) > 0
+
+
+########################################################################
+# TREE NODES
+########################################################################
+class TreeNode(Node):
+    '''A node of the document tree, over source[start:end]'''
+    ID = ''
+
+    def __init__(self, stream, start: int, end: int):
+        self.id = self.ID
+        self.stream = stream
+        self.start = start
+        self.end = end
+
+    @property
+    def chars(self):
+        return self.stream.chars(self.start, self.end)
+
+    @property
+    def text(self) -> str:
+        return self.stream.slice(self.start, self.end)
+
+    @property
+    def line(self) -> int:
+        return self.stream.line(self.start)
+
+    @property
+    def column(self) -> int:
+        return self.stream.column(self.start)
+
+    def children(self) -> list['TreeNode']:
+        return []
+
+    def walk(self) -> Iterator['TreeNode']:
+        '''Nodes of the subtree, depth first, without recursion'''
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children()))
+
+    def __repr__(self):
+        classname = self.__class__.__name__
+        return f'{classname}({self.text})'
+
+    def __bool__(self):
+        return True
+
+
+class LiteralNode(TreeNode):
+    @property
+    def value(self):
+        return self.text
+
+
+class IntNode(LiteralNode):
+    ID = 'int'
+
+    @property
+    def value(self) -> int:
+        return int(self.text)
+
+
+class FloatNode(LiteralNode):
+    ID = 'float'
+
+    @property
+    def value(self) -> float:
+        return float(self.text)
+
+
+class StringNode(LiteralNode):
+    ID = 'string'
+
+    @property
+    def value(self) -> str:
+        return self.text[1:-1]
+
+
+class BooleanNode(LiteralNode):
+    ID = 'boolean'
+    WORDS = ('true', 'false', 'True', 'False')
+
+    @property
+    def value(self) -> bool:
+        return self.text.lower() == 'true'
+
+
+class SymbolNode(TreeNode):
+    '''A symbol standing for a key or a path segment, like * or ?:'''
+    ID = 'symbol'
+
+
+class RangeNode(TreeNode):
+    ID = 'range'
+
+    def __init__(self, stream, start, end, first=None, last=None):
+        super().__init__(stream, start, end)
+        self.first: IntNode = first
+        self.last: IntNode = last
+
+    def children(self) -> list[TreeNode]:
+        return [node for node in (self.first, self.last) if node]
+
+
+class KeywordNode(TreeNode):
+    '''A name or concept, with its prefix symbol if any'''
+    ID = 'keyword'
+    PREFIXES = '#!@$%.?'
+
+    def __init__(self, stream, start, end, symbol: int = -1):
+        super().__init__(stream, start, end)
+        # id of the name in the symbol table of the document
+        self.symbol = symbol
+
+    @property
+    def prefix(self) -> str:
+        first = self.text[0]
+        return first if first in self.PREFIXES else ''
+
+    @property
+    def name(self) -> str:
+        return self.text[len(self.prefix):]
+
+    @property
+    def is_concept(self) -> bool:
+        return self.name[0].isupper()
+
+
+class PathNode(TreeNode):
+    '''Segments joined by / or ., the first one has no separator'''
+    ID = 'path'
+
+    def __init__(self, stream, start, end, segments=None):
+        super().__init__(stream, start, end)
+        self.segments: list[tuple[str, TreeNode]] = segments or []
+
+    @property
+    def is_tag(self) -> bool:
+        head = self.segments[0][1]
+        return isinstance(head, KeywordNode) and head.prefix == '#'
+
+    def children(self) -> list[TreeNode]:
+        return [node for _, node in self.segments]
+
+
+class RelationNode(TreeNode):
+    ID = 'relation'
+    SIGNS = ('=', '!=', '<', '<=', '>', '>=', '><', '<>')
+
+    def __init__(self, stream, start, end, path, sign: str, value):
+        super().__init__(stream, start, end)
+        self.path: PathNode = path
+        self.sign = sign
+        self.value: TreeNode = value
+
+    def children(self) -> list[TreeNode]:
+        return [self.path, self.value]
+
+
+########################################################################
+# COLLECTIONS
+########################################################################
+class CollectionNode(TreeNode):
+    '''A bracketed body, parsed on first access when lazy.
+
+    A lazy node only knows its span until its key or items are read,
+    then its parser fills them in, once.
+    '''
+    OPEN = ''
+    CLOSE = ''
+    KEYED = False
+
+    def __init__(self, stream, start, end, parser=None):
+        super().__init__(stream, start, end)
+        self._parser = parser
+        self._key = None
+        self._items = None
+        # bracket ends shared with the parent body, see TreeParser
+        self.brackets: dict[int, int] = None
+
+    @property
+    def parsed(self) -> bool:
+        return self._items is not None
+
+    @property
+    def key(self) -> TreeNode:
+        self._load()
+        return self._key
+
+    @property
+    def items(self) -> list[TreeNode]:
+        self._load()
+        return self._items
+
+    def fill(self, key: TreeNode, items: list[TreeNode], end: int):
+        self._key = key
+        self._items = items
+        self.end = end
+        self._parser = None
+        self.brackets = None
+
+    def children(self) -> list[TreeNode]:
+        key = [self.key] if self.key is not None else []
+        return key + self.items
+
+    def _load(self):
+        if self._items is None:
+            self._parser.parse_body(self)
+
+    def __repr__(self):
+        classname = self.__class__.__name__
+        if not self.parsed:
+            return f'{classname}(...)'
+        key = self._key.text if self._key is not None else ''
+        return f'{classname}({key})'
+
+
+class ObjectNode(CollectionNode):
+    ID = 'object'
+    OPEN = '('
+    CLOSE = ')'
+    KEYED = True
+
+    @property
+    def expressions(self) -> list[TreeNode]:
+        return self.items
+
+
+class QueryNode(CollectionNode):
+    ID = 'query'
+    OPEN = '{'
+    CLOSE = '}'
+    KEYED = True
+
+    @property
+    def expressions(self) -> list[TreeNode]:
+        return self.items
+
+
+class ListNode(CollectionNode):
+    '''A list of only ints or only floats is kept as a typed array,
+    see lexing/numbers.py. Its nodes are made on first access.
+    '''
+    ID = 'list'
+    OPEN = '['
+    CLOSE = ']'
+
+    def __init__(self, stream, start, end, parser=None):
+        super().__init__(stream, start, end, parser)
+        self._numbers: array = None
+
+    @property
+    def parsed(self) -> bool:
+        return self._items is not None or self._numbers is not None
+
+    @property
+    def numbers(self) -> array:
+        '''The values as an array of ints or floats, else None'''
+        if not self.parsed:
+            self._parser.parse_body(self)
+        return self._numbers
+
+    @property
+    def values(self) -> list[TreeNode]:
+        return self.items
+
+    def fill_numbers(self, numbers: array, end: int):
+        self.end = end
+        self._numbers = numbers
+        self._parser = None
+        self.brackets = None
+
+    def _load(self):
+        if self._items is None and self._numbers is None:
+            self._parser.parse_body(self)
+        if self._items is None:
+            cls = IntNode if self._numbers.typecode == INT_TYPE else FloatNode
+            spans = number_spans(self.stream.text, self.start, self.end)
+            self._items = [cls(self.stream, *span) for span in spans]
+
+
+class RootNode(TreeNode):
+    ID = 'root'
+
+    def __init__(self, stream, start, end, expressions=None):
+        super().__init__(stream, start, end)
+        self.expressions: list[TreeNode] = expressions or []
+        self.symbols: SymbolTable = None
+
+    def children(self) -> list[TreeNode]:
+        return list(self.expressions)
+
+    def __repr__(self):
+        classname = self.__class__.__name__
+        return f'{classname}({len(self.expressions)})'
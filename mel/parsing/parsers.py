@@ -1,43 +1,47 @@
-from ..scanning.stream import Char
+from ..lexing.token import IntToken, StringToken
+from ..scanning.dispatch import DispatchTable
+from ..scanning.parser.base import Parser
+from ..scanning.stream import CharStream
 from .nodes import Node
 
 
 class ParserHintMap:
-    def __init__(self):
-        self._map = {
-            cls.hint: cls for cls in
-            BaseParser.__subclasses__()
-        }
+    '''Rule parsers by the chars their matches can start with.
 
-    def has(self, parser):
-        return self._map.get(parser.hint)
+    The FIRST sets come from the hints of each rule's parser; rules that
+    could start with the same char are reported when the map is built.
+    '''
+
+    def __init__(self, parser_classes: list[type['BaseParser']] = None):
+        self._classes = parser_classes or BaseParser.__subclasses__()
+        self._table = DispatchTable(
+            [cls.PARSER for cls in self._classes], strict=True
+        )
+
+    def get(self, char: str) -> list[type['BaseParser']]:
+        return [self._classes[index]
+                for index in self._table.indexes(ord(char))]
+
+    def has(self, parser: 'BaseParser') -> bool:
+        return type(parser) in self._classes
 
 
 class BaseParser:
     id = ''
-    hint = ''
+    PARSER = Parser()
 
-    def parse(self, stream):
-        chars = self._read(stream)
-        return Node(self.id, chars)
-
-    def _read(self, stream):
-        raise NotImplementedError()
+    def parse(self, stream: CharStream, index: int = 0) -> Node:
+        produce = self.PARSER.parse(stream, index)
+        return Node(self.id, produce.chars if produce else [])
 
 
 # ======================================
 class IntParser(BaseParser):
     id = 'integer'
-    hint = Char.DIGIT
-
-    def _read(self, stream):
-        return stream.one_many_types(Char.DIGIT)
+    PARSER = IntToken.PARSER
 
 
 # ======================================
 class StringParser(BaseParser):
-    id = 'string'  # noqa
-    hint = '"'  # noqa
-
-    def _read(self, stream):
-        return stream.one_str('"')
+    id = 'string'
+    PARSER = StringToken.PARSER
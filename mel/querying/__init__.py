@@ -0,0 +1,6 @@
+from .index import QueryIndex
+from .plans import PLANS, PathEvaluator, PlanCache
+from .references import References
+
+
+__all__ = ['PLANS', 'PathEvaluator', 'PlanCache', 'QueryIndex', 'References']
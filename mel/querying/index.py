@@ -0,0 +1,339 @@
+'''Evaluation of {query ...} constraints over a document tree.
+
+The first query walks the tree once and indexes every object by its key
+and by its tags. Attribute indexes, from a value to the objects having
+it, are built on demand for each (key, attribute) pair queried, so
+equality and `><` constraints are answered by lookups instead of a scan
+of the tree. Other signs filter the candidates left by the lookups.
+
+Buckets are dicts from id(object) to object, kept in the order objects
+were indexed. When the tree changes, callers report the objects added,
+removed or edited and only their own entries are moved.
+'''
+import operator
+from typing import Iterator
+
+from ..exceptions import QueryError
+from ..parsing import Language
+from ..parsing.nodes import (
+    BooleanNode,
+    FloatNode,
+    IntNode,
+    KeywordNode,
+    ListNode,
+    ObjectNode,
+    PathNode,
+    QueryNode,
+    RangeNode,
+    RelationNode,
+    StringNode,
+    SymbolNode,
+    TreeNode,
+)
+from .plans import ChildMaps
+
+
+Bucket = dict[int, ObjectNode]
+
+_NUMBERS = (IntNode, FloatNode)
+_REFERENCES = (KeywordNode, PathNode)
+_COMPARISONS = {
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+}
+
+
+def value_key(node: TreeNode) -> tuple:
+    '''Hashable key of a value node, equal for equal values'''
+    if isinstance(node, BooleanNode):
+        return ('boolean', node.value)
+    if isinstance(node, _NUMBERS):
+        return ('number', node.value)
+    if isinstance(node, StringNode):
+        return ('string', node.value)
+    if isinstance(node, ListNode):
+        if node.numbers is not None:
+            return ('list', tuple(('number', n) for n in node.numbers))
+        return ('list', tuple(value_key(value) for value in node.values))
+    if isinstance(node, (*_REFERENCES, RangeNode)):
+        return ('reference', node.text)
+    # objects and queries are only equal to themselves
+    return ('node', id(node))
+
+
+class _Entry:
+    '''What an object was indexed under, to unindex it when it changes'''
+
+    def __init__(self, node: ObjectNode):
+        self.key = node.key.text
+        self.tags: list[str] = []
+        self.attributes: dict[str, list[tuple]] = {}
+        for expression in node.expressions:
+            if isinstance(expression, RelationNode):
+                if expression.sign == '=':
+                    values = self.attributes.setdefault(
+                        expression.path.text, []
+                    )
+                    values.append(value_key(expression.value))
+            elif isinstance(expression, PathNode) and expression.is_tag:
+                self.tags.append(expression.text[1:])
+
+
+class QueryIndex:
+    def __init__(self, root: TreeNode, language: Language = None):
+        self.root = root
+        self.lookups = 0
+        self.scans = 0
+        self.maps = ChildMaps()
+        self._language = language
+        self._objects: Bucket = None
+        self._entries: dict[int, _Entry] = {}
+        self._keys: dict[str, Bucket] = {}
+        self._tags: dict[str, Bucket] = {}
+        # (key or None for any key, attribute) -> value key -> objects
+        self._attributes: dict[tuple, dict[tuple, Bucket]] = {}
+
+    def select(self, query: QueryNode | str) -> list[ObjectNode]:
+        '''Objects matching a query, in the order of its first indexed
+        constraint, else in index order'''
+        if isinstance(query, str):
+            query = self._parse(query)
+        self._build()
+        key = self._simple_key(query.key)
+        rows = self._candidates(query.key)
+        ordered = False
+        for expression in query.expressions:
+            if _is_indexed(expression):
+                found = self._lookup(key, expression)
+                if ordered:
+                    rows = {id_: node for id_, node in rows.items()
+                            if id_ in found}
+                else:
+                    rows = {id_: node for id_, node in found.items()
+                            if id_ in rows}
+                    ordered = True
+            elif isinstance(expression, PathNode) and expression.is_tag:
+                found = self._tags.get(expression.text[1:], {})
+                rows = {id_: node for id_, node in rows.items()
+                        if id_ in found}
+            elif isinstance(expression, RelationNode):
+                rows = self._scan(rows, expression)
+            else:
+                raise _error(expression, 'a relation or a tag')
+        return list(rows.values())
+
+    def tagged(self, tag: str) -> list[ObjectNode]:
+        self._build()
+        return list(self._tags.get(tag, {}).values())
+
+    ####################################################################
+    # CHANGES
+    ####################################################################
+    def add(self, node: TreeNode, parent: TreeNode = None) -> None:
+        '''Index the objects of a subtree added to the document under
+        parent, the root when not given'''
+        self.maps.invalidate(self.root if parent is None else parent)
+        if self._objects is None:
+            return
+        for obj in _object_nodes(node):
+            self._add(obj)
+
+    def remove(self, node: TreeNode, parent: TreeNode = None) -> None:
+        '''Unindex the objects of a subtree removed from the document,
+        from under parent, the root when not given'''
+        self.maps.invalidate(self.root if parent is None else parent)
+        if self._objects is None:
+            return
+        for obj in _object_nodes(node):
+            self._remove(obj)
+            self.maps.invalidate(obj)
+
+    def update(self, node: ObjectNode) -> None:
+        '''Reindex an object whose key, tags or attributes changed.
+        Objects added or removed inside it are reported on their own.'''
+        self.maps.invalidate(node)
+        if self._objects is None:
+            return
+        self._remove(node)
+        self._add(node)
+
+    ####################################################################
+    # INDEXING
+    ####################################################################
+    def _build(self) -> None:
+        if self._objects is not None:
+            return
+        self._objects = {}
+        for obj in _object_nodes(self.root):
+            self._add(obj)
+
+    def _add(self, node: ObjectNode) -> None:
+        id_ = id(node)
+        entry = self._entries[id_] = _Entry(node)
+        self._objects[id_] = node
+        self._keys.setdefault(entry.key, {})[id_] = node
+        for tag in entry.tags:
+            self._tags.setdefault(tag, {})[id_] = node
+        for (key, attribute), index in self._attributes.items():
+            if key in (None, entry.key):
+                for value in entry.attributes.get(attribute, ()):
+                    index.setdefault(value, {})[id_] = node
+
+    def _remove(self, node: ObjectNode) -> None:
+        id_ = id(node)
+        entry = self._entries.pop(id_, None)
+        if entry is None:
+            return
+        del self._objects[id_]
+        _discard(self._keys, entry.key, id_)
+        for tag in entry.tags:
+            _discard(self._tags, tag, id_)
+        for (key, attribute), index in self._attributes.items():
+            if key in (None, entry.key):
+                for value in entry.attributes.get(attribute, ()):
+                    _discard(index, value, id_)
+
+    def _attribute_index(self, key: str, attribute: str) -> dict:
+        index = self._attributes.get((key, attribute))
+        if index is None:
+            index = self._attributes[(key, attribute)] = {}
+            rows = self._objects if key is None else self._keys.get(key, {})
+            for id_, node in rows.items():
+                for value in self._entries[id_].attributes.get(attribute, ()):
+                    index.setdefault(value, {})[id_] = node
+        return index
+
+    ####################################################################
+    # EVALUATION
+    ####################################################################
+    def _candidates(self, key: TreeNode) -> Bucket:
+        '''Objects the key of a query refers to'''
+        if isinstance(key, SymbolNode):
+            return self._objects
+        head = key.segments[0][1]
+        if isinstance(head, KeywordNode) and head.prefix == '#':
+            rows = self._tags.get(head.name, {})
+        elif isinstance(head, KeywordNode):
+            rows = self._keys.get(head.text, {})
+        else:
+            raise _error(head, 'a name, concept or tag')
+        for separator, segment in key.segments[1:]:
+            if separator != '/':
+                raise _error(segment, 'a sub path')
+            rows = self._children(rows, segment)
+        return rows
+
+    def _children(self, rows: Bucket, segment: TreeNode) -> Bucket:
+        '''Object children of rows, with the key named by segment'''
+        if isinstance(segment, SymbolNode):
+            name = None
+        elif isinstance(segment, KeywordNode):
+            name = segment.text
+        else:
+            raise _error(segment, 'a name, concept or *')
+        children = {}
+        for node in rows.values():
+            found = self.maps.get(node)
+            items = found.objects if name is None else found.names.get(
+                name, ()
+            )
+            for item in items:
+                if isinstance(item, ObjectNode):
+                    children[id(item)] = item
+        return children
+
+    def _simple_key(self, key: TreeNode) -> str:
+        '''The key text when attribute indexes of that key apply'''
+        if isinstance(key, PathNode) and len(key.segments) == 1:
+            head = key.segments[0][1]
+            if isinstance(head, KeywordNode) and head.prefix != '#':
+                return head.text
+        return None
+
+    def _lookup(self, key: str, relation: RelationNode) -> Bucket:
+        self.lookups += 1
+        index = self._attribute_index(key, relation.path.text)
+        found = {}
+        for value in _lookup_values(relation):
+            found.update(index.get(value, {}))
+        return found
+
+    def _scan(self, rows: Bucket, relation: RelationNode) -> Bucket:
+        self.scans += 1
+        attribute, sign = relation.path.text, relation.sign
+        if sign == '<>':
+            excluded = set(_lookup_values(relation))
+
+            def matches(value):
+                return value not in excluded
+        else:
+            compare, expected = _COMPARISONS[sign], value_key(relation.value)
+
+            def matches(value):
+                if value[0] != expected[0]:
+                    return sign == '!='
+                try:
+                    return compare(value[1], expected[1])
+                except TypeError:
+                    return False
+        return {
+            id_: node for id_, node in rows.items()
+            if any(map(matches, self._entries[id_].attributes.get(
+                attribute, ()
+            )))
+        }
+
+    def _parse(self, text: str) -> QueryNode:
+        if self._language is None:
+            self._language = Language()
+        expressions = self._language.parse(text).expressions
+        node = expressions[0] if len(expressions) == 1 else None
+        # a query alone is the head of a path
+        if isinstance(node, PathNode) and len(node.segments) == 1:
+            node = node.segments[0][1]
+        if not isinstance(node, QueryNode):
+            raise QueryError(f'Expected a single query, found {text!r}')
+        return node
+
+
+def _is_indexed(expression: TreeNode) -> bool:
+    return isinstance(expression, RelationNode) \
+        and expression.sign in ('=', '><')
+
+
+def _lookup_values(relation: RelationNode) -> list[tuple]:
+    '''Value keys a = or >< constraint is met by.
+    `a = [1 2]` matches a list equal to [1 2] or one of its items.'''
+    value = relation.value
+    if not isinstance(value, ListNode):
+        return [value_key(value)]
+    items = [value_key(item) for item in value.values]
+    return [value_key(value)] + items if relation.sign == '=' else items
+
+
+def _object_nodes(node: TreeNode) -> Iterator[ObjectNode]:
+    '''Objects of a subtree, queries are not part of the data'''
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, QueryNode):
+            continue
+        if isinstance(node, ObjectNode):
+            yield node
+        stack.extend(reversed(node.children()))
+
+
+def _discard(buckets: dict, key, id_: int) -> None:
+    bucket = buckets.get(key)
+    if bucket is not None:
+        bucket.pop(id_, None)
+        if not bucket:
+            del buckets[key]
+
+
+def _error(node: TreeNode, expected: str) -> QueryError:
+    msg = f'Expected {expected}, found {node.text!r}'
+    return QueryError(msg, node.line, node.column)
@@ -0,0 +1,230 @@
+'''Compiled plans of path queries, like fruits/[apple, mango]/#id.
+
+A path is compiled once into a tuple of steps and kept in an LRU plan
+cache, so running it again skips parsing. Each step maps the nodes
+reached so far to the next ones:
+
+    name      child objects keyed name, and values of `name = ...`
+    attribute values of `name = ...` only, after a `.`
+    any       child objects, or the values of a list
+    fan-out   the union of the steps of a list selector, in list order
+    index     the item at a position, range: the items from..to
+
+A bare tag like #sweet passes its object through, so it filters. Steps
+look names up in a hash map of the children of each node, built on
+first use instead of scanning child lists.
+'''
+from collections import OrderedDict
+
+from ..exceptions import QueryError
+from ..parsing import Language
+from ..parsing.nodes import (
+    IntNode,
+    KeywordNode,
+    ListNode,
+    ObjectNode,
+    PathNode,
+    RangeNode,
+    RelationNode,
+    SymbolNode,
+    TreeNode,
+)
+
+
+PLAN_CACHE_SIZE = 256
+
+Step = tuple[str, object]
+
+
+class Children:
+    '''Children of a node by name, see the module docs'''
+
+    def __init__(self, node: TreeNode):
+        self.names: dict[str, list[TreeNode]] = {}
+        self.attributes: dict[str, list[TreeNode]] = {}
+        self.objects: list[TreeNode] = []
+        self.items: list[TreeNode] = []
+        if isinstance(node, ListNode):
+            self.items = self.objects = list(node.values)
+            for value in node.values:
+                if isinstance(value, ObjectNode):
+                    self._name(value.key.text, value)
+            return
+        for item in getattr(node, 'expressions', ()):
+            if isinstance(item, ObjectNode):
+                self.objects.append(item)
+                self._name(item.key.text, item)
+            elif isinstance(item, RelationNode) and item.sign == '=':
+                name = item.path.text
+                self._name(name, item.value)
+                self.attributes.setdefault(name, []).append(item.value)
+            elif isinstance(item, PathNode) and item.is_tag:
+                self._name(item.text, node)
+        self.items = self.objects
+
+    def _name(self, name: str, node: TreeNode) -> None:
+        self.names.setdefault(name, []).append(node)
+
+
+class ChildMaps:
+    '''Children of each node visited, until the node is invalidated'''
+
+    def __init__(self):
+        self._maps: dict[int, tuple[TreeNode, Children]] = {}
+
+    def get(self, node: TreeNode) -> Children:
+        entry = self._maps.get(id(node))
+        if entry is None:
+            # the node is kept with its map so its id is never reused
+            entry = self._maps[id(node)] = (node, Children(node))
+        return entry[1]
+
+    def invalidate(self, node: TreeNode) -> None:
+        self._maps.pop(id(node), None)
+
+    def clear(self) -> None:
+        self._maps.clear()
+
+
+########################################################################
+# PLANS
+########################################################################
+class Plan:
+    def __init__(self, path: str, steps: tuple[Step, ...]):
+        self.path = path
+        self.steps = steps
+
+    def run(self, root: TreeNode, maps: ChildMaps) -> list[TreeNode]:
+        nodes = [root]
+        for step in self.steps:
+            nodes = run_step(step, nodes, maps)
+            if not nodes:
+                break
+        return nodes
+
+    def __repr__(self):
+        return f'Plan({self.path})'
+
+
+def compile_path(path: PathNode) -> Plan:
+    steps = []
+    for separator, segment in path.segments:
+        steps.append(_compile_segment(separator, segment))
+    return Plan(path.text, tuple(steps))
+
+
+def _compile_segment(separator: str, segment: TreeNode) -> Step:
+    if isinstance(segment, KeywordNode):
+        return ('attribute' if separator == '.' else 'name', segment.text)
+    if isinstance(segment, SymbolNode):
+        return ('attributes' if separator == '.' else 'any', None)
+    if isinstance(segment, IntNode):
+        return ('index', segment.value)
+    if isinstance(segment, RangeNode):
+        first = segment.first.value if segment.first else None
+        last = segment.last.value if segment.last else None
+        return ('range', (first, last))
+    if isinstance(segment, ListNode):
+        steps = []
+        for value in segment.values:
+            if isinstance(value, PathNode) and len(value.segments) == 1:
+                value = value.segments[0][1]
+            steps.append(_compile_segment('/', value))
+        return ('fan-out', tuple(steps))
+    msg = f'Expected a path segment, found {segment.text!r}'
+    raise QueryError(msg, segment.line, segment.column)
+
+
+def run_step(step: Step, nodes: list[TreeNode], maps: ChildMaps) -> list:
+    kind, argument = step
+    found = []
+    for node in nodes:
+        children = maps.get(node)
+        if kind == 'name':
+            found.extend(children.names.get(argument, ()))
+        elif kind == 'attribute':
+            found.extend(children.attributes.get(argument, ()))
+        elif kind == 'any':
+            found.extend(children.objects)
+        elif kind == 'attributes':
+            for values in children.attributes.values():
+                found.extend(values)
+        elif kind == 'index':
+            if -len(children.items) <= argument < len(children.items):
+                found.append(children.items[argument])
+        elif kind == 'range':
+            first, last = argument
+            end = None if last is None or last == -1 else last + 1
+            found.extend(children.items[first:end])
+        else:
+            for sub_step in argument:
+                found.extend(run_step(sub_step, [node], maps))
+    return found
+
+
+########################################################################
+# CACHE
+########################################################################
+class PlanCache:
+    '''Compiled plans of the most recently used path strings'''
+
+    def __init__(self, max_size: int = PLAN_CACHE_SIZE,
+                 language: Language = None):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._language = language
+        self._plans: OrderedDict[str, Plan] = OrderedDict()
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def get(self, path: str) -> Plan:
+        plan = self._plans.get(path)
+        if plan is not None:
+            self.hits += 1
+            self._plans.move_to_end(path)
+            return plan
+        self.misses += 1
+        plan = self._plans[path] = compile_path(self._parse(path))
+        if len(self._plans) > self.max_size:
+            self._plans.popitem(last=False)
+        return plan
+
+    def clear(self) -> None:
+        self._plans.clear()
+        self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._plans)
+
+    def _parse(self, path: str) -> PathNode:
+        if self._language is None:
+            self._language = Language()
+        expressions = self._language.parse(path).expressions
+        node = expressions[0] if len(expressions) == 1 else None
+        if not isinstance(node, PathNode) or node.text != path.strip():
+            raise QueryError(f'Expected a single path, found {path!r}')
+        return node
+
+
+# plans do not depend on a document, so all documents share them
+PLANS = PlanCache()
+
+
+class PathEvaluator:
+    '''Runs path queries over a document, from its root'''
+
+    def __init__(self, root: TreeNode, plans: PlanCache = None):
+        self.root = root
+        self.plans = PLANS if plans is None else plans
+        self.maps = ChildMaps()
+
+    def get(self, path: str) -> list[TreeNode]:
+        return self.plans.get(path).run(self.root, self.maps)
+
+    def invalidate(self, node: TreeNode) -> None:
+        '''Forget the children of a node whose items changed'''
+        self.maps.invalidate(node)
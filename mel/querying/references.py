@@ -0,0 +1,137 @@
+'''Resolution of references like `category = Category/news`.
+
+The head of a reference is looked up among the top level definitions,
+objects and `name = value` relations, by the symbol id of its name: a
+single hash lookup, with no string compared. The rest of the path runs
+as a plan step by step. A reference is resolved on first access and
+memoized, so forward references work and nothing is walked twice.
+
+Following a reference can land on other references, as in `a = b`.
+Each one is a generator that yields the references it depends on and
+is sent back their nodes. _resolve drives them from a list, like the
+tree parser does. A reference met again while it is still on that list
+is a cycle, so checking for cycles costs O(references + edges) overall.
+'''
+from typing import Iterator
+
+from ..exceptions import ResolutionError
+from ..parsing.nodes import (
+    KeywordNode,
+    ObjectNode,
+    PathNode,
+    RelationNode,
+    RootNode,
+    TreeNode,
+)
+from .plans import ChildMaps, compile_path, run_step
+
+
+def is_reference(node: TreeNode) -> bool:
+    return isinstance(node, PathNode) \
+        and isinstance(node.segments[0][1], KeywordNode)
+
+
+class References:
+    def __init__(self, root: RootNode, maps: ChildMaps = None):
+        self.root = root
+        self.maps = ChildMaps() if maps is None else maps
+        self._definitions: dict[tuple[str, int], list[TreeNode]] = None
+        # id(reference) -> (reference, its nodes)
+        self._resolved: dict[int, tuple[PathNode, list[TreeNode]]] = {}
+
+    def resolve(self, reference: TreeNode) -> list[TreeNode]:
+        '''Nodes a reference stands for, none of them a reference.
+        Any other node stands for itself.'''
+        if not is_reference(reference):
+            return [reference]
+        found = self._resolved.get(id(reference))
+        if found is not None:
+            return found[1]
+        if self._definitions is None:
+            self._definitions = self._define()
+        return self._resolve(reference)
+
+    def definitions(self, name: str) -> list[TreeNode]:
+        '''Top level nodes defined with a name, prefix included'''
+        if not name:
+            return []
+        if self._definitions is None:
+            self._definitions = self._define()
+        prefix = name[0] if name[0] in KeywordNode.PREFIXES else ''
+        symbol = self.root.symbols.get(name[len(prefix):])
+        return self._definitions.get((prefix, symbol), [])
+
+    def invalidate(self) -> None:
+        '''Forget every definition and resolution, after an edit'''
+        self._definitions = None
+        self._resolved.clear()
+        self.maps.clear()
+
+    ####################################################################
+    # RESOLVING
+    ####################################################################
+    def _resolve(self, reference: PathNode) -> list[TreeNode]:
+        stack = [(reference, self._follow(reference))]
+        active = {id(reference)}
+        nodes = None
+        while stack:
+            current, rule = stack[-1]
+            try:
+                target = rule.send(nodes)
+            except StopIteration as stop:
+                stack.pop()
+                active.discard(id(current))
+                nodes = stop.value
+                self._resolved[id(current)] = (current, nodes)
+                continue
+            found = self._resolved.get(id(target))
+            if found is not None:
+                nodes = found[1]
+                continue
+            if id(target) in active:
+                raise _error(target, 'Reference cycle at')
+            active.add(id(target))
+            stack.append((target, self._follow(target)))
+            nodes = None
+        return nodes
+
+    def _follow(self, reference: PathNode) -> Iterator:
+        head = reference.segments[0][1]
+        nodes = self._definitions.get((head.prefix, head.symbol))
+        if not nodes:
+            raise _error(head, 'Undefined name')
+        nodes = yield from self._dereference(nodes)
+        for step in compile_path(reference).steps[1:]:
+            nodes = yield from self._dereference(
+                run_step(step, nodes, self.maps)
+            )
+        return nodes
+
+    def _dereference(self, nodes: list[TreeNode]) -> Iterator:
+        found = []
+        for node in nodes:
+            if is_reference(node):
+                found.extend((yield node))
+            else:
+                found.append(node)
+        return found
+
+    def _define(self) -> dict[tuple[str, int], list[TreeNode]]:
+        definitions = {}
+        for expression in self.root.expressions:
+            if isinstance(expression, ObjectNode):
+                path, node = expression.key, expression
+            elif isinstance(expression, RelationNode) \
+                    and expression.sign == '=':
+                path, node = expression.path, expression.value
+            else:
+                continue
+            if is_reference(path) and len(path.segments) == 1:
+                keyword = path.segments[0][1]
+                key = (keyword.prefix, keyword.symbol)
+                definitions.setdefault(key, []).append(node)
+        return definitions
+
+
+def _error(node: TreeNode, msg: str) -> ResolutionError:
+    return ResolutionError(f'{msg} {node.text!r}', node.line, node.column)
@@ -0,0 +1,109 @@
+import re
+from bisect import bisect_right
+from functools import cache
+
+from .char import classify, NEWLINE
+
+
+_BYTE_SIZE = 256
+
+
+class _CodeTable(dict):
+    '''str.translate table: ASCII chars to their class flag, others to 0'''
+
+    def __missing__(self, code: int) -> int:
+        return 0
+
+
+_TRANSLATE_TABLE = _CodeTable({
+    code: classify(chr(code)) for code in range(128)
+})
+_LOOKUP_TABLE = bytes(
+    classify(chr(code)) if code < 128 else 0
+    for code in range(_BYTE_SIZE)
+)
+
+
+@cache
+def load_numpy():
+    '''The numpy module, or None when it is not installed. Imported on
+    first use, since loading it costs more than most documents.'''
+    try:
+        import numpy
+    except ImportError:  # pragma: no cover
+        return None
+    return numpy
+
+
+class BulkClasses:
+    '''Class flags of a whole text, computed at once.
+
+    Uses NumPy when it is installed, or str.translate and re otherwise.
+    Offsets are always str offsets, also for non ASCII text.
+    '''
+
+    def __init__(self, text: str = '', use_numpy: bool = True):
+        self._np = load_numpy() if use_numpy else None
+        self._use_numpy = self._np is not None
+        self._size = len(text)
+        self._runs = {}
+        if self._use_numpy:
+            self.codes = self._numpy_codes(text)
+        else:
+            self.codes = text.translate(_TRANSLATE_TABLE).encode('latin-1')
+
+    @property
+    def newlines(self) -> list[int]:
+        if self._use_numpy:
+            return self._np.flatnonzero(self.codes == NEWLINE).tolist()
+        newline = bytes([NEWLINE])
+        return [
+            match.start() for match in re.finditer(newline, self.codes)
+        ]
+
+    def code(self, index: int) -> int:
+        return int(self.codes[index])
+
+    def runs(self, flags: int) -> list[tuple[int, int]]:
+        '''Maximal (start, end) runs of chars matching any of flags'''
+        if self._use_numpy:
+            np = self._np
+            inside = np.concatenate((
+                [False], (self.codes & flags) != 0, [False]
+            ))
+            edges = np.flatnonzero(np.diff(inside.astype(np.int8)))
+            return list(zip(edges[::2].tolist(), edges[1::2].tolist()))
+        pattern = self._run_pattern(flags)
+        return [match.span() for match in pattern.finditer(self.codes)]
+
+    def run_end(self, index: int, flags: int) -> int:
+        '''End of the run of chars matching flags that starts at index'''
+        if flags not in self._runs:
+            self._runs[flags] = self._run_ends(flags)
+        starts, ends = self._runs[flags]
+        position = bisect_right(starts, index) - 1
+        if position >= 0 and index < ends[position]:
+            return ends[position]
+        return index
+
+    def _run_ends(self, flags: int) -> tuple[list[int], list[int]]:
+        runs = self.runs(flags)
+        return [start for start, _ in runs], [end for _, end in runs]
+
+    def _numpy_codes(self, text: str):
+        np = self._np
+        lookup = np.frombuffer(_LOOKUP_TABLE, dtype=np.uint8)
+        if text.isascii():
+            raw = np.frombuffer(text.encode('ascii'), dtype=np.uint8)
+            return lookup[raw]
+        # one code point per str offset, anything past ASCII has no class
+        points = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+        return lookup[np.minimum(points, 128)]
+
+    @staticmethod
+    def _run_pattern(flags: int):
+        codes = bytes(code for code in range(1, 128) if code & flags)
+        return re.compile(b'[' + re.escape(codes) + b']+')
+
+    def __len__(self):
+        return self._size
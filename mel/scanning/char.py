@@ -1,24 +1,54 @@
 import string
+import unicodedata
+from functools import lru_cache
 
 
-_CHAR_TYPE_MAP = {}
+# class flags, a char may only have one, parsers may ask for many
+DIGIT = 1
+LOWER = 2
+UPPER = 4
+SYMBOL = 8
+SPACE = 16
+NEWLINE = 32
+
+
+_ASCII_SIZE = 128
+_ASCII_FLAGS = [0] * _ASCII_SIZE
+_ASCII_CLASSES = [None] * _ASCII_SIZE
 
 
 def _register_char(cls):
-    '''Build a {char_str: char_type} dict for chars'''
-    sub_map = {char: cls for char in cls.CHARS}
-    _CHAR_TYPE_MAP.update(sub_map)
+    '''Fill the ASCII flags and class tables for chars'''
+    for char in cls.CHARS:
+        _ASCII_FLAGS[ord(char)] = cls.FLAG
+        _ASCII_CLASSES[ord(char)] = cls
     return cls
 
 
+def classify(value: str) -> int:
+    '''Class flags of a single char, 0 for chars outside ASCII'''
+    code = ord(value)
+    return _ASCII_FLAGS[code] if code < _ASCII_SIZE else 0
+
+
+@lru_cache(maxsize=1024)
+def category(value: str) -> str:
+    '''Unicode general category of a char, like "Ll" or "Nd"'''
+    return unicodedata.category(value)
+
+
 class Char:
+    __slots__ = ('value', 'line', 'column')
     CHARS = ''
+    FLAG = 0
     SKIP = False
 
     @staticmethod
     def build(ch: str = None, line: int = -1, column: int = -1):
         # any char not mapped will be a generic Char
-        _Char = _CHAR_TYPE_MAP.get(ch, Char)
+        _Char = Char
+        if ch and ord(ch) < _ASCII_SIZE:
+            _Char = _ASCII_CLASSES[ord(ch)] or Char
         return _Char(ch, line, column)
 
     def __init__(
@@ -35,26 +65,29 @@ class Char:
         return isinstance(self, EOFChar)
 
     def is_digit(self) -> bool:
-        return isinstance(self, DigitChar)
+        return self.FLAG == DIGIT
 
     def is_lower(self) -> bool:
-        return isinstance(self, LowerChar)
+        return self.FLAG == LOWER
 
     def is_upper(self) -> bool:
-        return isinstance(self, UpperChar)
+        return self.FLAG == UPPER
 
     def is_symbol(self) -> bool:
-        return isinstance(self, SymbolChar)
+        return self.FLAG == SYMBOL
 
     def is_newline(self) -> bool:
-        return isinstance(self, NewlineChar)
+        return self.FLAG == NEWLINE
 
     def is_space(self) -> bool:
-        return isinstance(self, SpaceChar)
+        return self.FLAG == SPACE
 
     def is_other(self) -> bool:
         return isinstance(self, Char)
 
+    def category(self) -> str:
+        return category(self.value) if self.value else ''
+
     def __bool__(self):
         return bool(self.value)
 
@@ -64,36 +97,48 @@ class Char:
 
 
 class EOFChar(Char):
-    pass
+    __slots__ = ()
 
 
 @_register_char
 class DigitChar(Char):
+    __slots__ = ()
     CHARS = string.digits
+    FLAG = DIGIT
 
 
 @_register_char
 class LowerChar(Char):
+    __slots__ = ()
     CHARS = string.ascii_lowercase
+    FLAG = LOWER
 
 
 @_register_char
 class UpperChar(Char):
+    __slots__ = ()
     CHARS = string.ascii_uppercase
+    FLAG = UPPER
 
 
 @_register_char
 class SymbolChar(Char):
+    __slots__ = ()
     CHARS = string.punctuation
+    FLAG = SYMBOL
 
 
 @_register_char
 class SpaceChar(Char):
+    __slots__ = ()
     CHARS = ' \t\r\b\a\v\f'
+    FLAG = SPACE
     SKIP = True
 
 
 @_register_char
 class NewlineChar(Char):
+    __slots__ = ()
     CHARS = '\n'
+    FLAG = NEWLINE
     SKIP = True
@@ -0,0 +1,370 @@
+from .parser.base import Parser
+from .parser.single import (
+    OneManyParser,
+    OptionalParser,
+    ZeroManyParser,
+)
+from .parser.multi import OneOfParser, SeqParser
+from .parser.char import (
+    CharParser,
+    CharSetParser,
+    ExceptCharParser,
+    NotCharParser,
+    AlphaNumParser,
+    DigitParser,
+    LowerParser,
+    NewlineParser,
+    SpaceParser,
+    UpperParser,
+)
+
+
+# char parsers whose match is exactly membership in CHARS
+_CLASS_PARSERS = (
+    AlphaNumParser,
+    DigitParser,
+    LowerParser,
+    NewlineParser,
+    SpaceParser,
+    UpperParser,
+)
+
+
+class CompileError(Exception):
+    pass
+
+
+########################################################################
+# CHAR SET
+########################################################################
+class CharSet:
+    '''A set of chars, or its complement when negated'''
+
+    def __init__(self, chars: str = '', negated: bool = False):
+        self.chars = frozenset(chars)
+        self.negated = negated
+
+    def __contains__(self, char: str) -> bool:
+        return (char in self.chars) != self.negated
+
+    def __or__(self, other: 'CharSet') -> 'CharSet':
+        if not self.negated and not other.negated:
+            return CharSet(self.chars | other.chars)
+        if self.negated and other.negated:
+            return CharSet(self.chars & other.chars, negated=True)
+        positive, negative = (other, self) if self.negated else (self, other)
+        return CharSet(negative.chars - positive.chars, negated=True)
+
+    def isdisjoint(self, other: 'CharSet') -> bool:
+        if self.negated and other.negated:
+            return False
+        if self.negated:
+            return other.chars <= self.chars
+        if other.negated:
+            return self.chars <= other.chars
+        return self.chars.isdisjoint(other.chars)
+
+    def __bool__(self):
+        return self.negated or bool(self.chars)
+
+    def __repr__(self):
+        prefix = '^' if self.negated else ''
+        return f"CharSet({prefix}{''.join(sorted(self.chars))})"
+
+
+########################################################################
+# GRAMMAR ANALYSIS
+########################################################################
+def _atom(parser: Parser) -> CharSet:
+    kind = type(parser)
+    if kind is CharParser:
+        if parser.expected:
+            return CharSet(parser.expected)
+        return CharSet(negated=True)
+    if kind is CharSetParser:
+        return CharSet(parser.expected)
+    if kind is ExceptCharParser:
+        return CharSet(parser.expected, negated=True)
+    if kind in _CLASS_PARSERS:
+        return CharSet(parser.CHARS)
+    raise CompileError(f'Cannot compile {parser!r}')
+
+
+def _is_atom(parser: Parser) -> bool:
+    # a not parser is a zero width lookahead, not a char
+    return isinstance(parser, CharParser) \
+        and not isinstance(parser, NotCharParser)
+
+
+def first(parser: Parser) -> CharSet:
+    '''Chars that can start a non empty match of parser'''
+    if _is_atom(parser):
+        return _atom(parser)
+    if isinstance(parser, SeqParser):
+        chars = CharSet()
+        for child in parser.children():
+            chars = chars | first(child)
+            if not nullable(child):
+                break
+        return chars
+    if isinstance(parser, (OneOfParser, OptionalParser,
+                           ZeroManyParser, OneManyParser)):
+        chars = CharSet()
+        for child in parser.children():
+            chars = chars | first(child)
+        return chars
+    raise CompileError(f'Cannot compile {parser!r}')
+
+
+def nullable(parser: Parser) -> bool:
+    if _is_atom(parser):
+        return False
+    if isinstance(parser, SeqParser):
+        return all(nullable(child) for child in parser.children())
+    if isinstance(parser, OneOfParser):
+        return any(nullable(child) for child in parser.children())
+    if isinstance(parser, (OptionalParser, ZeroManyParser)):
+        return True
+    if isinstance(parser, OneManyParser):
+        return nullable(parser.children()[0])
+    raise CompileError(f'Cannot compile {parser!r}')
+
+
+def _literal(parser: Parser):
+    '''The fixed string matched by parser, if it is a literal'''
+    if type(parser) is CharParser and len(parser.expected) == 1:
+        return parser.expected
+    if type(parser) is SeqParser:
+        parts = [_literal(child) for child in parser.children()]
+        if parts and None not in parts:
+            return ''.join(parts)
+    return None
+
+
+########################################################################
+# NFA
+########################################################################
+class _NFA:
+    def __init__(self):
+        self.edges: list[list[tuple[CharSet, int]]] = []
+        self.epsilons: list[list[int]] = []
+        self.accepts: dict[int, int] = {}
+
+    def state(self) -> int:
+        self.edges.append([])
+        self.epsilons.append([])
+        return len(self.edges) - 1
+
+    def build(self, parser: Parser, follow: CharSet) -> tuple[int, int]:
+        '''Thompson construction, refusing trees where greedy PEG
+        matching and longest regular match could disagree.
+        `follow` holds the chars that may come after parser.
+        '''
+        start, end = self.state(), self.state()
+        if _is_atom(parser):
+            self.edges[start].append((_atom(parser), end))
+        elif isinstance(parser, SeqParser):
+            self._build_seq(parser, start, end, follow)
+        elif isinstance(parser, OneOfParser):
+            self._build_one_of(parser, start, end, follow)
+        elif isinstance(parser, (OptionalParser, ZeroManyParser,
+                                 OneManyParser)):
+            self._build_repeat(parser, start, end, follow)
+        else:
+            raise CompileError(f'Cannot compile {parser!r}')
+        return start, end
+
+    def _build_seq(self, parser, start, end, follow):
+        children = parser.children()
+        current = start
+        for index, child in enumerate(children):
+            child_follow = _follow(children[index + 1:], follow)
+            child_start, child_end = self.build(child, child_follow)
+            self.epsilons[current].append(child_start)
+            current = child_end
+        self.epsilons[current].append(end)
+
+    def _build_one_of(self, parser, start, end, follow):
+        children = parser.children()
+        if any(nullable(child) for child in children):
+            raise CompileError(f'Nullable alternative in {parser!r}')
+        if not (_disjoint(children) or (not follow and _ordered(children))):
+            raise CompileError(f'Ambiguous alternatives in {parser!r}')
+        for child in children:
+            child_start, child_end = self.build(child, follow)
+            self.epsilons[start].append(child_start)
+            self.epsilons[child_end].append(end)
+
+    def _build_repeat(self, parser, start, end, follow):
+        child = parser.children()[0]
+        if nullable(child):
+            raise CompileError(f'Nullable repetition in {parser!r}')
+        if not first(child).isdisjoint(follow):
+            raise CompileError(f'Greedy repetition backtracks in {parser!r}')
+        repeats = not isinstance(parser, OptionalParser)
+        child_follow = first(child) | follow if repeats else follow
+        child_start, child_end = self.build(child, child_follow)
+        self.epsilons[start].append(child_start)
+        self.epsilons[child_end].append(end)
+        if repeats:
+            self.epsilons[child_end].append(child_start)
+        if not isinstance(parser, OneManyParser):
+            self.epsilons[start].append(end)
+
+    def closure(self, states) -> frozenset:
+        stack, seen = list(states), set(states)
+        while stack:
+            for target in self.epsilons[stack.pop()]:
+                if target not in seen:
+                    seen.add(target)
+                    stack.append(target)
+        return frozenset(seen)
+
+
+def _follow(rest: list[Parser], follow: CharSet) -> CharSet:
+    chars = CharSet()
+    for parser in rest:
+        chars = chars | first(parser)
+        if not nullable(parser):
+            return chars
+    return chars | follow
+
+
+def _disjoint(parsers: list[Parser]) -> bool:
+    firsts = [first(parser) for parser in parsers]
+    for index, chars in enumerate(firsts):
+        for other in firsts[index + 1:]:
+            if not chars.isdisjoint(other):
+                return False
+    return True
+
+
+def _ordered(parsers: list[Parser]) -> bool:
+    '''Literals where no earlier one is a prefix of a later one'''
+    literals = [_literal(parser) for parser in parsers]
+    if None in literals:
+        return False
+    for index, literal in enumerate(literals):
+        for later in literals[index + 1:]:
+            if later != literal and later.startswith(literal):
+                return False
+    return True
+
+
+########################################################################
+# DFA
+########################################################################
+class DFA:
+    '''Transition table over char classes, with one label per state'''
+
+    def __init__(self, table, accepts, classes, other):
+        self._table: list[list[int]] = table
+        self._accepts: list[int] = accepts
+        self._classes: dict[str, int] = classes
+        self._other: int = other
+        # UTF-8 bytes past ASCII are only ever part of a non ASCII char
+        self._byte_classes: list[int] = [
+            classes.get(chr(code), other) if code < 128 else other
+            for code in range(256)
+        ]
+
+    @property
+    def ascii_only(self) -> bool:
+        '''True if no atom names a char past ASCII, so UTF-8 bytes can
+        be matched one by one with the same result'''
+        return all(ord(char) < 128 for char in self._classes)
+
+    def match(self, text: str, index: int = 0) -> tuple[int, int]:
+        '''Return (label, end) of the longest match, label -1 if none'''
+        table, classes, other = self._table, self._classes, self._other
+        state = 0
+        label = self._accepts[0]
+        end = index
+        for position in range(index, len(text)):
+            state = table[state][classes.get(text[position], other)]
+            if state < 0:
+                break
+            if self._accepts[state] >= 0:
+                label = self._accepts[state]
+                end = position + 1
+        return label, end
+
+    def match_bytes(self, data: bytes, index: int = 0) -> tuple[int, int]:
+        '''Like match, over UTF-8 bytes, offsets are byte offsets'''
+        table, classes = self._table, self._byte_classes
+        state = 0
+        label = self._accepts[0]
+        end = index
+        for position in range(index, len(data)):
+            state = table[state][classes[data[position]]]
+            if state < 0:
+                break
+            if self._accepts[state] >= 0:
+                label = self._accepts[state]
+                end = position + 1
+        return label, end
+
+    def __len__(self):
+        return len(self._table)
+
+
+def compile_dfa(parsers: list[Parser]) -> DFA:
+    '''Compile parsers into one DFA whose labels are parser indexes.
+    Earlier parsers win when several accept the same match.
+    '''
+    nfa = _NFA()
+    start = nfa.state()
+    atoms = []
+    for label, parser in enumerate(parsers):
+        parser_start, parser_end = nfa.build(parser, CharSet())
+        nfa.epsilons[start].append(parser_start)
+        nfa.accepts[parser_end] = label
+    for edges in nfa.edges:
+        atoms.extend(chars for chars, _ in edges)
+    classes, signatures = _partition(atoms)
+    atom_index = {id(atom): index for index, atom in enumerate(atoms)}
+    return _subset_construction(nfa, start, classes, signatures, atom_index)
+
+
+def _partition(atoms: list[CharSet]):
+    '''Split chars in classes that no atom can tell apart.
+    Class 0 holds every char not named by any atom.
+    '''
+    other = tuple(atom.negated for atom in atoms)
+    signatures = {other: 0}
+    classes = {}
+    for char in set().union(*[atom.chars for atom in atoms]):
+        signature = tuple(char in atom for atom in atoms)
+        if signature not in signatures:
+            signatures[signature] = len(signatures)
+        classes[char] = signatures[signature]
+    return classes, list(signatures)
+
+
+def _subset_construction(nfa, start, classes, signatures, atom_index):
+    initial = nfa.closure([start])
+    states = {initial: 0}
+    queue = [initial]
+    table, accepts = [], []
+    while queue:
+        current = queue.pop(0)
+        row = []
+        for signature in signatures:
+            targets = [
+                target
+                for state in current
+                for chars, target in nfa.edges[state]
+                if signature[atom_index[id(chars)]]
+            ]
+            if not targets:
+                row.append(-1)
+                continue
+            closure = nfa.closure(targets)
+            if closure not in states:
+                states[closure] = len(states)
+                queue.append(closure)
+            row.append(states[closure])
+        table.append(row)
+        labels = [nfa.accepts[s] for s in current if s in nfa.accepts]
+        accepts.append(min(labels) if labels else -1)
+    return DFA(table, accepts, classes, other=0)
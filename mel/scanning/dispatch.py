@@ -0,0 +1,86 @@
+'''First char dispatch over a list of parsers.
+
+The FIRST set of each parser comes from its hints(). A 256 slot table
+maps each char code to the parsers that can start a match with it, so
+a position only tries those. Chars past the table, and parsers whose
+hints can't be known in advance (any char, or an empty match), go to
+the shared `other` slot that every lookup includes.
+'''
+from .parser.base import Parser
+
+
+SLOTS = 256
+
+
+class DispatchConflict(Exception):
+    pass
+
+
+class DispatchTable:
+    '''Parsers by the first char code of their matches, in the order
+    they were given in.
+
+    With strict=True, two parsers that can start with the same char
+    raise DispatchConflict when the table is built.
+    '''
+
+    def __init__(self, parsers: list[Parser], strict: bool = False):
+        self._parsers = list(parsers)
+        self._slots: list[tuple[int, ...]] = []
+        self._other: tuple[int, ...] = ()
+        self._build()
+        if strict and (conflicts := self.conflicts()):
+            raise DispatchConflict(self._conflict_message(conflicts))
+
+    @property
+    def parsers(self) -> list[Parser]:
+        return list(self._parsers)
+
+    def indexes(self, code: int) -> tuple[int, ...]:
+        '''Positions in the parser list that can match char code'''
+        if code < SLOTS:
+            return self._slots[code]
+        return self._other
+
+    def byte_indexes(self, byte: int) -> tuple[int, ...]:
+        '''Like indexes, for a byte of UTF-8 text'''
+        # bytes past ASCII are only part of a char, not a char code
+        if byte < 128:
+            return self._slots[byte]
+        return self._other
+
+    def get(self, char: str) -> list[Parser]:
+        return [self._parsers[index] for index in self.indexes(ord(char))]
+
+    def conflicts(self) -> dict[str, list[Parser]]:
+        '''Chars that more than one parser can start with'''
+        return {
+            chr(code): [self._parsers[index] for index in slot]
+            for code, slot in enumerate(self._slots)
+            if len(slot) > 1
+        }
+
+    def _build(self):
+        slots = [[] for _ in range(SLOTS)]
+        anywhere, wide = set(), set()
+        for index, parser in enumerate(self._parsers):
+            hints = parser.hints()
+            if parser.nullable() or not hints:
+                anywhere.add(index)
+                continue
+            for code in {ord(char) for char in hints}:
+                if code < SLOTS:
+                    slots[code].append(index)
+                else:
+                    wide.add(index)
+        # every slot keeps the given order, with `anywhere` merged in
+        self._slots = [tuple(sorted(anywhere.union(slot))) for slot in slots]
+        self._other = tuple(sorted(anywhere | wide))
+
+    @staticmethod
+    def _conflict_message(conflicts: dict[str, list[Parser]]) -> str:
+        lines = ['Parsers with the same first char:']
+        for char, parsers in conflicts.items():
+            names = ', '.join(repr(parser) for parser in parsers)
+            lines.append(f'  {char!r}: {names}')
+        return '\n'.join(lines)
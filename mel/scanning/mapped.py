@@ -0,0 +1,86 @@
+import mmap
+from bisect import bisect_left
+
+from .char import Char, EOFChar, NewlineChar
+
+
+_NEWLINE = NewlineChar.CHARS.encode('ascii')
+
+
+def _utf8_length(lead: int) -> int:
+    if lead < 0x80:
+        return 1
+    if lead >= 0xf0:
+        return 4
+    if lead >= 0xe0:
+        return 3
+    return 2
+
+
+class MappedStream:
+    '''A char stream over UTF-8 bytes, like a memory mapped file.
+
+    Offsets are byte offsets. Nothing is decoded up front: text, chars
+    and columns are decoded from the bytes only when asked for.
+    '''
+
+    def __init__(self, data: bytes = b''):
+        self.memo = None
+        self.bulk = None
+        self._data = data
+        self._newlines = self.__build(data)
+
+    @property
+    def text(self) -> bytes:
+        return self._data
+
+    def get(self, index: int = 0) -> Char:
+        if index < len(self._data):
+            end = index + _utf8_length(self._data[index])
+            value = self.slice(index, end)
+            return Char.build(value, self.line(index), self.column(index))
+        return EOFChar()
+
+    def slice(self, start: int, end: int) -> str:
+        return self._data[start:end].decode('utf-8')
+
+    def chars(self, start: int, end: int) -> list[Char]:
+        line, column = self.line(start), self.column(start)
+        chars = []
+        for value in self.slice(start, end):
+            chars.append(Char.build(value, line, column))
+            is_newline = value == NewlineChar.CHARS
+            line = line + 1 if is_newline else line
+            column = 0 if is_newline else column + 1
+        return chars
+
+    def line(self, index: int = 0) -> int:
+        return bisect_left(self._newlines, index)
+
+    def column(self, index: int = 0) -> int:
+        line = self.line(index)
+        start = self._newlines[line - 1] + 1 if line else 0
+        prefix = self._data[start:index]
+        if prefix.isascii():
+            return index - start
+        return len(prefix.decode('utf-8', errors='replace'))
+
+    def __build(self, data: bytes) -> list[int]:
+        '''Build a sorted list of newline byte offsets'''
+        newlines = []
+        index = data.find(_NEWLINE)
+        while index >= 0:
+            newlines.append(index)
+            index = data.find(_NEWLINE, index + 1)
+        return newlines
+
+    def __len__(self):
+        return len(self._data)
+
+
+def map_file(file) -> bytes:
+    '''Memory map an open binary file, read only'''
+    if not file.seek(0, 2):
+        # empty files can't be mapped
+        return b''
+    return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
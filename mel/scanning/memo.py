@@ -0,0 +1,50 @@
+class PackratCache:
+    '''Memoize parser results by (parser, index) over a sliding window.
+
+    Entries for indexes more than `window` chars behind the farthest
+    index stored are evicted, so memory stays flat on large inputs.
+    '''
+
+    def __init__(self, window: int = 1024):
+        self.window = window
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+        self._low = 0
+        self._high = 0
+
+    def get(self, parser, index: int):
+        entries = self._entries.get(index)
+        if entries is not None and parser in entries:
+            self.hits += 1
+            return entries[parser]
+        self.misses += 1
+        return None
+
+    def set(self, parser, index: int, produce) -> None:
+        if index < self._high - self.window:
+            return
+        if index not in self._entries:
+            self._entries[index] = {}
+        self._entries[index][parser] = produce
+        if index > self._high:
+            self._high = index
+            self._evict()
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = self.misses = 0
+        self._low = self._high = 0
+
+    def _evict(self) -> None:
+        limit = self._high - self.window
+        while self._low < limit:
+            self._entries.pop(self._low, None)
+            self._low += 1
+
+    def __len__(self):
+        return sum(len(entries) for entries in self._entries.values())
+
+    def __repr__(self):
+        classname = self.__class__.__name__
+        return f'{classname}(hits={self.hits}, misses={self.misses})'
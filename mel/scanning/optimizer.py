@@ -0,0 +1,200 @@
+from .dfa import CompileError, nullable
+from .parser.base import Parser
+from .parser.single import (
+    OneManyParser,
+    OptionalParser,
+    ZeroManyParser,
+)
+from .parser.multi import MultiRuleParser, OneOfParser, SeqParser
+from .parser.char import (
+    CharParser,
+    CharSetParser,
+    AlphaNumParser,
+    DigitParser,
+    LowerParser,
+    NewlineParser,
+    SpaceParser,
+    UpperParser,
+)
+
+
+# single char parsers that can be fused in one set lookup
+_CLASS_PARSERS = (
+    CharParser,
+    CharSetParser,
+    AlphaNumParser,
+    DigitParser,
+    LowerParser,
+    NewlineParser,
+    SpaceParser,
+    UpperParser,
+)
+
+
+def parser_key(parser: Parser) -> tuple:
+    '''A hashable key, equal for parsers that match the same way'''
+    kind = type(parser)
+    if isinstance(parser, CharParser):
+        return (kind.__name__, parser.expected)
+    if kind in (SeqParser, OneOfParser, OptionalParser,
+                ZeroManyParser, OneManyParser):
+        children = tuple(parser_key(child) for child in parser.children())
+        return (kind.__name__, children)
+    # unknown parsers are only equal to themselves
+    return (kind.__name__, id(parser))
+
+
+def optimize(parser: Parser) -> Parser:
+    '''Rewrite a parser tree into an equivalent, cheaper one'''
+    if type(parser) is SeqParser:
+        return _optimize_seq(parser)
+    if type(parser) is OneOfParser:
+        return _optimize_one_of(parser)
+    if type(parser) in (OptionalParser, ZeroManyParser, OneManyParser):
+        return type(parser)(optimize(parser.children()[0]))
+    return parser
+
+
+########################################################################
+# SEQUENCES
+########################################################################
+def _optimize_seq(parser: SeqParser) -> Parser:
+    children = _flatten(SeqParser, parser.children())
+    children = _merge_repeats(children)
+    if len(children) == 1 and _is_solid(children[0]):
+        return children[0]
+    return SeqParser(*children)
+
+
+def _merge_repeats(children: list[Parser]) -> list[Parser]:
+    '''X ZeroMany(X) => OneMany(X)'''
+    merged = []
+    for child in children:
+        if merged and type(child) is ZeroManyParser \
+                and _is_solid(merged[-1]) \
+                and parser_key(merged[-1]) == parser_key(child.children()[0]):
+            merged[-1] = OneManyParser(merged[-1])
+        else:
+            merged.append(child)
+    return merged
+
+
+########################################################################
+# ALTERNATIVES
+########################################################################
+def _optimize_one_of(parser: OneOfParser) -> Parser:
+    children = _flatten(OneOfParser, parser.children())
+    children = _left_factor(children)
+    children = _fuse_char_classes(children)
+    if len(children) == 1 and _is_solid(children[0]):
+        return children[0]
+    return OneOfParser(*children)
+
+
+def _fuse_char_classes(children: list[Parser]) -> list[Parser]:
+    '''Fuse runs of adjacent single char alternatives in one set'''
+    fused, run = [], []
+    for child in children + [None]:
+        if child is not None and _is_char_class(child):
+            run.append(child)
+            continue
+        if len(run) > 1:
+            chars = ''.join(_char_class(parser) for parser in run)
+            fused.append(CharSetParser(chars))
+        else:
+            fused.extend(run)
+        run = []
+        if child is not None:
+            fused.append(child)
+    return fused
+
+
+def _left_factor(children: list[Parser]) -> list[Parser]:
+    '''Seq(P, A) / Seq(P, B) / P => Seq(P, Optional(A / B))
+
+    Only adjacent alternatives are factored, so the order in which
+    alternatives are tried stays the same.
+    '''
+    factored, index = [], 0
+    while index < len(children):
+        head, _ = _split(children[index])
+        group = [children[index]]
+        index += 1
+        while index < len(children) and _is_solid(head) \
+                and _tail_is_factorable(group[-1]):
+            other_head, _ = _split(children[index])
+            if parser_key(other_head) != parser_key(head):
+                break
+            group.append(children[index])
+            index += 1
+        factored.extend(_factor_group(head, group))
+    return factored
+
+
+def _factor_group(head: Parser, group: list[Parser]) -> list[Parser]:
+    if len(group) == 1:
+        return group
+    tails = [_split(parser)[1] for parser in group]
+    if not all(_is_solid(SeqParser(*tail)) for tail in tails if tail):
+        return group
+    alternatives = [_as_parser(tail) for tail in tails if tail]
+    rest = optimize(OneOfParser(*alternatives))
+    if not tails[-1]:
+        rest = OptionalParser(rest)
+    return [SeqParser(head, rest)]
+
+
+def _tail_is_factorable(parser: Parser) -> bool:
+    # an alternative that is the bare prefix must close its group,
+    # otherwise it would shadow the alternatives after it
+    return bool(_split(parser)[1])
+
+
+def _split(parser: Parser) -> tuple[Parser, list[Parser]]:
+    if type(parser) is SeqParser and parser.children():
+        children = parser.children()
+        return children[0], children[1:]
+    return parser, []
+
+
+def _as_parser(parsers: list[Parser]) -> Parser:
+    return parsers[0] if len(parsers) == 1 else SeqParser(*parsers)
+
+
+########################################################################
+# HELPERS
+########################################################################
+def _flatten(kind: type[MultiRuleParser], children: list[Parser]):
+    '''Inline nested parsers of the same kind that can't match empty'''
+    flat = []
+    for child in map(optimize, children):
+        if type(child) is kind and _is_solid(child):
+            flat.extend(child.children())
+        else:
+            flat.append(child)
+    return flat
+
+
+def _is_solid(parser: Parser) -> bool:
+    '''True for parsers that never succeed with an empty match.
+    Rewriting nullable parsers could change which empty results are
+    taken as success, so those are left alone.
+    '''
+    try:
+        return not nullable(parser)
+    except CompileError:
+        return False
+
+
+def _is_char_class(parser: Parser) -> bool:
+    if type(parser) not in _CLASS_PARSERS:
+        return False
+    return len(_char_class(parser)) > 0 and not (
+        type(parser) is CharParser and len(parser.expected) != 1
+    )
+
+
+def _char_class(parser: Parser) -> str:
+    if type(parser) in (CharParser, CharSetParser):
+        return parser.expected
+    return parser.CHARS
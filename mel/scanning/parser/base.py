@@ -7,7 +7,25 @@ from ..produce import Produce
 ########################################################################
 class Parser:
     def hints(self):
+        '''Chars that can start a match, '' if any char can'''
         return ''
 
+    def nullable(self) -> bool:
+        '''True if the parser can succeed without consuming chars'''
+        return False
+
+    def children(self) -> list['Parser']:
+        return []
+
     def parse(self, stream: CharStream, index: int = 0) -> Produce:
+        memo = stream.memo
+        if memo is None:
+            return self._parse(stream, index)
+        produce = memo.get(self, index)
+        if produce is None:
+            produce = self._parse(stream, index)
+            memo.set(self, index, produce)
+        return produce
+
+    def _parse(self, stream: CharStream, index: int = 0) -> Produce:
         raise NotImplementedError
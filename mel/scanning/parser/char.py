@@ -1,5 +1,5 @@
 from ..char import (
-    Char,
+    classify,
     DigitChar,
     LowerChar,
     NewlineChar,
@@ -20,78 +20,105 @@ class CharParser(Parser):
     def __init__(self, expected: str = ''):
         self.__expected: str = expected
 
+    @property
+    def expected(self) -> str:
+        return self.__expected
+
     def hints(self) -> str:
         return self.CHARS or self.__expected
 
+    # char parsers are cheaper to run than to look up, skip the memo
     def parse(self, stream: CharStream, index: int = 0) -> Produce:
-        char = stream.get(index)
-        chars = [char] if self._matches(char) else []
-        return Produce(chars, index)
+        text = stream.text
+        if index >= len(text) or not self._matches(text[index]):
+            return Produce(index=index)
+        return Produce.span(stream, index, index + 1)
 
-    def _matches(self, char: Char) -> bool:
+    def _matches(self, value: str) -> bool:
         if self.__expected:
-            return char.value == self.__expected
+            return value == self.__expected
         return True
 
     def __repr__(self) -> str:
         return f'{self.__class__.__name__}({self.__expected})'
 
 
+class ClassParser(CharParser):
+    '''Match chars by their class flags in the ASCII table'''
+    FLAGS = 0
+
+    def _matches(self, value: str) -> bool:
+        return bool(classify(value) & self.FLAGS)
+
+
 ########################################################################
 # SUBPARSER
 ########################################################################
 class NotCharParser(CharParser):
+    def hints(self) -> str:
+        return ''
+
+    def nullable(self) -> bool:
+        return True
+
     def parse(self, stream: CharStream, index: int = 0) -> Produce:
         produce = ValidProduce(index=index)
-        char = stream.get(index)
-        if self._matches(char):
+        value = stream.text[index:index + 1]
+        if self._matches(value):
             return Produce(index=index)
         return produce
 
 
-class LowerParser(CharParser):
-    CHARS = LowerChar.CHARS
+class ExceptCharParser(CharParser):
+    '''Match any single char that is not one of `chars`'''
 
-    def _matches(self, char: Char) -> bool:
-        return char.is_lower()
+    def hints(self) -> str:
+        return ''
 
+    def _matches(self, value: str) -> bool:
+        return value not in self.expected
 
-class UpperParser(CharParser):
-    CHARS = UpperChar.CHARS
 
-    def _matches(self, char: Char) -> bool:
-        return char.is_upper()
+class CharSetParser(CharParser):
+    '''Match any single char in `chars` with one set lookup'''
 
+    def __init__(self, chars: str = ''):
+        super().__init__(''.join(sorted(set(chars))))
+        self._chars = frozenset(chars)
 
-class DigitParser(CharParser):
-    CHARS = DigitChar.CHARS
+    def _matches(self, value: str) -> bool:
+        return value in self._chars
 
-    def _matches(self, char: Char) -> bool:
-        return char.is_digit()
 
+class LowerParser(ClassParser):
+    CHARS = LowerChar.CHARS
+    FLAGS = LowerChar.FLAG
 
-class SpaceParser(CharParser):
-    CHARS = SpaceChar.CHARS
 
-    def _matches(self, char: Char) -> bool:
-        return char.is_space()
+class UpperParser(ClassParser):
+    CHARS = UpperChar.CHARS
+    FLAGS = UpperChar.FLAG
 
 
-class NewlineParser(CharParser):
-    CHARS = NewlineChar.CHARS
+class DigitParser(ClassParser):
+    CHARS = DigitChar.CHARS
+    FLAGS = DigitChar.FLAG
 
-    def _matches(self, char: Char) -> bool:
-        return char.is_newline()
+
+class SpaceParser(ClassParser):
+    CHARS = SpaceChar.CHARS
+    FLAGS = SpaceChar.FLAG
+
+
+class NewlineParser(ClassParser):
+    CHARS = NewlineChar.CHARS
+    FLAGS = NewlineChar.FLAG
 
 
-class AlphaNumParser(CharParser):
+class AlphaNumParser(ClassParser):
     CHARS = (
         DigitChar.CHARS +
         LowerChar.CHARS +
         UpperChar.CHARS
     )
-
-    def _matches(self, char: Char) -> bool:
-        return char.is_digit() or \
-               char.is_upper() or \
-               char.is_lower()
+    FLAGS = DigitChar.FLAG | LowerChar.FLAG | UpperChar.FLAG
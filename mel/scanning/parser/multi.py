@@ -10,7 +10,10 @@ class MultiRuleParser(Parser):
     def __init__(self, *parsers: list[Parser]):
         self._parsers: list[Parser] = parsers
 
-    def parse(self, stream: CharStream, index: int = 0) -> Produce:
+    def children(self) -> list[Parser]:
+        return list(self._parsers)
+
+    def _parse(self, stream: CharStream, index: int = 0) -> Produce:
         raise NotImplementedError
 
 
@@ -19,11 +22,22 @@ class MultiRuleParser(Parser):
 ########################################################################
 class SeqParser(MultiRuleParser):
     def hints(self) -> str:
-        if len(self._parsers):
-            return self._parsers[0].hints()
-        return ''
+        # a child that can match empty lets the next one start the match
+        hints = ''
+        for parser in self._parsers:
+            child_hints = parser.hints()
+            # '' is any char, so is anything joined with it
+            if not child_hints:
+                return ''
+            hints += child_hints
+            if not parser.nullable():
+                break
+        return hints
 
-    def parse(self, stream: CharStream, index: int = 0) -> Produce:
+    def nullable(self) -> bool:
+        return all(parser.nullable() for parser in self._parsers)
+
+    def _parse(self, stream: CharStream, index: int = 0) -> Produce:
         produce = Produce(index=index)
         current_index = index
         for parser in self._parsers:
@@ -37,9 +51,13 @@ class SeqParser(MultiRuleParser):
 
 class OneOfParser(MultiRuleParser):
     def hints(self) -> str:
-        return ''.join([p.hints() for p in self._parsers])
+        hints = [parser.hints() for parser in self._parsers]
+        return ''.join(hints) if all(hints) else ''
+
+    def nullable(self) -> bool:
+        return any(parser.nullable() for parser in self._parsers)
 
-    def parse(self, stream: CharStream, index: int = 0) -> Produce:
+    def _parse(self, stream: CharStream, index: int = 0) -> Produce:
         produce = Produce(index=index)
         for parser in self._parsers:
             if subproduce := parser.parse(stream, index):
@@ -1,6 +1,7 @@
 from ..stream import CharStream
 from ..produce import Produce, ValidProduce
 from .base import Parser
+from .char import ClassParser
 
 
 ########################################################################
@@ -13,15 +14,27 @@ class SingleRuleParser(Parser):
     def hints(self) -> str:
         return self._parser.hints()
 
-    def parse(self, stream: CharStream, index: int = 0) -> Produce:
+    def children(self) -> list[Parser]:
+        return [self._parser]
+
+    def _parse(self, stream: CharStream, index: int = 0) -> Produce:
         raise NotImplementedError
 
+    def _run_end(self, stream: CharStream, index: int):
+        '''End of a char class run in bulk mode, None if not available'''
+        if stream.bulk is None or not isinstance(self._parser, ClassParser):
+            return None
+        return stream.bulk.run_end(index, self._parser.FLAGS)
+
 
 ########################################################################
 # SUB PARSERS
 ########################################################################
 class OptionalParser(SingleRuleParser):
-    def parse(self, stream: CharStream, index: int = 0) -> Produce:
+    def nullable(self) -> bool:
+        return True
+
+    def _parse(self, stream: CharStream, index: int = 0) -> Produce:
         produce = ValidProduce(index=index)
         if subproduce := self._parser.parse(stream, index):
             return subproduce
@@ -29,7 +42,12 @@ class OptionalParser(SingleRuleParser):
 
 
 class ZeroManyParser(SingleRuleParser):
-    def parse(self, stream: CharStream, index: int = 0) -> Produce:
+    def nullable(self) -> bool:
+        return True
+
+    def _parse(self, stream: CharStream, index: int = 0) -> Produce:
+        if (end := self._run_end(stream, index)) is not None:
+            return ValidProduce.span(stream, index, end)
         produce = ValidProduce(index=index)
         current_index = index
         while subproduce := self._parser.parse(stream, current_index):
@@ -39,7 +57,14 @@ class ZeroManyParser(SingleRuleParser):
 
 
 class OneManyParser(SingleRuleParser):
-    def parse(self, stream: CharStream, index: int = 0) -> Produce:
+    def nullable(self) -> bool:
+        return self._parser.nullable()
+
+    def _parse(self, stream: CharStream, index: int = 0) -> Produce:
+        if (end := self._run_end(stream, index)) is not None:
+            if end > index:
+                return Produce.span(stream, index, end)
+            return Produce(index=index)
         produce = self._parser.parse(stream, index)
         current_index = index + len(produce)
         while subproduce := self._parser.parse(stream, current_index):
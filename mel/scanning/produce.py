@@ -3,29 +3,82 @@ from .char import Char
 
 class Produce:
     def __init__(self, chars: list[Char] = None, index: int = 0):
-        self.chars = chars or []
+        self._chars = chars or []
+        self._stream = None
+        self._end = index + len(self._chars)
         self.index = index
 
+    @classmethod
+    def span(cls, stream, start: int, end: int):
+        '''Build a produce that only references stream[start:end]'''
+        produce = cls(index=start)
+        produce._chars = None
+        produce._stream = stream
+        produce._end = end
+        return produce
+
+    @property
+    def chars(self) -> list[Char]:
+        if self._chars is None:
+            self._chars = self._stream.chars(self.index, self._end)
+        return self._chars
+
+    @property
+    def end(self) -> int:
+        return self._end
+
+    def is_span(self) -> bool:
+        return self._stream is not None
+
     def line(self):
-        return self.chars[0].line if len(self.chars) else -1
+        if not len(self):
+            return -1
+        if self.is_span():
+            return self._stream.line(self.index)
+        return self.chars[0].line
 
     def column(self):
-        return self.chars[0].column if len(self.chars) else -1
+        if not len(self):
+            return -1
+        if self.is_span():
+            return self._stream.column(self.index)
+        return self.chars[0].column
 
     def __add__(self, produce):
+        if not len(produce):
+            return self._copy()
+        if not len(self) and produce.is_span():
+            return self.__class__.span(
+                produce._stream, produce.index, produce._end
+            )
+        if self._is_adjacent(produce):
+            # merge contiguous spans without copying chars
+            return self.__class__.span(self._stream, self.index, produce._end)
         chars = self.chars + produce.chars
         return self.__class__(chars, self.index)
 
     def __iadd__(self, produce):
         return self + produce
 
+    def _is_adjacent(self, produce) -> bool:
+        return self.is_span() \
+            and produce._stream is self._stream \
+            and produce.index == self._end
+
+    def _copy(self):
+        if self.is_span():
+            return self.__class__.span(self._stream, self.index, self._end)
+        return self.__class__(self._chars, self.index)
+
     def __bool__(self):
-        return len(self.chars) > 0
+        return len(self) > 0
 
     def __len__(self):
-        return len(self.chars)
+        return self._end - self.index
 
     def __str__(self):
+        if self.is_span():
+            return self._stream.slice(self.index, self._end)
         return "".join(char.value for char in self.chars)
 
     def __repr__(self):
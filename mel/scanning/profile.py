@@ -0,0 +1,207 @@
+'''Opt-in profiling of parser calls.
+
+While a Profiler is enabled, the parse methods of every Parser class are
+wrapped to record, per parser instance, how many times it ran, for how
+long, how often it matched and how many times it was run again at an
+index it had already seen (backtracking). Nothing is wrapped while no
+profiler is enabled, so the normal path has no overhead.
+
+    with profiling() as profiler:
+        lexer.match(stream, 0)
+    print(profiler.report())
+
+Setting MEL_PROFILE enables a profiler for the whole process, see
+enable_from_env.
+'''
+import atexit
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from .parser.base import Parser
+from .parser.char import CharParser
+
+
+ENV_VAR = 'MEL_PROFILE'
+
+
+class ParserStats:
+    def __init__(self, label: str):
+        self.label = label
+        self.calls = 0
+        self.successes = 0
+        self.seconds = 0.0
+        self.indexes: dict[int, int] = {}
+        self._active = 0
+
+    @property
+    def failures(self) -> int:
+        return self.calls - self.successes
+
+    @property
+    def reparses(self) -> int:
+        '''Calls at an index this parser had already been run at'''
+        return self.calls - len(self.indexes)
+
+    @property
+    def success_ratio(self) -> float:
+        return self.successes / self.calls if self.calls else 0.0
+
+    def __repr__(self):
+        classname = self.__class__.__name__
+        return f'{classname}({self.label}, calls={self.calls})'
+
+
+class Profiler:
+    def __init__(self, names: dict[Parser, str] = None):
+        self._names = {id(parser): name for parser, name in (
+            names or {}
+        ).items()}
+        self._stats: dict[int, ParserStats] = {}
+        # keep profiled parsers alive so their ids are not reused
+        self._parsers: dict[int, Parser] = {}
+        self._stack: list[list] = []
+        self._stacks: dict[tuple[str, ...], float] = {}
+        self._originals: dict[type, object] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._originals)
+
+    def enable(self):
+        if self.enabled:
+            return
+        for cls in _parser_classes():
+            if 'parse' in cls.__dict__:
+                self._originals[cls] = cls.__dict__['parse']
+                cls.parse = self._wrap(cls.__dict__['parse'])
+
+    def disable(self):
+        for cls, parse in self._originals.items():
+            cls.parse = parse
+        self._originals = {}
+
+    def stats(self) -> list[ParserStats]:
+        '''Stats of every parser that ran, slowest first'''
+        return sorted(
+            self._stats.values(), key=lambda stats: -stats.seconds
+        )
+
+    def report(self, limit: int = 30) -> str:
+        lines = [
+            f'{"parser":<40} {"calls":>9} {"seconds":>9}'
+            f' {"match %":>8} {"reparses":>9}'
+        ]
+        for stats in self.stats()[:limit]:
+            lines.append(
+                f'{stats.label[:40]:<40} {stats.calls:>9}'
+                f' {stats.seconds:>9.4f}'
+                f' {stats.success_ratio * 100:>8.1f} {stats.reparses:>9}'
+            )
+        return '\n'.join(lines)
+
+    def collapsed(self) -> str:
+        '''Self time in microseconds per call stack, one stack per
+        line, in the collapsed format read by flamegraph tools'''
+        return '\n'.join(
+            f'{";".join(map(_frame, stack))} {round(seconds * 1e6)}'
+            for stack, seconds in sorted(self._stacks.items())
+        )
+
+    def _wrap(self, parse):
+        def profiled_parse(parser, stream, index: int = 0):
+            stats = self._stats_of(parser)
+            stats.calls += 1
+            stats.indexes[index] = stats.indexes.get(index, 0) + 1
+            stats._active += 1
+            frame = [stats.label, 0.0]
+            self._stack.append(frame)
+            start = time.perf_counter()
+            try:
+                produce = parse(parser, stream, index)
+            finally:
+                elapsed = time.perf_counter() - start
+                self._stack.pop()
+                stats._active -= 1
+                # time of recursive calls is already in the outer one
+                if not stats._active:
+                    stats.seconds += elapsed
+                self._record_stack(frame, elapsed)
+            if produce:
+                stats.successes += 1
+            return produce
+        profiled_parse.__wrapped__ = parse
+        return profiled_parse
+
+    def _record_stack(self, frame: list, elapsed: float):
+        stack = tuple(
+            [label for label, _ in self._stack] + [frame[0]]
+        )
+        self._stacks[stack] = self._stacks.get(stack, 0.0) \
+            + elapsed - frame[1]
+        if self._stack:
+            self._stack[-1][1] += elapsed
+
+    def _stats_of(self, parser: Parser) -> ParserStats:
+        key = id(parser)
+        if key not in self._stats:
+            self._parsers[key] = parser
+            self._stats[key] = ParserStats(self._label(parser))
+        return self._stats[key]
+
+    def _label(self, parser: Parser) -> str:
+        if id(parser) in self._names:
+            return self._names[id(parser)]
+        if isinstance(parser, CharParser):
+            return repr(parser)
+        return f'{parser.__class__.__name__}#{len(self._stats)}'
+
+
+def _frame(label: str) -> str:
+    # frames can't hold the stack separator or line breaks
+    label = label.encode('unicode_escape').decode('ascii')
+    return label.replace(';', '\\x3b')
+
+
+def _parser_classes() -> Iterator[type]:
+    pending = [Parser]
+    while pending:
+        cls = pending.pop()
+        yield cls
+        pending.extend(cls.__subclasses__())
+
+
+@contextmanager
+def profiling(names: dict[Parser, str] = None) -> Iterator[Profiler]:
+    profiler = Profiler(names)
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+
+
+def enable_from_env(names: dict[Parser, str] = None) -> Profiler | None:
+    '''Profile the whole process when MEL_PROFILE is set.
+
+    MEL_PROFILE=1 prints the report to stderr at exit, any other value
+    is a path where the collapsed stacks are written.
+    '''
+    target = os.environ.get(ENV_VAR)
+    if not target:
+        return None
+    profiler = Profiler(names)
+    profiler.enable()
+    atexit.register(_dump, profiler, target)
+    return profiler
+
+
+def _dump(profiler: Profiler, target: str):
+    profiler.disable()
+    if target == '1':
+        print(profiler.report(), file=sys.stderr)
+        return
+    with open(target, 'w') as file:
+        file.write(profiler.collapsed() + '\n')
@@ -1,26 +1,84 @@
-from .char import Char, EOFChar
+from bisect import bisect_left, bisect_right
+
+from .char import Char, EOFChar, NewlineChar
+from .memo import PackratCache
 
 
 class CharStream:
-    def __init__(self, text: str = ''):
-        self._chars = self.__build(text)
+    def __init__(
+        self,
+        text: str = '',
+        memo: PackratCache = None,
+        bulk: bool = False,
+        origin: tuple[int, int] = (0, 0)
+    ):
+        self.memo = memo
+        self._text = text
+        # (line, column) of the first char, for slices of a larger text
+        self._origin = origin
+        # bulk mode classifies the whole text up front
+        self.bulk = None
+        if bulk:
+            from .bulk import BulkClasses
+            self.bulk = BulkClasses(text)
+        if self.bulk is None:
+            self._newlines = self.__build(text)
+        else:
+            self._newlines = self.bulk.newlines
+
+    @property
+    def text(self) -> str:
+        return self._text
 
     def get(self, index: int = 0) -> Char:
-        if index < len(self._chars):
-            return self._chars[index]
+        if index < len(self._text):
+            value = self._text[index]
+            line = self.line(index)
+            column = self.column(index, line)
+            return Char.build(value, line, column)
         return EOFChar()
 
-    def __build(self, text: str) -> list[Char]:
-        line = column = 0
-        chars = []
-        for str_char in text:
-            char = Char.build(str_char, line, column)
-            chars.append(char)
-            #  update line and columns for next char
-            is_newline = char.is_newline()
-            line = line + 1 if is_newline else line
-            column = 0 if is_newline else column + 1
-        return chars
+    def slice(self, start: int, end: int) -> str:
+        return self._text[start:end]
+
+    def chars(self, start: int, end: int) -> list[Char]:
+        return [self.get(index) for index in range(start, end)]
+
+    def replace(self, start: int, end: int, text: str) -> 'CharStream':
+        '''A new stream with text[start:end] replaced, reusing the
+        newline offsets outside the edit'''
+        stream = CharStream.__new__(CharStream)
+        stream.memo = None
+        stream.bulk = None
+        stream._origin = self._origin
+        stream._text = self._text[:start] + text + self._text[end:]
+        delta = len(text) - (end - start)
+        before = bisect_left(self._newlines, start)
+        after = bisect_right(self._newlines, end - 1) if end else 0
+        inserted = [start + offset for offset in self.__build(text)]
+        shifted = [offset + delta for offset in self._newlines[after:]]
+        stream._newlines = self._newlines[:before] + inserted + shifted
+        return stream
+
+    def line(self, index: int = 0) -> int:
+        # newlines before index, a newline char belongs to its own line
+        return self._origin[0] + bisect_left(self._newlines, index)
+
+    def column(self, index: int = 0, line: int = None) -> int:
+        line = self.line(index) if line is None else line
+        local_line = line - self._origin[0]
+        if local_line == 0:
+            return self._origin[1] + index
+        return index - self._newlines[local_line - 1] - 1
+
+    def __build(self, text: str) -> list[int]:
+        '''Build a sorted list of newline offsets'''
+        newlines = []
+        index = text.find(NewlineChar.CHARS)
+        while index >= 0:
+            newlines.append(index)
+            index = text.find(NewlineChar.CHARS, index + 1)
+        return newlines
 
     def __len__(self):
-        return len(self._chars)
+        return len(self._text)
@@ -9,5 +9,8 @@ setup(
     author_email="karlisson@hacktoon.com",
     license="MIT",
     packages=["mel"],
+    extras_require={
+        "bulk": ["numpy"],
+    },
     zip_safe=False,
 )
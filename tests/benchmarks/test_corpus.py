@@ -0,0 +1,42 @@
+import pytest
+
+from mel import lex
+from benchmarks.corpus import SHAPES, generate
+from benchmarks.suite import main, measure
+
+
+# ====================================================================
+# CORPUS GENERATOR TESTS
+# ====================================================================
+@pytest.mark.parametrize('shape', SHAPES)
+def test_corpus_is_seeded(shape):
+    assert generate(shape, 2000, seed=7) == generate(shape, 2000, seed=7)
+    assert generate(shape, 2000, seed=7) != generate(shape, 2000, seed=8)
+
+
+@pytest.mark.parametrize('shape', SHAPES)
+def test_corpus_size_and_lexing(shape):
+    text = generate(shape, 2000)
+    assert len(text) >= 2000
+    assert len(lex(text)) > 0
+
+
+def test_corpus_unknown_shape():
+    with pytest.raises(ValueError):
+        generate('round')
+
+
+def test_measure_fields():
+    result = measure('tokenstream', 'mixed', 500, seed=0, repeat=1)
+    assert result['tokens'] > 0
+    assert result['chars_per_sec'] > 0
+    assert result['alloc_peak_bytes'] > 0
+
+
+def test_suite_saves_and_compares_results(tmp_path, capsys):
+    path = str(tmp_path / 'suite.json')
+    main(['--target', 'tokenstream', '--shape', 'mixed', '--size', '300',
+          '--repeat', '1', '-o', path])
+    capsys.readouterr()
+    main(['--compare', path, path])
+    assert 'tokenstream' in capsys.readouterr().out
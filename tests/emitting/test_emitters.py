@@ -0,0 +1,218 @@
+import io
+import os
+import json
+import tracemalloc
+import xml.etree.ElementTree as ElementTree
+
+import pytest
+
+from mel.emitting import (
+    EMITTERS,
+    emit,
+    emit_file,
+    export,
+    export_file,
+    output_name,
+    output_root,
+)
+from mel.parsing import Language, grammar
+
+
+EXAMPLE = os.path.join(
+    os.path.dirname(__file__), '..', '..', 'examples', 'page'
+)
+DOCUMENT = '''
+(page #draft
+    title = "Hello <world>"
+    category = Category/news
+    (date day = 3 month = 5)
+    tags = ["a" 1 2.5 true]
+    age > 18
+    "text"
+)
+x = 1..3
+'''
+
+
+def _emit(text, format, lazy=False, **options):
+    file = io.StringIO()
+    emit(Language().parse(text, lazy=lazy), file, format, **options)
+    return file.getvalue()
+
+
+class CountingFile(io.StringIO):
+    writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+
+# ====================================================================
+# FORMAT TESTS
+# ====================================================================
+def test_json_output():
+    document = json.loads(_emit(DOCUMENT, 'json'))
+    assert document['attributes'] == {'x': {'range': [1, 3]}}
+    page = document['values'][0]
+    assert page['key'] == 'page' and page['tags'] == ['draft']
+    assert page['attributes'] == {
+        'title': 'Hello <world>',
+        'category': {'reference': 'Category/news'},
+        'tags': ['a', 1, 2.5, True],
+    }
+    date, relation, text = page['values']
+    assert date['attributes'] == {'day': 3, 'month': 5}
+    assert relation == {'path': 'age', 'sign': '>', 'value': 18}
+    assert text == 'text'
+
+
+def test_xml_output():
+    root = ElementTree.fromstring(_emit(DOCUMENT, 'xml'))
+    relation, page = root
+    assert page.get('key') == 'page'
+    assert [child.tag for child in page] == [
+        'tag', 'relation', 'relation', 'relation', 'object', 'relation',
+        'string'
+    ]
+    assert page[1].find('string').text == 'Hello <world>'
+    assert [item.tag for item in page[3].find('list')] == \
+        ['string', 'int', 'float', 'boolean']
+    assert relation.find('range').text == '1..3'
+
+
+@pytest.mark.parametrize('text, html', [
+    ('(input type="text" 42)', '<input type="text" value="42" />'),
+    ('(p #hidden class=["a" "b"] "x < y" 1 (b "bold"))',
+     '<p hidden class="a b">x &lt; y 1<b>bold</b></p>'),
+    ('(div (?help "no") (* "a" "b") (%fmt 1))', '<div>a b</div>'),
+    ('x = 1 (br)', '<br />'),
+])
+def test_html_output(text, html):
+    assert _emit(text, 'html') == html + '\n'
+
+
+@pytest.mark.parametrize('format', EMITTERS)
+def test_lazy_and_eager_trees_emit_the_same(format):
+    with open(EXAMPLE) as file:
+        text = file.read()
+    assert _emit(text, format, lazy=True) == _emit(text, format)
+
+
+NUMBERS = '''
+a = [1 1 2 3 5 8]
+[0.5 -2.25]
+(p "x" [007 -0] "y")
+(input value=[1 2] [3 4])
+(div title=[1.5 2] [1, 2])
+(?meta [1 2])
+'''
+
+
+@pytest.mark.parametrize('format', EMITTERS)
+def test_numeric_lists_emit_like_other_lists(format, monkeypatch):
+    expected = _emit(NUMBERS, format)
+    monkeypatch.setattr(grammar, 'scan_numbers', lambda text, start: None)
+    assert _emit(NUMBERS, format) == expected
+
+
+def test_numeric_lists_emit_without_nodes():
+    text = '[' + ' '.join(str(n) for n in range(10_000)) + ']'
+    root = Language().parse(text)
+    file = io.StringIO()
+    emit(root, file, 'json', chunk_size=1024)
+    assert json.loads(file.getvalue())['values'] == [list(range(10_000))]
+    assert root.expressions[0]._items is None
+
+
+# ====================================================================
+# STREAMING TESTS
+# ====================================================================
+@pytest.mark.parametrize('format', EMITTERS)
+def test_output_is_written_in_chunks(format):
+    text = ' '.join(f'(item{index} value = {index} "text")'
+                    for index in range(2_000))
+    file = CountingFile()
+    emit(Language().parse(text), file, format, chunk_size=1024)
+    output = file.getvalue()
+    assert file.writes > len(output) // 2048
+    assert output == _emit(text, format)
+
+
+@pytest.mark.parametrize('format', EMITTERS)
+def test_deep_nesting_emits_without_recursion(format):
+    depth = 10_000
+    text = '(a ' * depth + ')' * depth
+    output = _emit(text, format, lazy=True)
+    assert output.count('a') >= depth
+
+
+def _file_peak(tmp_path, count):
+    path = tmp_path / f'flat{count}.mel'
+    path.write_text(''.join(
+        f'(item{index} size = {index} (sub a = "x" b = [1 2]))\n'
+        for index in range(count)
+    ))
+    language = Language()
+    tracemalloc.start()
+    with open(os.devnull, 'w') as file:
+        emit_file(str(path), file, 'json', language)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak, path.stat().st_size
+
+
+def test_emit_file_does_not_keep_the_tree(tmp_path):
+    small, small_size = _file_peak(tmp_path, 500)
+    large, large_size = _file_peak(tmp_path, 3_000)
+    # the source text and its line offsets grow with the file, a tree
+    # of its nodes would take tens of bytes per source char
+    assert large - small < 5 * (large_size - small_size)
+
+
+# ====================================================================
+# EXPORT TESTS
+# ====================================================================
+def test_single_pass_export_equals_separate_emits():
+    root = Language().parse(DOCUMENT, lazy=True)
+    files = {format: io.StringIO() for format in EMITTERS}
+    export(root, files)
+    for format, file in files.items():
+        assert file.getvalue() == _emit(DOCUMENT, format)
+
+
+def test_export_file_writes_each_format(tmp_path):
+    outputs = export_file(EXAMPLE, ['json', 'html'], str(tmp_path / 'out'))
+    assert [os.path.basename(path) for path in outputs] == \
+        ['page.json', 'page.html']
+    with open(outputs[0]) as file:
+        assert json.load(file)['values'][0]['key'] == 'page'
+    with open(outputs[1]) as file:
+        assert file.read().startswith('<page draft title="Hello world"')
+
+
+@pytest.mark.parametrize('paths, names', [
+    (['coll/a/doc', 'coll/b/doc'], ['a/doc', 'b/doc']),
+    (['coll/a/doc', 'coll/a/sub/x'], ['doc', 'sub/x']),
+    (['coll/a/doc'], ['doc']),
+    ([], []),
+])
+def test_output_names_keep_paths_apart(paths, names):
+    root = output_root(paths)
+    assert [output_name(path, root) for path in paths] == \
+        [os.path.normpath(name) for name in names]
+
+
+def test_export_files_of_the_same_name(tmp_path):
+    paths = []
+    for folder in ('a', 'b'):
+        (tmp_path / folder).mkdir()
+        (tmp_path / folder / 'doc').write_text(f'({folder})')
+        paths.append(str(tmp_path / folder / 'doc'))
+    out = str(tmp_path / 'out')
+    root = output_root(paths)
+    for path in paths:
+        export_file(path, ['json'], out, name=output_name(path, root))
+    for folder in ('a', 'b'):
+        with open(os.path.join(out, folder, 'doc.json')) as file:
+            assert json.load(file)['values'][0]['key'] == folder
@@ -0,0 +1,70 @@
+import pytest
+
+from mel.emitting import ir
+from mel.parsing import Language
+from mel.scanning.stream import CharStream
+
+
+def _events(text):
+    return list(ir.lower(Language().parse(text)))
+
+
+def test_objects_give_tags_attributes_then_values():
+    assert _events('(a 1 x = "s" #t b > 2.5)') == [
+        (ir.DOCUMENT, []),
+        (ir.VALUES,),
+        (ir.OBJECT, 'a', 'a', ['t']),
+        (ir.ATTRIBUTE, 'x', 'x'),
+        (ir.LITERAL, 'string', 's', 's'),
+        (ir.END,),
+        (ir.VALUES,),
+        (ir.LITERAL, 'int', 1, '1'),
+        (ir.RELATION, 'b', '>'),
+        (ir.LITERAL, 'float', 2.5, '2.5'),
+        (ir.END,),
+        (ir.END,),
+        (ir.END,),
+    ]
+
+
+@pytest.mark.parametrize('text, event', [
+    ('x = a/b', (ir.REFERENCE, 'reference', 'a/b', None)),
+    ('x = {a}', (ir.REFERENCE, 'query', '{a}', None)),
+    ('x = 2..', (ir.REFERENCE, 'range', '2..', (2, None))),
+    ('x = True', (ir.LITERAL, 'boolean', True, 'true')),
+])
+def test_leaf_events(text, event):
+    assert _events(text)[2] == event
+
+
+@pytest.mark.parametrize('text, key, name', [
+    ('(Page)', 'Page', 'Page'),
+    ('(?help)', '?help', ''),
+    ('(a/b)', 'a/b', ''),
+    ('(*)', '*', ''),
+])
+def test_object_names(text, key, name):
+    assert _events(text)[2][1:3] == (key, name)
+
+
+def test_numeric_lists_are_a_single_event():
+    opcode, kind, numbers, body = _events('x = [1, 2 3]')[2]
+    assert opcode == ir.NUMBERS
+    assert (kind, list(numbers), body) == ('int', [1, 2, 3], '1, 2 3')
+    assert _events('x = [1.5]')[2][1] == 'float'
+    assert _events('x = [1 2.5]')[2] == (ir.LIST,)
+
+
+def test_expressions_lower_like_the_tree():
+    text = '(a 1) x = 2 #t [1 2] y = (b #u) #v "s"'
+    language = Language()
+    stream = CharStream(text)
+    parser = language.parser(lazy=True)
+    events = list(ir.lower_expressions(lambda: parser.expressions(stream)))
+    assert events == _events(text)
+
+
+def test_deep_documents_lower_without_recursion():
+    depth = 10_000
+    events = _events('[' * depth + ']' * depth)
+    assert events.count((ir.LIST,)) == depth
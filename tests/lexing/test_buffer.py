@@ -0,0 +1,54 @@
+import pytest
+
+from mel.lexing.buffer import TokenBuffer
+from mel.lexing.lexer import CompiledLexer
+from mel.lexing.token import NameToken, IntToken
+from mel.scanning.mapped import MappedStream
+from mel.scanning.stream import CharStream
+
+
+# ====================================================================
+# TOKEN BUFFER TESTS
+# ====================================================================
+def test_buffer_columns():
+    buffer = TokenBuffer.build(CharStream('ab 42'))
+    assert list(buffer.starts) == [0, 2, 3]
+    assert list(buffer.ends) == [2, 3, 5]
+    assert buffer.token_class(2) is IntToken
+
+
+def test_buffer_token_proxy_behaves_like_token():
+    buffer = TokenBuffer.build(CharStream('x\n  foo'))
+    token = buffer.get(2)
+    assert isinstance(token, NameToken)
+    assert token.id == 'name'
+    assert repr(token) == 'NameToken(foo)'
+    assert token
+    assert (token.chars[0].line, token.chars[0].column) == (1, 2)
+
+
+def test_buffer_past_end_is_eof():
+    buffer = TokenBuffer.build(CharStream('a'))
+    assert not buffer.get(1)
+    with pytest.raises(IndexError):
+        buffer[1]
+
+
+def test_buffer_text_and_str_view():
+    buffer = TokenBuffer.build(CharStream('(a "b")'))
+    assert buffer.text(3) == '"b"'
+    assert buffer.view(3) == '"b"'
+
+
+def test_buffer_memoryview_over_bytes():
+    stream = MappedStream('(a "ç")'.encode('utf-8'))
+    buffer = TokenBuffer.build(stream, CompiledLexer())
+    view = buffer.view(3)
+    assert isinstance(view, memoryview)
+    assert bytes(view).decode('utf-8') == '"ç"'
+    assert buffer.text(3) == '"ç"'
+
+
+def test_buffer_iterates_tokens():
+    buffer = TokenBuffer.build(CharStream('a b'))
+    assert [token.text for token in buffer] == ['a', ' ', 'b']
@@ -0,0 +1,126 @@
+import os
+
+import pytest
+
+from mel.lexing.buffer import TokenBuffer
+from mel.lexing.cache import TokenCache, grammar_version
+from mel.lexing.lexer import CompiledLexer
+from mel.lexing.source import lex_file
+from mel.lexing.token import Token
+from mel.scanning.stream import CharStream
+
+
+TEXT = '(page title = "Hello" n = -12 r = 3.5 -- note\n  tags = [a b])'
+
+
+def _columns(buffer):
+    return list(buffer.types), list(buffer.starts), list(buffer.ends)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return TokenCache(str(tmp_path / 'cache'))
+
+
+# ====================================================================
+# TOKEN CACHE TESTS
+# ====================================================================
+def test_cache_round_trip(cache):
+    data = TEXT.encode()
+    stream = CharStream(TEXT)
+    buffer = TokenBuffer.build(stream, CompiledLexer())
+    assert cache.get(data, stream) is None
+    cache.set(data, buffer)
+    cached = cache.get(data, stream)
+    assert _columns(cached) == _columns(buffer)
+    assert [token.text for token in cached] == \
+        [token.text for token in buffer]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cache_key_depends_on_source_and_grammar(cache):
+    data = TEXT.encode()
+    assert cache.key(data) != cache.key(data + b' ')
+    classes = Token.classes()
+    assert cache.key(data, classes[:-1]) != cache.key(data, classes)
+    assert grammar_version(classes) == grammar_version(list(classes))
+
+
+def test_cache_ignores_corrupt_entries(cache):
+    data = TEXT.encode()
+    stream = CharStream(TEXT)
+    cache.set(data, TokenBuffer.build(stream, CompiledLexer()))
+    path = os.path.join(cache.directory, cache.key(data) + '.melt')
+    with open(path, 'r+b') as file:
+        file.truncate(20)
+    assert cache.get(data, stream) is None
+
+
+def test_cache_ignores_entries_out_of_range(cache):
+    data = TEXT.encode()
+    stream = CharStream(TEXT)
+    buffer = TokenBuffer.build(stream, CompiledLexer())
+    cache.set(data, buffer)
+    # an entry stored for a grammar with more token types
+    classes = buffer.token_classes[:max(buffer.types)]
+    path = os.path.join(cache.directory, cache.key(data))
+    os.replace(path + '.melt', os.path.join(
+        cache.directory, cache.key(data, classes) + '.melt'
+    ))
+    assert cache.get(data, stream, classes) is None
+    cache.set(data, buffer)
+    assert cache.get(data, CharStream(TEXT[:-1])) is None
+    assert cache.get(data, stream) is not None
+
+
+def test_failed_writes_are_counted_not_raised(tmp_path, monkeypatch):
+    buffer = TokenBuffer.build(CharStream(TEXT), CompiledLexer())
+    not_a_directory = tmp_path / 'file'
+    not_a_directory.write_text('')
+    cache = TokenCache(str(not_a_directory))
+    cache.set(TEXT.encode(), buffer)
+    assert cache.errors == 1
+
+    def full_disk(source, target):
+        raise OSError('No space left on device')
+
+    monkeypatch.setattr(os, 'replace', full_disk)
+    cache = TokenCache(str(tmp_path / 'cache'))
+    cache.set(TEXT.encode(), buffer)
+    assert cache.errors == 1
+    assert os.listdir(cache.directory) == []
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    sources = [f'a{index} = {index}' for index in range(4)]
+    buffers = [TokenBuffer.build(CharStream(text), CompiledLexer())
+               for text in sources]
+    cache = TokenCache(str(tmp_path), max_bytes=1 << 20)
+    for text, buffer in zip(sources, buffers):
+        cache.set(text.encode(), buffer)
+    entry_size = max(size for _, _, size in cache._entries())
+    for index, text in enumerate(sources):
+        path = os.path.join(cache.directory, cache.key(text.encode()))
+        os.utime(path + '.melt', (index, index))
+    # reading the oldest entry makes it the most recently used
+    assert cache.get(sources[0].encode(), CharStream(sources[0]))
+    small = TokenCache(str(tmp_path), max_bytes=entry_size * 2)
+    small.set(sources[0].encode(), buffers[0])
+    kept = [text for text in sources
+            if small.get(text.encode(), CharStream(text))]
+    assert kept == [sources[0], sources[3]]
+
+
+def test_lex_file_with_cache(cache, temporary_file):
+    with temporary_file(TEXT) as file:
+        first = lex_file(file.name, cache=cache)
+        second = lex_file(file.name, cache=cache)
+    assert _columns(first) == _columns(second)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_lex_file_with_cache_hits_empty_files(cache, temporary_file):
+    with temporary_file('') as file:
+        lex_file(file.name, cache=cache)
+        assert len(lex_file(file.name, cache=cache)) == 0
+    assert (cache.hits, cache.misses) == (1, 1)
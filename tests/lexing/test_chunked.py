@@ -0,0 +1,108 @@
+import io
+
+import pytest
+
+from mel.exceptions import LexingError
+from mel.lexing.lexer import Lexer
+from mel.lexing.stream import ChunkedTokenStream, TokenStream
+
+
+TEXT = '''(page  -- a comment
+    title = "Hello
+world"  count = 42 ratio = -3.25
+    tags = [a, b; c]
+)
+'''
+
+
+def _summary(token):
+    char = token.chars[0]
+    return token.id, token.text, char.line, char.column
+
+
+# ====================================================================
+# CHUNKED TOKEN STREAM TESTS
+# ====================================================================
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 7, 16, 1024])
+def test_chunks_lex_the_same_tokens(chunk_size):
+    expected = TokenStream(TEXT)
+    stream = ChunkedTokenStream(io.StringIO(TEXT), chunk_size=chunk_size)
+    tokens = list(stream.tokens())
+    assert len(tokens) == len(expected)
+    for index, token in enumerate(tokens):
+        assert _summary(token) == _summary(expected.get(index))
+
+
+@pytest.mark.parametrize('chunk_size', [1, 5])
+def test_binary_file_is_decoded(chunk_size):
+    text = '(x "ção")\n'
+    stream = ChunkedTokenStream(io.BytesIO(text.encode('utf-8')),
+                                chunk_size=chunk_size)
+    assert [token.text for token in stream.tokens()] == \
+        ['(', 'x', ' ', '"ção"', ')', '\n']
+
+
+def test_get_reads_ahead_and_returns_eof():
+    stream = ChunkedTokenStream(io.StringIO('a b'), chunk_size=1)
+    assert stream.get(2).text == 'b'
+    assert not stream.get(3)
+
+
+def test_get_behind_window_raises():
+    text = 'a ' * 20
+    stream = ChunkedTokenStream(io.StringIO(text), lookahead=4)
+    stream.get(10)
+    assert stream.get(8).text == 'a'
+    with pytest.raises(IndexError):
+        stream.get(2)
+
+
+def test_lexing_error_has_global_position():
+    text = 'a\nb\n  &'
+    stream = ChunkedTokenStream(io.StringIO(text), chunk_size=2)
+    with pytest.raises(LexingError) as error:
+        list(stream.tokens())
+    assert (error.value.line, error.value.column) == (2, 2)
+
+
+class CountingLexer(Lexer):
+    calls = 0
+
+    def match(self, stream, index=0):
+        self.calls += 1
+        return super().match(stream, index)
+
+
+class ReadCountingFile(io.StringIO):
+    read_chars = 0
+
+    def read(self, size=-1):
+        text = super().read(size)
+        self.read_chars += len(text)
+        return text
+
+
+def test_long_multiline_token_is_not_lexed_per_chunk():
+    text = 'a "' + 'line\n' * 20_000 + '" b'
+    lexer = CountingLexer()
+    stream = ChunkedTokenStream(io.StringIO(text), lexer, chunk_size=64)
+    tokens = [token.text for token in stream.tokens()]
+    assert tokens == ['a', ' ', text[2:-2], ' ', 'b']
+    # about one try per doubling, not one per chunk of the string
+    assert lexer.calls < 50
+
+
+def test_text_without_newlines_is_streamed():
+    file = ReadCountingFile('(a 1) ' * 10_000)
+    stream = ChunkedTokenStream(file, chunk_size=64)
+    assert stream.get(0).text == '('
+    assert file.read_chars < 1024
+
+
+def test_buffer_without_complete_token_is_capped():
+    text = 'a\n' + 'x' * 5_000
+    stream = ChunkedTokenStream(io.StringIO(text), chunk_size=64,
+                                max_buffer=1_000)
+    with pytest.raises(LexingError) as error:
+        list(stream.tokens())
+    assert (error.value.line, error.value.column) == (0, 1)
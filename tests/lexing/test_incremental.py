@@ -0,0 +1,84 @@
+import random
+
+import pytest
+
+from mel.exceptions import LexingError
+from mel.lexing.buffer import TokenBuffer
+from mel.lexing.incremental import relex
+from mel.scanning.stream import CharStream
+
+
+TEXT = '(page title = "Hello" n = 12 r = 3.5 -- note\n  tags = [a b])\n'
+
+
+def _spans(buffer):
+    return [
+        (buffer.token_class(i), buffer.starts[i], buffer.ends[i])
+        for i in range(len(buffer))
+    ]
+
+
+def _full(text):
+    return TokenBuffer.build(CharStream(text))
+
+
+# ====================================================================
+# INCREMENTAL LEXING TESTS
+# ====================================================================
+def test_relex_inside_name():
+    buffer = _full(TEXT)
+    start = TEXT.index('title') + 2
+    new, change = relex(buffer, start, start, 'XY')
+    assert new.text(3) == 'tiXYtle'
+    assert change.new_end - change.first <= 2
+    assert _spans(new) == _spans(_full(TEXT[:start] + 'XY' + TEXT[start:]))
+
+
+def test_relex_int_into_float():
+    text = 'n = 12.x'
+    new, change = relex(_full(text), 7, 8, '5')
+    assert new.text(4) == '12.5'
+    assert new.token_class(4).ID == 'float'
+
+
+def test_relex_reuses_tokens_after_edit():
+    buffer = _full(TEXT)
+    start = TEXT.index('12')
+    new, change = relex(buffer, start, start + 2, '987')
+    assert change.old_end < len(buffer)
+    assert len(new) - change.new_end == len(buffer) - change.old_end
+
+
+def test_relex_shifts_lines():
+    buffer = _full(TEXT)
+    new, _ = relex(buffer, 0, 0, '\n\n')
+    token = new.get(len(new) - 2)
+    assert token.text == ')'
+    assert token.chars[0].line == 3
+
+
+def test_relex_error():
+    with pytest.raises(LexingError):
+        relex(_full('a b'), 1, 2, '&')
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_relex_matches_full_lexing(seed):
+    rng = random.Random(seed)
+    text, buffer = TEXT, _full(TEXT)
+    for _ in range(30):
+        start = rng.randint(0, len(text))
+        end = rng.randint(start, min(len(text), start + 4))
+        insert = ''.join(rng.choice('ab1.-" \n=') for _ in range(
+            rng.randint(0, 3)
+        ))
+        new_text = text[:start] + insert + text[end:]
+        try:
+            expected = _full(new_text)
+        except LexingError:
+            with pytest.raises(LexingError):
+                relex(buffer, start, end, insert)
+            continue
+        buffer, _ = relex(buffer, start, end, insert)
+        text = new_text
+        assert _spans(buffer) == _spans(expected), (text, start, end)
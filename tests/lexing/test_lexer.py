@@ -0,0 +1,60 @@
+import pytest
+
+from mel.exceptions import LexingError
+from mel.lexing.lexer import CompiledLexer, OptimizedLexer
+from mel.lexing.stream import TokenStream
+
+
+# ====================================================================
+# TOKEN STREAM TESTS
+# ====================================================================
+def test_empty_stream():
+    stream = TokenStream()
+    assert len(stream) == 0
+    assert not stream.get()
+
+
+@pytest.mark.parametrize('text, ids', [
+    ('42', ['int']),
+    ('-42', ['int']),
+    ('3.14', ['float']),
+    ('5..10', ['int', 'symbol', 'int']),
+    ('foo_1 Bar', ['name', 'whitespace', 'concept']),
+    ('"a b"', ['string']),
+    ("'a\nb'", ['string']),
+    ('a != b', ['name', 'whitespace', 'symbol', 'whitespace', 'name']),
+    ('42 -- answer', ['int', 'whitespace', 'comment']),
+    ('(a,;)', ['symbol', 'name', 'whitespace', 'symbol']),
+])
+def test_token_ids(text, ids):
+    stream = TokenStream(text)
+    assert [stream.get(i).id for i in range(len(stream))] == ids
+
+
+def test_longest_symbol_wins():
+    stream = TokenStream('<=')
+    assert stream.get(0).text == '<='
+
+
+def test_unknown_char_raises_lexing_error():
+    with pytest.raises(LexingError) as error:
+        TokenStream('a\n&')
+    assert error.value.line == 1
+    assert error.value.column == 0
+
+
+@pytest.mark.parametrize('path', [
+    'examples/page',
+    'examples/person',
+    'examples/thumbnail',
+])
+@pytest.mark.parametrize('Lexer', [CompiledLexer, OptimizedLexer])
+def test_lexer_engines_match_interpreted(path, Lexer):
+    with open(path) as file:
+        text = file.read()
+    interpreted = TokenStream(text)
+    compiled = TokenStream(text, lexer=Lexer())
+    assert len(interpreted) == len(compiled)
+    for index in range(len(interpreted)):
+        expected, token = interpreted.get(index), compiled.get(index)
+        assert (expected.id, expected.text) == (token.id, token.text)
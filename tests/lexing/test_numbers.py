@@ -0,0 +1,54 @@
+import pytest
+
+from mel.lexing.numbers import number_texts, scan_numbers, to_numpy
+
+
+# ====================================================================
+# NUMERIC RUN TESTS
+# ====================================================================
+@pytest.mark.parametrize('text, typecode, numbers', [
+    ('[1 1 2 3 5 8]', 'q', [1, 1, 2, 3, 5, 8]),
+    ('[ -1,2;\n3 ]', 'q', [-1, 2, 3]),
+    ('[1.5 -0.25]', 'd', [1.5, -0.25]),
+    ('[9223372036854775807]', 'q', [2 ** 63 - 1]),
+])
+def test_numeric_runs(text, typecode, numbers):
+    found, end = scan_numbers(text, 1)
+    assert found.typecode == typecode
+    assert list(found) == numbers
+    assert end == len(text)
+
+
+@pytest.mark.parametrize('text', [
+    '[]',
+    '[1 2.5]',
+    '[1-2]',
+    '[1..3]',
+    '[1abc]',
+    '[1 -- 2\n]',
+    '[1 "2"]',
+    '[1 2',
+    '[1 .5]',
+    '[1. 2]',
+    '[1.2.3]',
+    '[1 - 2]',
+    '[[1] 2]',
+    '[ , ]',
+    '[9223372036854775808]',
+    '[1' + '0' * 400 + '.0]',
+])
+def test_other_lists_are_not_runs(text):
+    assert scan_numbers(text, 1) is None
+
+
+def test_number_texts_keep_source():
+    assert number_texts(' 007, -0.50\n1') == ['007', '-0.50', '1']
+
+
+def test_numpy_view_shares_memory():
+    np = pytest.importorskip('numpy')
+    numbers, _ = scan_numbers('[1 2 3]', 1)
+    view = to_numpy(numbers)
+    assert view.dtype == np.int64
+    numbers[0] = 7
+    assert view.tolist() == [7, 2, 3]
@@ -0,0 +1,120 @@
+import pytest
+
+from mel.exceptions import LexingError, ParsingError
+from mel.lexing.buffer import TokenBuffer
+from mel.lexing.lexer import CompiledLexer
+from mel.lexing.parallel import (
+    lex_parallel,
+    parse_parallel,
+    split_chunks,
+    top_level_ends,
+)
+from mel.parsing import Language
+from mel.parsing.nodes import KeywordNode
+from mel.scanning.stream import CharStream
+from benchmarks.corpus import generate
+
+
+def _columns(buffer):
+    return list(buffer.types), list(buffer.starts), list(buffer.ends)
+
+
+def _dump(root):
+    return [
+        (type(node).__name__, node.start, node.end, node.line, node.column,
+         node.text, getattr(node, 'symbol', None))
+        for node in root.walk()
+    ]
+
+
+# ====================================================================
+# PRE-SCAN TESTS
+# ====================================================================
+@pytest.mark.parametrize('text, ends', [
+    ('(a) (b (c))', [3, 11]),
+    ('(a ")") (b)', [7, 11]),
+    ("(a ')(') x", [8]),
+    ('(a -- )\n) (b)', [9, 13]),
+    ('x = 1 ) (a)', [7, 11]),
+    ('(a (b)', []),
+])
+def test_top_level_ends(text, ends):
+    assert top_level_ends(text) == ends
+
+
+def test_split_chunks_cover_text():
+    text = '(a 1) (b 2)\n(c 3) x = 4'
+    assert split_chunks(text, chunk_size=1) == [
+        (0, 5), (5, 11), (11, 17), (17, 23)
+    ]
+    assert split_chunks(text, chunk_size=10) == [(0, 11), (11, 23)]
+    assert split_chunks('', chunk_size=10) == [(0, 0)]
+
+
+# ====================================================================
+# PARALLEL LEXING TESTS
+# ====================================================================
+@pytest.mark.parametrize('workers', [1, 2])
+def test_lex_parallel_matches_serial(workers):
+    text = generate('mixed', 20_000, seed=3)
+    expected = TokenBuffer.build(CharStream(text), CompiledLexer())
+    buffer = lex_parallel(text, workers=workers, chunk_size=2_000)
+    assert _columns(buffer) == _columns(expected)
+    token = buffer.get(len(buffer) - 1)
+    assert token.chars[0].line == text.count('\n', 0, buffer.starts[-1])
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_lex_parallel_global_error_position(workers):
+    text = '(a 1)\n(b 2)\n(c\n  &)'
+    with pytest.raises(LexingError) as error:
+        lex_parallel(text, workers=workers, chunk_size=1)
+    assert (error.value.line, error.value.column) == (3, 2)
+
+
+# ====================================================================
+# PARALLEL PARSING TESTS
+# ====================================================================
+@pytest.mark.parametrize('workers', [1, 2])
+def test_parse_parallel_matches_serial(workers):
+    text = generate('mixed', 20_000, seed=5)
+    expected = Language().parse(text)
+    root = parse_parallel(text, workers=workers, chunk_size=2_000)
+    assert len(root.expressions) == len(expected.expressions)
+    assert _dump(root) == _dump(expected)
+    assert len(root.symbols) == len(expected.symbols)
+    keywords = [node for node in root.walk() if isinstance(node, KeywordNode)]
+    assert all(root.symbols.name(node.symbol) == node.name
+               for node in keywords)
+
+
+def test_parse_parallel_keeps_numeric_runs():
+    text = '(a [1 2 3])\n(b\n  [1.5 2.5])'
+    root = parse_parallel(text, workers=1, chunk_size=1)
+    values = root.expressions[1].items[0]
+    assert list(values.numbers) == [1.5, 2.5]
+    assert [(node.line, node.column, node.value) for node in values.items] \
+        == [(2, 3, 1.5), (2, 7, 2.5)]
+
+
+def test_parse_parallel_deep_nesting():
+    depth = 5_000
+    text = '(a ' * depth + ')' * depth + '\n(b 1)'
+    root = parse_parallel(text, workers=2, chunk_size=1)
+    node = root.expressions[0]
+    for _ in range(depth - 1):
+        node = node.items[0]
+    assert node.key.text == 'a' and node.items == []
+    assert (root.expressions[1].line, root.expressions[1].column) == (1, 0)
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_parse_parallel_global_error_position(workers):
+    text = '(a 1)\n(b 2)\n(c\n  = 1)'
+    with pytest.raises(ParsingError) as error:
+        parse_parallel(text, workers=workers, chunk_size=1)
+    with pytest.raises(ParsingError) as expected:
+        Language().parse(text)
+    assert (error.value.line, error.value.column) == \
+        (expected.value.line, expected.value.column)
+    assert error.value.line == 3
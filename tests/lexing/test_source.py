@@ -0,0 +1,51 @@
+import pytest
+
+from mel.lexing.source import lex_file
+from mel.lexing.stream import TokenStream
+from mel.scanning.mapped import MappedStream
+
+
+TEXT = '(page\n  title = "Olá, ção"  size = 42\n  -- ünïcode comment\n)\n'
+
+
+def _summary(token):
+    char = token.chars[0]
+    return token.id, token.text, char.line, char.column
+
+
+# ====================================================================
+# MAPPED STREAM TESTS
+# ====================================================================
+def test_mapped_stream_decodes_chars():
+    stream = MappedStream('aç\nb'.encode('utf-8'))
+    assert stream.get(1).value == 'ç'
+    assert stream.slice(0, 3) == 'aç'
+    assert [char.value for char in stream.chars(0, 5)] == list('aç\nb')
+
+
+@pytest.mark.parametrize('index, line, column', [
+    (0, 0, 0),
+    (1, 0, 1),
+    (3, 0, 2),
+    (4, 1, 0),
+])
+def test_mapped_stream_columns_count_chars(index, line, column):
+    stream = MappedStream('aç\nb'.encode('utf-8'))
+    assert stream.line(index) == line
+    assert stream.column(index) == column
+
+
+# ====================================================================
+# LEX FILE TESTS
+# ====================================================================
+def test_lex_file_matches_token_stream(temporary_file):
+    expected = TokenStream(TEXT)
+    with temporary_file(TEXT) as file:
+        tokens = lex_file(file.name)
+    assert [_summary(token) for token in tokens] == \
+        [_summary(expected.get(i)) for i in range(len(expected))]
+
+
+def test_lex_empty_file(temporary_file):
+    with temporary_file('') as file:
+        assert len(lex_file(file.name)) == 0
@@ -1,6 +1,35 @@
-from mel.lexing.token import Token
+import pytest
+
+from mel.lexing.token import (
+    Token,
+    CommentToken,
+    FloatToken,
+    IntToken,
+    NameToken,
+    StringToken,
+    SymbolToken,
+)
 
 
 def test_token_parsers():
     parsers = Token.parsers('-')
-    assert len(parsers) == 2
+    assert len(parsers) == 3
+    assert parsers == [
+        FloatToken.PARSER, IntToken.PARSER, CommentToken.PARSER
+    ]
+
+
+@pytest.mark.parametrize('TokenClass, hints', [
+    (FloatToken, '-0123456789'),
+    (NameToken, 'abcdefghijklmnopqrstuvwxyz'),
+    (StringToken, '"\''),
+    (CommentToken, '-'),
+])
+def test_token_hints_from_parser(TokenClass, hints):
+    assert TokenClass.HINTS == hints
+
+
+def test_symbol_hints_have_each_first_char():
+    assert set(SymbolToken.HINTS) == {
+        symbol[0] for symbol in SymbolToken.SYMBOLS
+    }
@@ -0,0 +1,197 @@
+import pytest
+
+from mel.exceptions import LexingError, ParsingError
+from mel.lexing.lexer import CompiledLexer
+from mel.parsing import Language
+from mel.parsing.grammar import TreeParser
+from mel.parsing.nodes import (
+    BooleanNode,
+    FloatNode,
+    IntNode,
+    ListNode,
+    ObjectNode,
+    PathNode,
+    QueryNode,
+    RangeNode,
+    RelationNode,
+    StringNode,
+)
+from benchmarks.corpus import generate
+
+
+def _dump(node):
+    children = [_dump(child) for child in node.children()]
+    return (type(node).__name__, node.start, node.end, children)
+
+
+class CountingLexer(CompiledLexer):
+    calls = 0
+
+    def match(self, stream, index=0):
+        self.calls += 1
+        return super().match(stream, index)
+
+
+# ====================================================================
+# TREE TESTS
+# ====================================================================
+@pytest.mark.parametrize('text, cls', [
+    ('42', IntNode),
+    ('-4.5', FloatNode),
+    ('"a (b"', StringNode),
+    ('False', BooleanNode),
+    ('2..5', RangeNode),
+    ('..-2', RangeNode),
+    ('a/b.c', PathNode),
+    ('#tag/name', PathNode),
+    ('[1 2]', ListNode),
+    ('(a)', ObjectNode),
+    ('{a}', PathNode),
+    ('x != 1', RelationNode),
+])
+def test_expression_nodes(text, cls):
+    root = Language().parse(text)
+    assert len(root.expressions) == 1
+    assert isinstance(root.expressions[0], cls)
+    assert root.expressions[0].text == text
+
+
+def test_object_tree():
+    text = '(person #vip\n  name = "Mary" age = 42 (Format name))'
+    person = Language().parse(text).expressions[0]
+    assert person.key.text == 'person'
+    tag, name, age, format = person.expressions
+    assert tag.is_tag
+    assert (name.path.text, name.sign, name.value.value) == \
+        ('name', '=', 'Mary')
+    assert age.value.value == 42
+    assert format.key.segments[0][1].is_concept
+    assert (name.line, name.column) == (1, 2)
+
+
+def test_query_and_path_segments():
+    root = Language().parse('{fruits/* #id = [3, 2]}/0..3/[a b].name')
+    path = root.expressions[0]
+    query = path.segments[0][1]
+    assert isinstance(query, QueryNode)
+    assert query.key.text == 'fruits/*'
+    assert [separator for separator, _ in path.segments] == \
+        ['', '/', '/', '.']
+
+
+@pytest.mark.parametrize('text, position', [
+    ('(a = 1)', (0, 3)),
+    ('(page\n  title = )', (1, 10)),
+    ('[1 2', (0, 4)),
+    ('a/ b', (0, 3)),
+    ('{* x}', (0, 1)),
+])
+def test_parsing_errors(text, position):
+    with pytest.raises(ParsingError) as error:
+        Language().parse(text)
+    assert (error.value.line, error.value.column) == position
+
+
+# ====================================================================
+# LAZY PARSING TESTS
+# ====================================================================
+@pytest.mark.parametrize('shape', ['deep', 'wide', 'mixed'])
+def test_lazy_tree_equals_eager(shape):
+    text = generate(shape, 5_000, seed=2)
+    language = Language()
+    eager = language.parse(text)
+    lazy = language.parse(text, lazy=True)
+    assert _dump(lazy) == _dump(eager)
+
+
+def test_lazy_bodies_parse_on_access_once():
+    text = '(a (b 1) x = [1 2]) (c ")" -- )\n 2)'
+    root = Language().parse(text, lazy=True)
+    first, second = root.expressions
+    assert not first.parsed and not second.parsed
+    assert first.text == '(a (b 1) x = [1 2])'
+    assert first.key.text == 'a'
+    assert first.parsed and not second.parsed
+    inner = first.expressions[0]
+    assert not inner.parsed
+    assert first.expressions[0] is inner
+    assert second.expressions[0].value == ')'
+
+
+def test_lazy_cost_follows_accessed_data():
+    text = ' '.join(f'(item{index} value = [1 2 3] (sub a = 1))'
+                    for index in range(200))
+    eager, lazy = CountingLexer(), CountingLexer()
+    TreeParser(eager).parse(text)
+    root = TreeParser(lazy, lazy=True).parse(text)
+    root.expressions[0].expressions
+    assert lazy.calls * 10 < eager.calls
+
+
+def test_lazy_errors_raise_on_access():
+    root = Language().parse('(a 1) (b = ) (c &)', lazy=True)
+    assert root.expressions[0].key.text == 'a'
+    with pytest.raises(ParsingError):
+        root.expressions[1].key
+    with pytest.raises(LexingError):
+        root.expressions[2].items
+    with pytest.raises(ParsingError):
+        Language().parse('(a (b)', lazy=True)
+
+
+# ====================================================================
+# DEEP NESTING TESTS
+# ====================================================================
+@pytest.mark.parametrize('lazy', [False, True])
+def test_deep_nesting_parses_without_recursion(lazy):
+    depth = 10_000
+    text = ''.join(f'(a{level} x = {level} ' for level in range(depth)) \
+        + ')' * depth
+    root = Language().parse(text, lazy=lazy)
+    nodes = list(root.walk())
+    assert len(nodes) == 7 * depth + 1
+    assert nodes[-1].text == f'{depth - 1}'
+
+
+@pytest.mark.parametrize('lazy', [False, True])
+def test_deep_lists_parse_without_recursion(lazy):
+    depth = 10_000
+    root = Language().parse('[1 ' * depth + ']' * depth, lazy=lazy)
+    lists = [node for node in root.walk() if isinstance(node, ListNode)]
+    assert len(lists) == depth
+    assert lists[-1].values[0].value == 1
+
+
+def test_walk_is_depth_first_in_source_order():
+    root = Language().parse('(a x = [1 2]) 3')
+    texts = [node.text for node in root.walk()][1:]
+    assert texts == ['(a x = [1 2])', 'a', 'a', 'x = [1 2]', 'x', 'x',
+                     '[1 2]', '1', '2', '3']
+
+
+def test_deep_nesting_errors_keep_position():
+    text = '(a ' * 5_000 + '(b = )' + ')' * 5_000
+    with pytest.raises(ParsingError) as error:
+        Language().parse(text)
+    assert error.value.column == 3 * 5_000 + 3
+
+
+# ====================================================================
+# NUMERIC LIST TESTS
+# ====================================================================
+@pytest.mark.parametrize('lazy', [False, True])
+def test_numeric_lists_are_typed_arrays(lazy):
+    root = Language().parse('a = [1 2 3] b = [0.5 -1.5] c = [1 x]', lazy)
+    ints, floats, mixed = [node.value for node in root.expressions]
+    assert ints.numbers.typecode == 'q' and list(ints.numbers) == [1, 2, 3]
+    assert list(floats.numbers) == [0.5, -1.5]
+    assert mixed.numbers is None
+    assert ints._items is None
+
+
+def test_numeric_list_nodes_made_on_access():
+    node = Language().parse('[1, 22 -3]').expressions[0]
+    values = node.values
+    assert [type(value) for value in values] == [IntNode] * 3
+    assert [value.text for value in values] == ['1', '22', '-3']
+    assert node.values is values
@@ -0,0 +1,37 @@
+import pytest
+
+from mel.parsing import Language
+from mel.parsing.parsers import IntParser, ParserHintMap, StringParser
+from mel.scanning.dispatch import DispatchConflict
+from mel.scanning.stream import CharStream
+
+
+# ====================================================================
+# PARSER HINT MAP TESTS
+# ====================================================================
+@pytest.mark.parametrize('char, parsers', [
+    ('-', [IntParser]),
+    ('4', [IntParser]),
+    ('"', [StringParser]),
+    ("'", [StringParser]),
+    ('a', []),
+])
+def test_hint_map_dispatch(char, parsers):
+    assert Language().hint_map.get(char) == parsers
+
+
+def test_hint_map_conflicts_at_build():
+    class NegativeParser(IntParser):
+        pass
+
+    with pytest.raises(DispatchConflict):
+        ParserHintMap([IntParser, NegativeParser])
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('-12 a', '-12'),
+    ('"x y" 2', '"x y"'),
+])
+def test_rule_parse(text, expected):
+    parser = Language().hint_map.get(text[0])[0]()
+    assert repr(parser.parse(CharStream(text))) == expected
@@ -0,0 +1,126 @@
+import pytest
+
+from mel.exceptions import QueryError
+from mel.parsing import Language
+from mel.parsing.nodes import ObjectNode
+from mel.querying import QueryIndex
+
+
+FRUITS = '''
+(fruits
+    (apple  #id = 1  color = "red"  #sweet)
+    (banana #id = 2  color = "yellow"  #sweet)
+    (mango  #id = 3  color = "red")
+)
+(person name = "Mary" age = 42)
+(person name = "John" age = 45 #vip)
+(person name = "Ana" age = 42 (pet name = "Rex"))
+'''
+
+
+@pytest.fixture
+def index():
+    return QueryIndex(Language().parse(FRUITS))
+
+
+def _keys(nodes):
+    return [node.key.text for node in nodes]
+
+
+def _names(nodes):
+    return [node.expressions[0].value.value for node in nodes]
+
+
+# ====================================================================
+# SELECTION TESTS
+# ====================================================================
+@pytest.mark.parametrize('query, names', [
+    ('{person}', ['Mary', 'John', 'Ana']),
+    ('{person name = "Mary"}', ['Mary']),
+    ('{person age = 42}', ['Mary', 'Ana']),
+    ('{person name = "Mary" age = 42}', ['Mary']),
+    ('{person age = 42 name = "John"}', []),
+    ('{person age >< [45 42]}', ['John', 'Mary', 'Ana']),
+    ('{person age <> [45]}', ['Mary', 'Ana']),
+    ('{person age > 42}', ['John']),
+    ('{person age <= 42 name != "Ana"}', ['Mary']),
+    ('{person #vip}', ['John']),
+    ('{pet name = "Rex"}', ['Rex']),
+])
+def test_select_objects(index, query, names):
+    assert _names(index.select(query)) == names
+
+
+@pytest.mark.parametrize('query, keys', [
+    ('{fruits/* #id = [3, 2]}', ['mango', 'banana']),
+    ('{fruits/* color = "red"}', ['apple', 'mango']),
+    ('{fruits/apple}', ['apple']),
+    ('{#sweet color = "red"}', ['apple']),
+    ('{: name = "Rex"}', ['pet']),
+])
+def test_select_by_path_key(index, query, keys):
+    assert _keys(index.select(query)) == keys
+
+
+@pytest.mark.parametrize('query', [
+    '{person 42}',
+    '{fruits.apple}',
+    '(person)',
+    '{a} {b}',
+])
+def test_invalid_queries(index, query):
+    with pytest.raises(QueryError):
+        index.select(query)
+
+
+def test_equality_is_answered_by_lookup(index):
+    index.select('{person name = "Mary" age >< [42]}')
+    assert index.lookups == 2 and index.scans == 0
+    index.select('{person age > 1}')
+    assert index.scans == 1
+
+
+def test_select_query_node():
+    root = Language().parse('(a x = 1) (b q = {a x = 1})')
+    # a query value is the head of a path
+    query = root.expressions[1].expressions[0].value.segments[0][1]
+    assert _keys(QueryIndex(root).select(query)) == ['a']
+
+
+# ====================================================================
+# INVALIDATION TESTS
+# ====================================================================
+def test_update_moves_only_changed_entries(index):
+    assert _names(index.select('{person age = 45}')) == ['John']
+    mary = index.select('{person name = "Mary"}')[0]
+    changed = Language().parse('(person name = "Mary" age = 45 #vip)')
+    mary.fill(mary.key, changed.expressions[0].expressions, mary.end)
+    index.update(mary)
+    assert _names(index.select('{person age = 45}')) == ['John', 'Mary']
+    assert _names(index.select('{person age = 42}')) == ['Ana']
+    assert _names(index.tagged('vip')) == ['John', 'Mary']
+
+
+def test_add_and_remove_subtrees(index):
+    root = index.root
+    assert _keys(index.select('{pet}')) == ['pet']
+    ana = root.expressions[-1]
+    rex = ana.expressions[-1]
+    assert _names(index.select('{person/pet}')) == ['Rex']
+    bob = Language().parse('(pet name = "Bob")').expressions[0]
+    ana.expressions.append(bob)
+    index.add(bob, ana)
+    assert _names(index.select('{person/pet}')) == ['Rex', 'Bob']
+    ana.expressions.remove(rex)
+    index.remove(rex, ana)
+    assert _names(index.select('{person/pet}')) == ['Bob']
+    root.expressions.remove(ana)
+    index.remove(ana)
+    assert index.select('{pet}') == []
+    assert _names(index.select('{person age = 42}')) == ['Mary']
+    added = Language().parse('(person name = "Bia" age = 42 (pet))')
+    root.expressions.extend(added.expressions)
+    index.add(added)
+    assert _names(index.select('{person age = 42}')) == ['Mary', 'Bia']
+    assert all(isinstance(node, ObjectNode)
+               for node in index.select('{pet}'))
@@ -0,0 +1,99 @@
+import pytest
+
+from mel.exceptions import QueryError
+from mel.parsing import Language
+from mel.parsing.nodes import ObjectNode
+from mel.querying import PathEvaluator, PlanCache
+
+
+DOCUMENT = '''
+(fruits
+    (apple  #id = 1  #sweet)
+    (banana #id = 2  #sweet)
+    (mango  #id = 3)
+)
+(Category (news title = "News") (tech title = "Tech"))
+movies = ["a" "b" "c" "d" "e" "f"]
+@mary = (person name = "Mary" age = 42)
+'''
+
+
+@pytest.fixture
+def paths():
+    return PathEvaluator(Language().parse(DOCUMENT), PlanCache())
+
+
+def _value(node):
+    return node.key.text if isinstance(node, ObjectNode) else node.value
+
+
+# ====================================================================
+# EVALUATION TESTS
+# ====================================================================
+@pytest.mark.parametrize('path, values', [
+    ('fruits/[apple, mango]/#id', [1, 3]),
+    ('fruits/*/#id', [1, 2, 3]),
+    ('fruits/apple.#id', [1]),
+    ('fruits/*/#sweet', ['apple', 'banana']),
+    ('fruits/[mango 0]', ['mango', 'apple']),
+    ('fruits/1', ['banana']),
+    ('fruits/-1', ['mango']),
+    ('Category/news/title', ['News']),
+    ('Category/*/title', ['News', 'Tech']),
+    ('movies/1..3', ['b', 'c', 'd']),
+    ('movies/4..', ['e', 'f']),
+    ('@mary/name', ['Mary']),
+    ('@mary.*', ['Mary', 42]),
+    ('fruits/pear/#id', []),
+    ('fruits/apple/#id/0', []),
+])
+def test_path_values(paths, path, values):
+    assert [_value(node) for node in paths.get(path)] == values
+
+
+@pytest.mark.parametrize('path', [
+    'fruits/(apple)',
+    '{fruits}/apple',
+    'a = 1',
+    'a b',
+])
+def test_invalid_paths(paths, path):
+    with pytest.raises(QueryError):
+        paths.get(path)
+
+
+def test_invalidate_rebuilds_children(paths):
+    assert [_value(node) for node in paths.get('fruits/*')] == \
+        ['apple', 'banana', 'mango']
+    fruits = paths.get('fruits')[0]
+    fruits.items.pop()
+    assert len(paths.get('fruits/*')) == 3
+    paths.invalidate(fruits)
+    assert len(paths.get('fruits/*')) == 2
+
+
+# ====================================================================
+# CACHE TESTS
+# ====================================================================
+def test_plans_are_compiled_once():
+    cache = PlanCache()
+    first = PathEvaluator(Language().parse(DOCUMENT), cache)
+    second = PathEvaluator(Language().parse(DOCUMENT), cache)
+    for _ in range(3):
+        first.get('fruits/*/#id')
+        second.get('fruits/*/#id')
+    assert (cache.misses, cache.hits) == (1, 5)
+    assert cache.hit_rate == 5 / 6
+    assert cache.get('fruits/*/#id') is cache.get('fruits/*/#id')
+
+
+def test_least_recently_used_plans_are_evicted():
+    cache = PlanCache(max_size=2)
+    plan = cache.get('a')
+    cache.get('b')
+    cache.get('a')
+    cache.get('c')
+    assert len(cache) == 2
+    assert cache.get('a') is plan
+    cache.get('b')
+    assert cache.misses == 4
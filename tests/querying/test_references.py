@@ -0,0 +1,102 @@
+import pytest
+
+from mel.exceptions import ResolutionError
+from mel.parsing import Language
+from mel.parsing.nodes import KeywordNode, ObjectNode
+from mel.querying import References
+
+
+def _references(text):
+    return References(Language().parse(text))
+
+
+def _value(node):
+    return node.key.text if isinstance(node, ObjectNode) else node.value
+
+
+def _resolve(text):
+    '''Resolve the value of the last top level relation'''
+    references = _references(text)
+    reference = references.root.expressions[-1].value
+    return [_value(node) for node in references.resolve(reference)]
+
+
+# ====================================================================
+# SYMBOL TABLE TESTS
+# ====================================================================
+def test_names_and_concepts_are_interned_when_lexed():
+    root = Language().parse('(page #draft x = Category/news) y = @page/x')
+    symbols = root.symbols
+    assert [symbols.name(id_) for id_ in range(len(symbols))] == \
+        ['page', 'draft', 'x', 'Category', 'news', 'y']
+    keywords = [node for node in root.walk()
+                if isinstance(node, KeywordNode)]
+    assert [symbols.name(node.symbol) for node in keywords] == \
+        [keyword.name for keyword in keywords]
+    assert keywords[0].symbol == keywords[-2].symbol
+
+
+def test_lazy_bodies_share_the_symbol_table():
+    root = Language().parse('(a b = c) (c a = 1)', lazy=True)
+    assert len(root.symbols) == 0
+    first, second = root.expressions
+    first.items
+    second.items
+    assert root.symbols.get('a') == 0 and root.symbols.get('c') == 2
+    assert second.key.segments[0][1].symbol == root.symbols.get('c')
+
+
+# ====================================================================
+# RESOLUTION TESTS
+# ====================================================================
+@pytest.mark.parametrize('text, values', [
+    ('a = 1  b = a', [1]),
+    ('a = b  b = 1  x = a', [1]),
+    ('a = b  b = c  c = "deep"  d = a', ['deep']),
+    ('(Category (news id = 7)) x = Category/news/id', [7]),
+    ('@mary = (person name = "Mary") x = @mary/name', ['Mary']),
+    ('@mary = (person name = "Mary") @m = @mary x = @m/name', ['Mary']),
+    ('(page x = y) y = 2 z = page/x', [2]),
+    ('(a (b 1) (b 2)) x = a/b', ['b', 'b']),
+])
+def test_resolve_references(text, values):
+    assert _resolve(text) == values
+
+
+@pytest.mark.parametrize('text', [
+    'a = a',
+    'a = b  b = a',
+    'a = b  b = c  c = a  x = a',
+    '(page x = page/x) y = page/x',
+])
+def test_reference_cycles(text):
+    with pytest.raises(ResolutionError) as error:
+        _resolve(text)
+    assert 'cycle' in str(error.value)
+
+
+def test_undefined_references():
+    with pytest.raises(ResolutionError) as error:
+        _resolve('a = 1 x = b/c')
+    assert error.value.column == 10
+
+
+@pytest.mark.parametrize('name', ['', '#', 'b'])
+def test_definitions_of_unknown_names(name):
+    assert _references('a = 1 #a = 2').definitions(name) == []
+
+
+def test_resolution_is_memoized():
+    references = _references('a = b  b = 1  x = a  y = a')
+    x, y = [node.value for node in references.root.expressions[2:]]
+    first = references.resolve(x)
+    assert references.resolve(x) is first
+    a = references.definitions('a')[0]
+    assert references.resolve(a) == first
+    assert references.resolve(y) == first
+
+
+def test_long_reference_chains():
+    depth = 10_000
+    text = ' '.join(f'a{index} = a{index + 1}' for index in range(depth))
+    assert _resolve(f'{text} a{depth} = 42 x = a0') == [42]
@@ -0,0 +1,72 @@
+import pytest
+
+from mel.scanning.bulk import BulkClasses, load_numpy
+from mel.scanning.char import Char, DIGIT, LOWER, SPACE, NEWLINE
+from mel.scanning.stream import CharStream
+from mel.lexing.lexer import Lexer
+from mel.lexing.token import Token
+
+
+ENGINES = [
+    pytest.param(False, id='python'),
+    pytest.param(True, id='numpy', marks=pytest.mark.skipif(
+        load_numpy() is None, reason='numpy is not installed'
+    )),
+]
+TEXT = 'ab 12\n\tZé_ 3.5\n\n(x "ção")'
+
+
+# ====================================================================
+# BULK CLASSES TESTS
+# ====================================================================
+@pytest.mark.parametrize('use_numpy', ENGINES)
+def test_codes_match_char_build(use_numpy):
+    classes = BulkClasses(TEXT, use_numpy)
+    for index, value in enumerate(TEXT):
+        assert classes.code(index) == Char.build(value).FLAG
+
+
+@pytest.mark.parametrize('use_numpy', ENGINES)
+def test_newlines(use_numpy):
+    classes = BulkClasses(TEXT, use_numpy)
+    assert classes.newlines == [5, 14, 15]
+
+
+@pytest.mark.parametrize('use_numpy', ENGINES)
+@pytest.mark.parametrize('flags, runs', [
+    (DIGIT, [(3, 5), (11, 12), (13, 14)]),
+    (LOWER, [(0, 2), (17, 18)]),
+    (SPACE | NEWLINE, [(2, 3), (5, 7), (10, 11), (14, 16), (18, 19)]),
+])
+def test_runs(use_numpy, flags, runs):
+    classes = BulkClasses(TEXT, use_numpy)
+    found = classes.runs(flags)
+    assert found[:len(runs)] == runs
+
+
+@pytest.mark.parametrize('use_numpy', ENGINES)
+def test_run_end(use_numpy):
+    classes = BulkClasses('abc12 de', use_numpy)
+    assert classes.run_end(0, LOWER) == 3
+    assert classes.run_end(1, LOWER) == 3
+    assert classes.run_end(3, LOWER) == 3
+    assert classes.run_end(6, LOWER) == 8
+
+
+# ====================================================================
+# BULK STREAM TESTS
+# ====================================================================
+def test_bulk_stream_matches_char_stream():
+    stream, bulk = CharStream(TEXT), CharStream(TEXT, bulk=True)
+    for index in range(len(TEXT) + 1):
+        char, other = stream.get(index), bulk.get(index)
+        assert type(char) is type(other)
+        assert (char.line, char.column) == (other.line, other.column)
+
+
+def test_bulk_stream_lexes_the_same_tokens():
+    text = '(x "ção" 3.5)\t-- comment\n' + 'foo_bar = 42\n' * 10
+    lexer = Lexer(Token.classes())
+    tokens = [t.text for t in lexer.tokens(CharStream(text))]
+    bulk = [t.text for t in lexer.tokens(CharStream(text, bulk=True))]
+    assert tokens == bulk
@@ -1,4 +1,15 @@
-from mel.scanning.char import Char
+import pytest
+
+from mel.scanning.char import (
+    Char,
+    classify,
+    DIGIT,
+    LOWER,
+    UPPER,
+    SYMBOL,
+    SPACE,
+    NEWLINE,
+)
 
 
 def test_char():
@@ -14,3 +25,28 @@ def test_empty_base_char():
 def test_char_type():
     ch = Char.build('4')
     assert ch.is_digit()
+
+
+@pytest.mark.parametrize('value, flag', [
+    ('7', DIGIT),
+    ('q', LOWER),
+    ('Q', UPPER),
+    ('_', SYMBOL),
+    ('\t', SPACE),
+    ('\n', NEWLINE),
+    ('é', 0),
+])
+def test_classify(value, flag):
+    assert classify(value) == flag
+
+
+def test_non_ascii_char_is_generic():
+    ch = Char.build('ã')
+    assert type(ch) is Char
+    assert ch.category() == 'Ll'
+
+
+def test_chars_have_no_instance_dict():
+    ch = Char.build('a', 1, 2)
+    assert not hasattr(ch, '__dict__')
+    assert (ch.line, ch.column) == (1, 2)
@@ -0,0 +1,108 @@
+import random
+
+import pytest
+
+from mel.scanning.dfa import CharSet, CompileError, compile_dfa
+from mel.scanning.stream import CharStream
+from mel.scanning.parser.single import (
+    ZeroManyParser,
+    OneManyParser,
+    OptionalParser,
+)
+from mel.scanning.parser.multi import SeqParser, OneOfParser
+from mel.scanning.parser.char import (
+    CharParser,
+    ExceptCharParser,
+    NotCharParser,
+    DigitParser,
+    LowerParser,
+)
+from mel.lexing.token import Token
+
+
+# ====================================================================
+# CHAR SET TESTS
+# ====================================================================
+@pytest.mark.parametrize('left, right, disjoint', [
+    (CharSet('ab'), CharSet('cd'), True),
+    (CharSet('ab'), CharSet('bc'), False),
+    (CharSet('ab'), CharSet('ab', negated=True), True),
+    (CharSet('ab'), CharSet('a', negated=True), False),
+    (CharSet('a', negated=True), CharSet('b', negated=True), False),
+])
+def test_charset_disjoint(left, right, disjoint):
+    assert left.isdisjoint(right) == disjoint
+    assert right.isdisjoint(left) == disjoint
+
+
+def test_charset_union_with_complement():
+    chars = CharSet('ab') | CharSet('bc', negated=True)
+    assert 'a' in chars
+    assert 'b' in chars
+    assert 'c' not in chars
+    assert 'z' in chars
+
+
+# ====================================================================
+# COMPILE TESTS
+# ====================================================================
+@pytest.mark.parametrize('parser', [
+    NotCharParser(CharParser('a')),
+    ZeroManyParser(OptionalParser(CharParser('a'))),
+    SeqParser(ZeroManyParser(LowerParser()), CharParser('a')),
+    SeqParser(OneOfParser(CharParser('a'), LowerParser()), DigitParser()),
+    OneOfParser(CharParser('a'), SeqParser(CharParser('a'), DigitParser())),
+])
+def test_uncompilable_parsers_raise(parser):
+    with pytest.raises(CompileError):
+        compile_dfa([parser])
+
+
+@pytest.mark.parametrize('text, end', [
+    ('', 0),
+    ('abc', 3),
+    ('a1b2 ', 4),
+    ('_ab', 0),
+])
+def test_dfa_longest_match(text, end):
+    dfa = compile_dfa([OneManyParser(OneOfParser(LowerParser(),
+                                                 DigitParser()))])
+    label, match_end = dfa.match(text)
+    assert match_end == end
+    assert label == (0 if end else -1)
+
+
+def test_dfa_earlier_parser_wins_tie():
+    dfa = compile_dfa([CharParser('a'), LowerParser()])
+    assert dfa.match('a') == (0, 1)
+    assert dfa.match('b') == (1, 1)
+
+
+def test_dfa_matches_from_index():
+    dfa = compile_dfa([OneManyParser(ExceptCharParser('"'))])
+    assert dfa.match('"ab"', 1) == (0, 3)
+
+
+# ====================================================================
+# DIFFERENTIAL TESTS
+# ====================================================================
+ALPHABET = 'aZ_0-9.."\' \n,;()=#!<>é'
+
+
+def _interpreted_length(parser, stream, index):
+    produce = parser.parse(stream, index)
+    return len(produce) if produce else 0
+
+
+@pytest.mark.parametrize('TokenClass', Token.classes())
+def test_compiled_token_matches_interpreted(TokenClass):
+    rng = random.Random(TokenClass.ID)
+    dfa = compile_dfa([TokenClass.PARSER])
+    for _ in range(300):
+        text = ''.join(rng.choice(ALPHABET) for _ in range(8))
+        stream = CharStream(text)
+        for index in range(len(text)):
+            label, end = dfa.match(text, index)
+            length = end - index if label >= 0 else 0
+            expected = _interpreted_length(TokenClass.PARSER, stream, index)
+            assert length == expected, (text, index)
@@ -0,0 +1,97 @@
+import pytest
+
+from mel.scanning.dispatch import DispatchConflict, DispatchTable
+from mel.scanning.parser.char import (
+    CharParser,
+    DigitParser,
+    ExceptCharParser,
+    LowerParser,
+    NotCharParser,
+)
+from mel.scanning.parser.multi import OneOfParser, SeqParser
+from mel.scanning.parser.single import (
+    OneManyParser,
+    OptionalParser,
+    ZeroManyParser,
+)
+from mel.scanning.stream import CharStream
+
+
+INT = SeqParser(OptionalParser(CharParser('-')), OneManyParser(DigitParser()))
+NAME = SeqParser(LowerParser(), ZeroManyParser(DigitParser()))
+ANY = ExceptCharParser('"')
+EMPTY = ZeroManyParser(CharParser('x'))
+
+
+# ====================================================================
+# FIRST SET TESTS
+# ====================================================================
+@pytest.mark.parametrize('parser, hints, nullable', [
+    (INT, '-0123456789', False),
+    (SeqParser(ZeroManyParser(CharParser('a')), CharParser('b')), 'ab', False),
+    (SeqParser(OptionalParser(CharParser('a'))), 'a', True),
+    (OneOfParser(CharParser('a'), OptionalParser(CharParser('b'))),
+     'ab', True),
+    (OneManyParser(OptionalParser(CharParser('a'))), 'a', True),
+    (OneOfParser(CharParser('a'), ANY), '', False),
+    (SeqParser(OptionalParser(CharParser('-')), ANY), '', False),
+])
+def test_first_sets_from_hints(parser, hints, nullable):
+    assert set(parser.hints()) == set(hints)
+    assert parser.nullable() == nullable
+
+
+# ====================================================================
+# DISPATCH TABLE TESTS
+# ====================================================================
+def test_dispatch_by_first_char():
+    table = DispatchTable([INT, NAME])
+    assert table.get('-') == [INT]
+    assert table.get('7') == [INT]
+    assert table.get('q') == [NAME]
+    assert table.get('#') == []
+
+
+def test_dispatch_keeps_parser_order():
+    other_int = OneManyParser(DigitParser())
+    table = DispatchTable([other_int, NAME, INT])
+    assert table.get('1') == [other_int, INT]
+
+
+@pytest.mark.parametrize('parser', [ANY, EMPTY])
+def test_dispatch_unknown_first_goes_everywhere(parser):
+    table = DispatchTable([NAME, parser])
+    assert table.get('a') == [NAME, parser]
+    assert table.get('#') == [parser]
+    assert table.get('λ') == [parser]
+
+
+@pytest.mark.parametrize('parser', [
+    OneOfParser(CharParser('a'), ANY),
+    SeqParser(OptionalParser(CharParser('-')), ANY),
+    OneOfParser(CharParser('a'), SeqParser(NotCharParser('a'), ANY)),
+])
+def test_dispatch_keeps_any_char_alternatives(parser):
+    table = DispatchTable([NAME, parser])
+    assert parser.parse(CharStream('b'))
+    assert table.get('b') == [NAME, parser]
+    assert table.get('#') == [parser]
+
+
+def test_dispatch_wide_chars():
+    greek = CharParser('λ')
+    table = DispatchTable([NAME, greek])
+    assert table.get('λ') == [greek]
+    assert table.get('a') == [NAME]
+    assert table.byte_indexes(0xce) == (1,)
+
+
+def test_dispatch_conflicts():
+    table = DispatchTable([INT, CharParser('-')])
+    assert list(table.conflicts()) == ['-']
+
+
+def test_dispatch_strict_conflicts():
+    with pytest.raises(DispatchConflict):
+        DispatchTable([INT, CharParser('-')], strict=True)
+    DispatchTable([INT, NAME], strict=True)
@@ -0,0 +1,66 @@
+from mel.scanning.memo import PackratCache
+from mel.scanning.stream import CharStream
+from mel.scanning.parser.single import ZeroManyParser, OneManyParser
+from mel.scanning.parser.multi import SeqParser, OneOfParser
+from mel.scanning.parser.char import (
+    CharParser,
+    DigitParser,
+    LowerParser,
+)
+
+
+LOWERS = OneManyParser(LowerParser())
+BACKTRACK_PARSER = OneOfParser(
+    SeqParser(LOWERS, CharParser('1')),
+    SeqParser(LOWERS, CharParser('2')),
+)
+
+
+# ====================================================================
+# PACKRAT CACHE TESTS
+# ====================================================================
+def test_stream_has_no_memo_by_default():
+    stream = CharStream('abc')
+    assert stream.memo is None
+
+
+def test_memo_reuses_shared_subparser_on_backtrack():
+    memo = PackratCache()
+    stream = CharStream('abc2', memo=memo)
+    produce = BACKTRACK_PARSER.parse(stream)
+    assert str(produce) == 'abc2'
+    assert memo.hits == 1
+
+
+def test_memo_keeps_produce_equal_to_unmemoized_parse():
+    text = 'abc2'
+    plain = BACKTRACK_PARSER.parse(CharStream(text))
+    memoized = BACKTRACK_PARSER.parse(CharStream(text, PackratCache()))
+    assert str(plain) == str(memoized)
+    assert len(plain) == len(memoized)
+
+
+def test_memo_counts_misses():
+    memo = PackratCache()
+    stream = CharStream('abc', memo=memo)
+    LOWERS.parse(stream)
+    LOWERS.parse(stream)
+    assert memo.misses == 1
+    assert memo.hits == 1
+
+
+def test_memo_evicts_entries_outside_window():
+    memo = PackratCache(window=4)
+    stream = CharStream('1234567890' * 10, memo=memo)
+    parser = ZeroManyParser(SeqParser(DigitParser()))
+    parser.parse(stream)
+    assert len(memo) <= 6
+    assert memo.get(parser, 0) is None
+
+
+def test_memo_clear_resets_counters():
+    memo = PackratCache()
+    LOWERS.parse(CharStream('abc', memo=memo))
+    memo.clear()
+    assert len(memo) == 0
+    assert memo.hits == memo.misses == 0
@@ -0,0 +1,124 @@
+import random
+
+import pytest
+
+from mel.scanning.optimizer import optimize, parser_key
+from mel.scanning.stream import CharStream
+from mel.scanning.parser.single import (
+    ZeroManyParser,
+    OneManyParser,
+    OptionalParser,
+)
+from mel.scanning.parser.multi import SeqParser, OneOfParser
+from mel.scanning.parser.char import (
+    CharParser,
+    CharSetParser,
+    AlphaNumParser,
+    DigitParser,
+    LowerParser,
+    NotCharParser,
+)
+from mel.lexing.lexer import Lexer, OptimizedLexer
+from mel.lexing.token import Token
+
+
+# ====================================================================
+# REWRITE TESTS
+# ====================================================================
+def test_flatten_nested_seq():
+    parser = SeqParser(CharParser('a'), SeqParser(LowerParser(),
+                                                  DigitParser()))
+    optimized = optimize(parser)
+    assert len(optimized.children()) == 3
+
+
+def test_nullable_nested_seq_is_kept():
+    inner = SeqParser(OptionalParser(CharParser('a')))
+    parser = SeqParser(inner, DigitParser())
+    optimized = optimize(parser)
+    assert parser_key(optimized) == parser_key(parser)
+
+
+def test_fuse_char_class_alternatives():
+    parser = OneOfParser(CharParser('_'), AlphaNumParser())
+    optimized = optimize(parser)
+    assert isinstance(optimized, CharSetParser)
+    assert set(optimized.hints()) == set('_' + AlphaNumParser.CHARS)
+
+
+def test_fuse_only_adjacent_char_classes():
+    parser = OneOfParser(
+        CharParser('a'),
+        SeqParser(CharParser('b'), CharParser('c')),
+        CharParser('d'),
+    )
+    optimized = optimize(parser)
+    assert parser_key(optimized) == parser_key(parser)
+
+
+def test_merge_repetition():
+    parser = SeqParser(DigitParser(), ZeroManyParser(DigitParser()))
+    assert isinstance(optimize(parser), OneManyParser)
+
+
+def test_left_factor_common_prefix():
+    parser = OneOfParser(
+        SeqParser(CharParser('<'), CharParser('=')),
+        SeqParser(CharParser('<'), CharParser('>')),
+        CharParser('<'),
+    )
+    optimized = optimize(parser)
+    assert parser_key(optimized) == parser_key(SeqParser(
+        CharParser('<'),
+        OptionalParser(CharSetParser('=>')),
+    ))
+
+
+def test_bare_prefix_before_longer_alternative_is_kept():
+    parser = OneOfParser(
+        CharParser('<'),
+        SeqParser(CharParser('<'), CharParser('=')),
+    )
+    optimized = optimize(parser)
+    assert str(optimized.parse(CharStream('<='))) == '<'
+
+
+def test_unknown_parsers_are_left_alone():
+    parser = NotCharParser(CharParser('a'))
+    assert optimize(parser) is parser
+
+
+# ====================================================================
+# DIFFERENTIAL TESTS
+# ====================================================================
+ALPHABET = 'aZ_0-9.."\' \n,;()=#!<>:?%é'
+
+
+def _result(parser, stream, index):
+    produce = parser.parse(stream, index)
+    return bool(produce), str(produce)
+
+
+@pytest.mark.parametrize('TokenClass', Token.classes())
+def test_optimized_token_matches_original(TokenClass):
+    rng = random.Random(TokenClass.ID)
+    optimized = optimize(TokenClass.PARSER)
+    for _ in range(300):
+        text = ''.join(rng.choice(ALPHABET) for _ in range(8))
+        stream = CharStream(text)
+        for index in range(len(text) + 1):
+            expected = _result(TokenClass.PARSER, stream, index)
+            assert _result(optimized, stream, index) == expected, text
+
+
+def test_optimized_lexer_matches_lexer():
+    rng = random.Random(42)
+    lexer, optimized = Lexer(), OptimizedLexer()
+    for _ in range(300):
+        text = ''.join(rng.choice(ALPHABET) for _ in range(12))
+        stream = CharStream(text)
+        for index in range(len(text)):
+            cls, produce = lexer.match(stream, index)
+            other_cls, other_produce = optimized.match(stream, index)
+            assert cls is other_cls, text
+            assert str(produce) == str(other_produce), text
@@ -1,5 +1,8 @@
+import pytest
+
 from mel.scanning.char import Char
-from mel.scanning.produce import Produce
+from mel.scanning.stream import CharStream
+from mel.scanning.produce import Produce, ValidProduce
 
 
 CHARS_ABC = [
@@ -53,3 +56,67 @@ def test_produces_iadd_string():
     produce = Produce(CHARS_ABC)
     produce += Produce(CHARS_DEF)
     assert str(produce) == 'abcdef'
+
+
+# ====================================================================
+# SPAN PRODUCE TESTS
+# ====================================================================
+def test_span_produce_string():
+    stream = CharStream('abcdef')
+    produce = Produce.span(stream, 1, 4)
+    assert str(produce) == 'bcd'
+    assert len(produce) == 3
+
+
+def test_span_produce_chars_are_lazy():
+    stream = CharStream('ab\ncd')
+    produce = Produce.span(stream, 2, 5)
+    assert [char.value for char in produce.chars] == ['\n', 'c', 'd']
+
+
+def test_adjacent_spans_merge_into_span():
+    stream = CharStream('abcdef')
+    produce = Produce.span(stream, 0, 3) + Produce.span(stream, 3, 6)
+    assert produce.is_span()
+    assert str(produce) == 'abcdef'
+
+
+def test_empty_produce_adopts_span():
+    stream = CharStream('abcdef')
+    produce = Produce(index=2)
+    produce += Produce.span(stream, 2, 4)
+    assert produce.is_span()
+    assert str(produce) == 'cd'
+
+
+def test_non_adjacent_spans_concat_chars():
+    stream = CharStream('abcdef')
+    produce = Produce.span(stream, 0, 2) + Produce.span(stream, 4, 6)
+    assert not produce.is_span()
+    assert str(produce) == 'abef'
+
+
+def test_valid_produce_keeps_class_on_merge():
+    stream = CharStream('abc')
+    produce = ValidProduce(index=0) + Produce.span(stream, 0, 2)
+    assert isinstance(produce, ValidProduce)
+
+
+@pytest.mark.parametrize('index, line, column', [
+    (0, 0, 0),
+    (3, 1, 0),
+    (4, 1, 1),
+])
+def test_span_line_and_column(index, line, column):
+    stream = CharStream('ab\ncd')
+    produce = Produce.span(stream, index, index + 1)
+    assert produce.line() == line
+    assert produce.column() == column
+    assert produce.chars[0].line == line
+    assert produce.chars[0].column == column
+
+
+def test_empty_span_line_and_column():
+    produce = Produce.span(CharStream('ab'), 1, 1)
+    assert produce.line() == -1
+    assert produce.column() == -1
@@ -0,0 +1,79 @@
+import pytest
+
+from mel.scanning.memo import PackratCache
+from mel.scanning.parser.base import Parser
+from mel.scanning.parser.char import CharParser, DigitParser
+from mel.scanning.parser.multi import OneOfParser, SeqParser
+from mel.scanning.parser.single import ZeroManyParser
+from mel.scanning.profile import Profiler, enable_from_env, profiling
+from mel.scanning.stream import CharStream
+
+
+def _backtracking_parser():
+    digits = ZeroManyParser(DigitParser())
+    return OneOfParser(
+        SeqParser(digits, CharParser(';')),
+        SeqParser(digits, CharParser('.')),
+    ), digits
+
+
+# ====================================================================
+# PROFILER TESTS
+# ====================================================================
+def test_profiling_restores_parse_methods():
+    original = Parser.__dict__['parse'], CharParser.__dict__['parse']
+    with profiling() as profiler:
+        assert profiler.enabled
+        assert Parser.__dict__['parse'] is not original[0]
+    assert not profiler.enabled
+    current = Parser.__dict__['parse'], CharParser.__dict__['parse']
+    assert current == original
+
+
+def test_profiling_counts_calls_and_reparses():
+    parser, digits = _backtracking_parser()
+    with profiling({parser: 'number', digits: 'digits'}) as profiler:
+        assert parser.parse(CharStream('123.'))
+    stats = {stats.label: stats for stats in profiler.stats()}
+    assert stats['number'].calls == 1
+    assert stats['number'].successes == 1
+    assert stats['digits'].calls == 2
+    assert stats['digits'].reparses == 1
+    assert stats["CharParser(;)"].failures == 1
+
+
+def test_profiling_memo_answers_reparses_without_children():
+    parser, digits = _backtracking_parser()
+    stream = CharStream('123.', memo=PackratCache())
+    with profiling({digits: 'digits'}) as profiler:
+        parser.parse(stream)
+    stats = {stats.label: stats for stats in profiler.stats()}
+    # digits is still called twice at 0, but the memo answers the second
+    # call, so its digit parsers only run over "123." once
+    assert stats['digits'].reparses == 1
+    assert stats['DigitParser()'].calls == 4
+
+
+def test_profiling_collapsed_stacks():
+    parser, digits = _backtracking_parser()
+    with profiling({parser: 'number', digits: 'digits'}) as profiler:
+        parser.parse(CharStream('1;'))
+    stacks = [line.rsplit(' ', 1)[0]
+              for line in profiler.collapsed().splitlines()]
+    assert 'number' in stacks
+    assert 'number;SeqParser#1;digits;DigitParser()' in stacks
+    assert 'number;SeqParser#1;CharParser(\\x3b)' in stacks
+
+
+def test_profiling_disabled_by_default(monkeypatch):
+    monkeypatch.delenv('MEL_PROFILE', raising=False)
+    assert enable_from_env() is None
+    assert not Profiler().enabled
+
+
+@pytest.mark.parametrize('text', ['12', 'a'])
+def test_profiling_keeps_results(text):
+    parser, _ = _backtracking_parser()
+    expected = str(parser.parse(CharStream(text)))
+    with profiling():
+        assert str(parser.parse(CharStream(text))) == expected
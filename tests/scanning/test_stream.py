@@ -88,3 +88,36 @@ def test_is_next_char():
     assert stream.get(0).value == 'a'
     assert not stream.get(1).value == 'C'
     assert stream.get(1).value == '3'
+
+
+def test_stream_text():
+    text = 'ab\nc'
+    stream = CharStream(text)
+    assert stream.text == text
+
+
+@pytest.mark.parametrize('index, line, column', [
+    (0, 0, 0),
+    (2, 0, 2),
+    (3, 1, 0),
+    (5, 2, 0),
+    (6, 3, 0),
+    (7, 3, 1),
+])
+def test_line_and_column_by_index(index, line, column):
+    stream = CharStream('ab\nc\n\nde')
+    assert stream.line(index) == line
+    assert stream.column(index) == column
+
+
+def test_eof_after_last_char():
+    stream = CharStream('ab\n')
+    assert stream.get(3).is_eof()
+
+
+def test_origin_shifts_line_and_column():
+    stream = CharStream('ab\ncd', origin=(4, 10))
+    assert (stream.line(1), stream.column(1)) == (4, 11)
+    assert (stream.line(4), stream.column(4)) == (5, 1)
+    char = stream.get(3)
+    assert (char.line, char.column) == (5, 0)
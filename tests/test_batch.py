@@ -0,0 +1,153 @@
+import io
+import os
+from functools import partial
+
+import pytest
+
+from mel import batch
+from mel.batch import (
+    emit_job,
+    expand_paths,
+    export_job,
+    lex_job,
+    process_files,
+)
+from mel.emitting import emit_file
+from mel.lexing.cache import TokenCache
+
+
+def _lexer_job(path):
+    lex_job(path)
+    return f'{os.getpid()} {id(batch._LEXER)}'
+
+
+def _converted(path):
+    file = io.StringIO()
+    emit_file(path, file, 'json')
+    return file.getvalue()
+
+
+def _language_job(path):
+    emit_job(path, 'json')
+    return f'{os.getpid()} {id(batch._LANGUAGE)}'
+
+
+@pytest.fixture
+def sources(tmp_path):
+    (tmp_path / 'sub').mkdir()
+    files = {
+        'a.mel': '(a 1)',
+        'b.mel': 'x = "b"',
+        'sub/c.mel': '[1 2 3]',
+        'sub/bad.mel': '(a &)',
+    }
+    for name, text in files.items():
+        (tmp_path / name).write_text(text)
+    return tmp_path
+
+
+# ====================================================================
+# PATH TESTS
+# ====================================================================
+def test_expand_directory(sources):
+    paths = expand_paths([str(sources)])
+    assert [os.path.relpath(path, sources) for path in paths] == [
+        'a.mel', 'b.mel', 'sub/bad.mel', 'sub/c.mel'
+    ]
+
+
+def test_expand_glob_and_files(sources):
+    paths = expand_paths([
+        str(sources / 'b.mel'), str(sources / '*.mel'), 'missing'
+    ])
+    names = [os.path.basename(path) for path in paths]
+    assert names == ['b.mel', 'a.mel', 'missing']
+
+
+# ====================================================================
+# PROCESSING TESTS
+# ====================================================================
+@pytest.mark.parametrize('workers', [1, 2])
+def test_process_in_input_order(sources, workers):
+    paths = expand_paths([str(sources)]) + ['missing']
+    results = list(process_files(paths, workers=workers))
+    assert [result.path for result in results] == paths
+    assert [bool(result) for result in results] == [
+        True, True, False, True, False
+    ]
+    assert 'NameToken(x)' in results[1].output
+    assert "doesn't exist" in results[-1].error
+    assert 'bad.mel' in results[2].error
+
+
+def _failing_job(path):
+    if path.endswith('b.mel'):
+        raise IndexError('list index out of range')
+    return 'ok'
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_unexpected_errors_fail_only_their_file(sources, workers):
+    paths = expand_paths([str(sources / '*.mel')])
+    results = list(process_files(paths, job=_failing_job, workers=workers))
+    assert [bool(result) for result in results] == [True, False]
+    assert 'IndexError: list index out of range' in results[1].error
+
+
+def test_process_in_completion_order(sources):
+    paths = expand_paths([str(sources)])
+    results = list(process_files(paths, workers=2, ordered=False))
+    assert sorted(result.path for result in results) == sorted(paths)
+
+
+def test_grammar_built_once_per_worker(sources):
+    paths = expand_paths([str(sources / '*.mel')]) * 4
+    results = list(process_files(paths, job=_lexer_job, workers=2))
+    lexers = {}
+    for result in results:
+        pid, lexer = result.output.split()
+        lexers.setdefault(pid, set()).add(lexer)
+    assert all(len(ids) == 1 for ids in lexers.values())
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_emit_across_workers(sources, workers):
+    paths = expand_paths([str(sources)])
+    job = partial(emit_job, format='json')
+    results = list(process_files(paths, job, workers=workers))
+    assert [bool(result) for result in results] == [True, True, False, True]
+    assert results[0].output == _converted(paths[0])
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_export_across_workers(sources, tmp_path, workers):
+    out = tmp_path / f'out{workers}'
+    paths = expand_paths([str(sources / 'sub' / 'c.mel'),
+                          str(sources / 'a.mel')])
+    job = partial(export_job, formats=['json', 'xml'], directory=str(out),
+                  root=str(sources))
+    results = list(process_files(paths, job, workers=workers))
+    assert results[0].output.splitlines() == [
+        str(out / 'sub' / 'c.mel.json'), str(out / 'sub' / 'c.mel.xml'),
+    ]
+    assert (out / 'a.mel.json').read_text() == _converted(paths[1])
+
+
+def test_language_built_once_per_worker(sources):
+    paths = expand_paths([str(sources / '*.mel')]) * 4
+    results = list(process_files(paths, job=_language_job, workers=2))
+    languages = {}
+    for result in results:
+        pid, language = result.output.split()
+        languages.setdefault(pid, set()).add(language)
+    assert all(len(ids) == 1 for ids in languages.values())
+
+
+def test_process_with_cache(sources, tmp_path):
+    cache = TokenCache(str(tmp_path / 'cache'))
+    paths = expand_paths([str(sources / '*.mel')])
+    first = [result.output for result in process_files(paths, cache=cache)]
+    assert len(os.listdir(cache.directory)) == len(paths)
+    second = [result.output for result in process_files(paths, cache=cache)]
+    assert first == second
+    assert cache.hits == len(paths)